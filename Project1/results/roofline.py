@@ -0,0 +1,213 @@
+"""Roofline analysis of the SAXPY / dot kernel results.
+
+Loads every Project1 CSV (SAXPY/*.csv, DotReduced/*.csv) into one frame,
+then per kernel variant and size n:
+
+  * arithmetic intensity: 2 flops per processed element over the bytes the
+    kernel streams (SAXPY reads x, y and writes y; dot reads x, y). With
+    stride s only every s-th element is used but whole cache lines are
+    moved, so the bytes per useful element grow by s.
+  * the memory level the working set (2 arrays of n elements) fits in, using
+    the cache boundaries from Project2 (plot_project2.MANUAL_CACHE_BOUNDARIES_KB).
+  * bandwidth ceiling per level, measured from the kernels themselves: the
+    highest rate any variant sustains well inside the level (working set >=
+    PLATEAU_FACTOR x the previous level's capacity, so sizes just past a
+    boundary, still partly cached, don't count; timings >= MIN_TIME_S).
+    A faster level is never slower than the levels behind it, so each
+    ceiling is raised to the best measured rate of any slower level. This
+    also lifts L1, whose few timeable sizes are dominated by loop overhead.
+    Sizes in a transition band (below PLATEAU_FACTOR x the previous
+    capacity) are bounded by the faster level's ceiling.
+  * Project2's Little's-law model is reported beside the ceilings as
+    model_GBs for comparison. Project2's MLC bandwidth gives DRAM, and the
+    same number of lines in flight (BW_DRAM * lat_DRAM / 64 B) over each
+    level's median latency from working_set_latency.csv gives L1/L2/L3,
+    capped at the core's load bandwidth. It serves as the fallback ceiling
+    for a level with no measured size. It is not the roof: with pointer-chase
+    latencies it puts L3 barely above DRAM, while streaming kernels sustain
+    several times that.
+  * attainable = min(compute peak, AI * ceiling_GBs); achieved fraction =
+    median measured GFLOP/s / attainable, at most 1 by construction.
+
+Sizes whose timings are below MIN_TIME_S are kept in the table but not
+flagged: their GFLOP/s are dominated by timer resolution.
+
+Outputs (beside this script): roofline.csv, roofline_flags.csv, roofline_ceilings.csv,
+graphs/roofline.png
+
+Usage:
+  python3 roofline.py [--top 3]
+"""
+import argparse
+import importlib.util
+import re
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT2_RESULTS = SCRIPT_DIR.parent.parent / 'Project2' / 'results'
+PLOT_SCRIPT = SCRIPT_DIR.parent.parent / 'Project2' / 'scripts' / 'plot_project2.py'
+OUTPUT_DIR = SCRIPT_DIR / 'graphs'
+
+# Intel i5-8365U (Project1 README): one core at 4.1 GHz turbo, AVX2 with two FMA ports
+FREQ_GHZ = 4.1
+FLOPS_PER_CYCLE = {'simd': {'float32': 32, 'float64': 16},   # 2 FMA ports x 8/4 lanes x 2 flops
+                   'scalar': {'float32': 4, 'float64': 4}}   # 2 FMA ports x 1 lane x 2 flops
+LOAD_BYTES_PER_CYCLE = 64   # 2 x 32 B loads per cycle: the L1 ceiling
+LINE_BYTES = 64
+ELEM_BYTES = {'float32': 4, 'float64': 8}
+STREAMS = {'saxpy': 3, 'dot': 2}   # arrays read + written per processed element
+MIN_TIME_S = 1e-5
+PLATEAU_FACTOR = 4
+LEVELS = ['L1', 'L2', 'L3', 'DRAM']
+
+def load_results(base: Path = SCRIPT_DIR) -> pd.DataFrame:
+    """All kernel CSVs in one frame, tagged by kernel/impl/variant/platform from the file name."""
+    frames = []
+    for path in sorted(base.glob('*/*.csv')):
+        m = re.match(r'(saxpy|dot)_(scalar|simd)(?:_(\w+?))?_(win|lin)$', path.stem)
+        if not m:
+            continue
+        df = pd.read_csv(path, usecols=['datatype', 'n', 'stride', 'aligned', 'time_s', 'gflops'])
+        df['kernel'], df['impl'], df['variant'], df['platform'] = m.group(1), m.group(2), m.group(3) or 'base', m.group(4)
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True)
+    df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=['gflops', 'n'])
+    for col in ('kernel', 'impl', 'variant', 'platform', 'datatype'):
+        df[col] = df[col].astype('category')
+    return df
+
+def _plot_module():
+    spec = importlib.util.spec_from_file_location('plot_project2', PLOT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def parse_dram_bandwidth(results: Path = PROJECT2_RESULTS) -> float:
+    """Node 0 -> node 0 read bandwidth (bytes/s) from MLC's bandwidth matrix."""
+    txt = (results / 'bandwidth_matrix.txt').read_text()
+    m = re.search(r'^\s*0\s+([0-9]+\.[0-9]+)', txt, re.M)
+    return float(m.group(1)) * 1e6
+
+def level_ceilings(results: Path = PROJECT2_RESULTS) -> pd.DataFrame:
+    """Capacity, median latency and Little's-law model bandwidth (GB/s) per memory level."""
+    plot = _plot_module()
+    ws = plot.parse_working_set(results / 'working_set_latency.csv')
+    bounds_kb = list(plot.MANUAL_CACHE_BOUNDARIES_KB)
+    edges = [0] + bounds_kb + [np.inf]
+    rows = []
+    for level, lo, hi in zip(LEVELS, edges[:-1], edges[1:]):
+        lat = ws[(ws['size_kb'] > lo) & (ws['size_kb'] <= hi)]['latency_ns'].median()
+        rows.append({'level': level, 'capacity_bytes': hi * 1024, 'latency_ns': lat})
+    ceil = pd.DataFrame(rows)
+    dram_bw = parse_dram_bandwidth(results)
+    lines_in_flight = dram_bw * ceil['latency_ns'].iloc[-1] * 1e-9 / LINE_BYTES
+    ceil['model_GBs'] = np.minimum(lines_in_flight * LINE_BYTES / ceil['latency_ns'],
+                                   LOAD_BYTES_PER_CYCLE * FREQ_GHZ)
+    ceil.loc[ceil['level'] == 'DRAM', 'model_GBs'] = dram_bw / 1e9
+    return ceil
+
+def roofline(df: pd.DataFrame, ceil: pd.DataFrame):
+    """One row per (kernel, impl, variant, platform, n): median GFLOP/s vs the roofline at that size.
+
+    Returns (table, ceilings) with the ceilings' ``observed_GBs`` (plateau
+    rate per level) and ``ceiling_GBs`` (the roof) filled in.
+    """
+    keys = ['kernel', 'impl', 'variant', 'platform', 'datatype', 'stride', 'n']
+    g = (df.groupby(keys, observed=True)
+           .agg(gflops=('gflops', 'median'), time_s=('time_s', 'median'), samples=('gflops', 'size'))
+           .reset_index())
+    elem = g['datatype'].astype(str).map(ELEM_BYTES).astype(float)
+    moved_per_elem = np.minimum(g['stride'].clip(lower=1) * elem, LINE_BYTES)
+    g['ai_flop_per_byte'] = 2.0 / (g['kernel'].astype(str).map(STREAMS).astype(float) * moved_per_elem)
+    g['working_set_bytes'] = 2 * g['n'] * elem
+    level_idx = np.searchsorted(ceil['capacity_bytes'].to_numpy(), g['working_set_bytes'].to_numpy(), side='left')
+    g['level'] = ceil['level'].to_numpy()[level_idx]
+    g['achieved_GBs'] = g['gflops'] / g['ai_flop_per_byte']
+
+    ceil = ceil.copy()
+    floor = np.r_[0, ceil['capacity_bytes'].to_numpy()[:-1]][level_idx] * PLATEAU_FACTOR
+    plateau = g[(g['time_s'] >= MIN_TIME_S) & (g['working_set_bytes'] >= floor)]
+    ceil['observed_GBs'] = ceil['level'].map(plateau.groupby('level')['achieved_GBs'].max())
+    measured = ceil['observed_GBs'].fillna(ceil['model_GBs'])
+    ceil['ceiling_GBs'] = measured[::-1].cummax()[::-1]
+
+    roof = ceil['ceiling_GBs'].to_numpy()
+    in_transition = g['working_set_bytes'].to_numpy() < floor
+    g['ceiling_GBs'] = np.where(in_transition, roof[np.maximum(level_idx - 1, 0)], roof[level_idx])
+    g['mem_ceiling_gflops'] = g['ai_flop_per_byte'] * g['ceiling_GBs']
+    g['peak_gflops'] = [FLOPS_PER_CYCLE[i][d] * FREQ_GHZ for i, d in zip(g['impl'].astype(str), g['datatype'].astype(str))]
+    g['attainable_gflops'] = np.minimum(g['peak_gflops'], g['mem_ceiling_gflops'])
+    g['bound'] = np.where(g['mem_ceiling_gflops'] < g['peak_gflops'], 'memory', 'compute')
+    g['fraction'] = g['gflops'] / g['attainable_gflops']
+    g['gap_gflops'] = g['attainable_gflops'] - g['gflops']
+    return g, ceil
+
+def flag_gaps(table: pd.DataFrame, top: int = 3) -> pd.DataFrame:
+    """Per variant, the ``top`` sizes with the largest absolute gap to the roofline."""
+    reliable = table[table['time_s'] >= MIN_TIME_S]
+    keys = ['kernel', 'impl', 'variant', 'platform']
+    ranked = reliable.sort_values('gap_gflops', ascending=False)
+    return ranked.groupby(keys, observed=True).head(top).sort_values(keys + ['gap_gflops'], ascending=[True] * 4 + [False])
+
+def plot_roofline(table: pd.DataFrame, ceil: pd.DataFrame, out: Path):
+    ai = np.logspace(-3, 1, 200)
+    fig, ax = plt.subplots(figsize=(7,5))
+    for impl, dtype in (('simd', 'float32'), ('scalar', 'float32')):
+        ax.axhline(FLOPS_PER_CYCLE[impl][dtype] * FREQ_GHZ, color='gray', linestyle=':', linewidth=1)
+    for _, c in ceil.iterrows():
+        ax.plot(ai, ai * c['ceiling_GBs'], linewidth=1, label=f"{c['level']} {c['ceiling_GBs']:.0f} GB/s")
+    reliable = table[table['time_s'] >= MIN_TIME_S]
+    for (kernel, impl), grp in reliable.groupby(['kernel', 'impl'], observed=True):
+        ax.scatter(grp['ai_flop_per_byte'], grp['gflops'], s=12, alpha=0.6, label=f'{kernel} {impl}')
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Arithmetic intensity (flop/byte)')
+    ax.set_ylabel('GFLOP/s')
+    ax.set_title('Roofline: Project1 kernels vs measured memory ceilings')
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5, alpha=0.6)
+    ax.legend(fontsize=7, loc='lower right')
+    plt.tight_layout()
+    plt.savefig(out, dpi=150)
+    plt.close()
+    print(f"Saved {out}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=3, help='sizes to flag per variant')
+    args = parser.parse_args()
+
+    df = load_results()
+    table, ceil = roofline(df, level_ceilings())
+    ceil.to_csv(SCRIPT_DIR / 'roofline_ceilings.csv', index=False, float_format='%.4g')
+    print(ceil.to_string(index=False, float_format='%.1f'))
+    for c in ceil.itertuples():
+        if pd.isna(c.observed_GBs):
+            print(f"[WARN] {c.level}: no timeable size inside the level; ceiling from the lower levels "
+                  f"or the Project2 model ({c.ceiling_GBs:.1f} GB/s)")
+        elif c.ceiling_GBs > c.observed_GBs:
+            print(f"[INFO] {c.level}: measured {c.observed_GBs:.1f} GB/s raised to {c.ceiling_GBs:.1f} GB/s "
+                  f"(a slower level sustains more)")
+    table.to_csv(SCRIPT_DIR / 'roofline.csv', index=False)
+    print(f"Saved {SCRIPT_DIR / 'roofline.csv'} ({len(table)} rows from {len(df)} samples)")
+
+    flags = flag_gaps(table, args.top)
+    cols = ['kernel', 'impl', 'variant', 'platform', 'n', 'level', 'bound', 'gflops', 'attainable_gflops',
+            'fraction', 'gap_gflops']
+    flags[cols].to_csv(SCRIPT_DIR / 'roofline_flags.csv', index=False, float_format='%.4g')
+    print(f"Saved {SCRIPT_DIR / 'roofline_flags.csv'}")
+    worst = flags.sort_values('gap_gflops', ascending=False).drop_duplicates(['kernel', 'impl', 'variant', 'platform'])
+    for r in worst.head(8).itertuples():
+        print(f"  {r.kernel} {r.impl} {r.variant} ({r.platform}): n={r.n} in {r.level}, {r.gflops:.2f} of "
+              f"{r.attainable_gflops:.2f} GFLOP/s ({100 * r.fraction:.0f}%, {r.bound}-bound)")
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    plot_roofline(table, ceil, OUTPUT_DIR / 'roofline.png')
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,7 @@ Outputs (PNG) saved into proj2_results/plots/
 """
 from __future__ import annotations
 import re
+import json
 import math
 import pathlib
 import statistics as stats
@@ -34,7 +35,6 @@ import numpy as np
 
 RESULTS_DIR = pathlib.Path('results')
 PLOTS_DIR = RESULTS_DIR / 'plots'
-PLOTS_DIR.mkdir(parents=True, exist_ok=True)
 
 # ---------------------------------------------------------------------------
 # Option A: Manual cache boundary override
@@ -53,6 +53,13 @@ PLOTS_DIR.mkdir(parents=True, exist_ok=True)
 USE_MANUAL_CACHE_BOUNDARIES = True
 MANUAL_CACHE_BOUNDARIES_KB = [32, 256, 6144]
 
+# perf sweep ingestion: the CSV is read in chunks with these dtypes, pivoted
+# per chunk, and the wide table is cached as one .npy per column next to it.
+PERF_INDEX_COLS = ['size_bytes','stride_bytes','threads','pattern','gbs','huge']
+PERF_DTYPES = {'event':'category', 'pattern':'category', 'value':'float64', 'size_bytes':'int64',
+               'stride_bytes':'int32', 'threads':'int16', 'gbs':'float64', 'huge':'int8'}
+PERF_CHUNK_ROWS = 1_000_000
+
 def parse_loaded_latency(path: pathlib.Path) -> pd.DataFrame:
     pat = re.compile(r'^(\d+)\s+([0-9.]+)\s+([0-9.]+)')
     rows = []
@@ -182,20 +189,323 @@ def parse_rw_bandwidth(files: List[Tuple[str, pathlib.Path]]) -> pd.DataFrame:
             rows.append((label, max(nums)))  # crude: take max as peak MB/s
     return pd.DataFrame(rows, columns=['mix','bandwidth_MB_s'])
 
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    # Chunks may carry different category sets; restore one categorical per column after combining them
+    for col, dtype in PERF_DTYPES.items():
+        if dtype == 'category' and col in df.columns:
+            df[col] = df[col].astype('category')
+    # size_bytes is parsed as int64 but stored as int32 whenever the values fit (<2 GiB)
+    if 'size_bytes' in df.columns and df['size_bytes'].between(-2**31, 2**31 - 1).all():
+        df['size_bytes'] = df['size_bytes'].astype('int32')
+    return df
+
+def pivot_perf_csv(path: pathlib.Path, chunk_rows: int = PERF_CHUNK_ROWS) -> pd.DataFrame:
+    """Event-per-row perf CSV -> one row per configuration, one column per event.
+
+    Each chunk is pivoted on its own ('first' value per event, as a single
+    pivot_table would); a configuration split across chunks appears in two
+    partial pivots, which the final groupby().first() folds together.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: t for c, t in PERF_DTYPES.items() if c in header}
+    reader = pd.read_csv(path, dtype=dtypes, chunksize=chunk_rows,
+                         na_values=['<not counted>', '<not supported>'])
+    if 'event' not in header:
+        return _compact_dtypes(pd.concat(reader, ignore_index=True))
+    idx_cols = [c for c in PERF_INDEX_COLS if c in header]
+    parts = [chunk.pivot_table(index=idx_cols, columns='event', values='value', aggfunc='first', observed=True)
+             for chunk in reader]
+    if not parts:
+        return pd.DataFrame(columns=idx_cols)
+    wide = pd.concat(parts)
+    wide.columns = wide.columns.astype(str)
+    wide = wide.groupby(level=list(range(len(idx_cols))), observed=True, sort=True).first().reset_index()
+    wide.columns.name = None
+    return _compact_dtypes(wide)
+
+def save_columnar(df: pd.DataFrame, cache_dir: pathlib.Path, source: pathlib.Path):
+    """One .npy per column (categoricals as codes) plus meta.json with categories and source stamp."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    st = source.stat()
+    meta = {'source_size': st.st_size, 'source_mtime_ns': st.st_mtime_ns, 'columns': []}
+    for i, col in enumerate(df.columns):
+        fname = f'{i:03d}.npy'
+        series = df[col]
+        entry = {'name': col, 'file': fname}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['categories'] = [str(c) for c in series.cat.categories]
+            np.save(cache_dir/fname, series.cat.codes.to_numpy())
+        else:
+            np.save(cache_dir/fname, series.to_numpy())
+        meta['columns'].append(entry)
+    (cache_dir/'meta.json').write_text(json.dumps(meta, indent=1))
+
+def load_columnar(cache_dir: pathlib.Path, source: pathlib.Path):
+    """Memory-map a cache written by save_columnar; None if missing or the source changed."""
+    meta_path = cache_dir/'meta.json'
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text())
+    st = source.stat()
+    if meta.get('source_size') != st.st_size or meta.get('source_mtime_ns') != st.st_mtime_ns:
+        return None
+    cols = {}
+    for entry in meta['columns']:
+        arr = np.load(cache_dir/entry['file'], mmap_mode='r')
+        if 'categories' in entry:
+            cols[entry['name']] = pd.Categorical.from_codes(arr, entry['categories'])
+        else:
+            cols[entry['name']] = arr
+    return pd.DataFrame(cols)
+
+def load_perf_sweep(path: pathlib.Path, cache_dir: pathlib.Path | None = None) -> pd.DataFrame:
+    """Wide perf sweep table, from the columnar cache when it matches the CSV, else parsed and cached."""
+    cache_dir = cache_dir or path.with_suffix('.cols')
+    df = load_columnar(cache_dir, path)
+    if df is not None:
+        return df
+    df = pivot_perf_csv(path)
+    save_columnar(df, cache_dir, path)
+    return df
+
 def plot_intensity(df: pd.DataFrame):
     fig, ax1 = plt.subplots(figsize=(6,4))
     ax1.plot(df['bandwidth_MB_s'], df['latency_ns'], marker='o')
     ax1.set_xlabel('Throughput (MB/s)')
     ax1.set_ylabel('Latency (ns)')
     knee_delay, knee_lat = find_knee(df)
-    knee_bw = float(df[df['inject_delay']==knee_delay]['bandwidth_MB_s'])
+    knee_bw = float(df[df['inject_delay']==knee_delay]['bandwidth_MB_s'].iloc[0])
     ax1.scatter([knee_bw],[knee_lat], color='red', zorder=5, label=f'knee delay={knee_delay}')
     ax1.legend()
     ax1.set_title('Intensity Sweep: Throughput vs Latency')
     fig.tight_layout()
     fig.savefig(PLOTS_DIR/'intensity_throughput_latency.png', dpi=160)
 
+RW_MIX_FILES = [
+    ('100R', RESULTS_DIR/'bw_read.txt'),
+    ('100W', RESULTS_DIR/'bw_write.txt'),
+    ('70/30', RESULTS_DIR/'bw_rw70_30.txt'),
+    ('50/50', RESULTS_DIR/'bw_rw50_50.txt'),
+]
+
+def clean_working_set(ws_df: pd.DataFrame) -> pd.DataFrame:
+    # Ensure numeric
+    ws_df = ws_df[pd.to_numeric(ws_df['latency_ns'], errors='coerce').notna()].copy()
+    ws_df['latency_ns'] = ws_df['latency_ns'].astype(float)
+    return ws_df
+
+def plot_working_set(ws_df: pd.DataFrame):
+    ws_df = clean_working_set(ws_df)
+    if ws_df.empty:
+        return
+    # Interpolate to create smoother curve (log-space on size)
+    ws_df = ws_df.sort_values('size_kb')
+    sizes = ws_df['size_kb'].values
+    lats = ws_df['latency_ns'].values
+    # Generate log-spaced interpolation points (avoid extrapolating beyond original range)
+    interp_sizes = np.unique(np.logspace(np.log10(sizes[0]), np.log10(sizes[-1]), 300))
+    # Piecewise linear interpolation in log-size domain
+    lat_interp = np.interp(np.log10(interp_sizes), np.log10(sizes), lats)
+    fig, ax = plt.subplots(figsize=(6.4,4.2))
+    ax.plot(interp_sizes, lat_interp, color='#1565c0', linewidth=1.5, label='Latency (interp)')
+    ax.scatter(sizes, lats, color='#0d47a1', s=18, zorder=3, label='Measured')
+    ax.set_xscale('log')
+    ax.set_xlabel('Working Set (KB, log scale)')
+    ax.set_ylabel('Latency (ns)')
+    annotate_cache_levels(ax, ws_df)
+    ax.set_title('Working-set Latency vs Size (Smoothed)')
+    ax.legend(loc='upper left')
+    ax.grid(alpha=0.25, which='both')
+    fig.tight_layout()
+    fig.savefig(PLOTS_DIR/'working_set_latency.png', dpi=160)
+
+def plot_rw_mix(bw_df: pd.DataFrame):
+    if bw_df.empty:
+        return
+    fig, ax = plt.subplots(figsize=(5,4))
+    ax.bar(bw_df['mix'], bw_df['bandwidth_MB_s'], color='#90caf9')
+    ax.set_ylabel('Bandwidth (MB/s)')
+    ax.set_title('Read/Write Mix Peak Bandwidth')
+    fig.tight_layout()
+    fig.savefig(PLOTS_DIR/'rw_mix_bandwidth.png', dpi=160)
+
+def prepare_perf(df: pd.DataFrame) -> pd.DataFrame:
+    # Correct throughput: kernel overestimates bytes by multiplying accesses * stride.
+    # Actual bytes touched per access is 8 (sizeof(uint64_t)). Therefore corrected_gbs = gbs_raw * (8 / stride_bytes).
+    df = df.copy()
+    if 'gbs' in df.columns and 'stride_bytes' in df.columns:
+        df.rename(columns={'gbs':'gbs_raw'}, inplace=True)
+        df['gbs'] = df['gbs_raw'] * (8.0 / df['stride_bytes'].clip(lower=1))
+    else:
+        df['gbs_raw'] = df.get('gbs', np.nan)
+    return df
+
+def plot_cache_miss_impact(df: pd.DataFrame):
+    # Cache miss impact (requires cache-misses & cache-references columns now present post-pivot)
+    if not {'cache-misses','cache-references','gbs','size_bytes'}.issubset(df.columns):
+        return
+    agg = df.groupby('size_bytes').agg({'cache-misses':'sum','cache-references':'sum','gbs':'mean'}).reset_index()
+    # Avoid divide-by-zero
+    agg = agg[agg['cache-references']>0]
+    if agg.empty:
+        return
+    agg['miss_rate'] = agg['cache-misses']/agg['cache-references']
+    fig, ax1 = plt.subplots(figsize=(6,4))
+    ax2 = ax1.twinx()
+    l1, = ax1.plot(agg['size_bytes']/1024, agg['miss_rate'], marker='o', color='tab:red', label='Cache Miss Rate')
+    l2, = ax2.plot(agg['size_bytes']/1024, agg['gbs'], marker='s', color='tab:blue', label='Throughput (GB/s, corrected)')
+    ax1.set_xscale('log')
+    ax1.set_xlabel('Working Set (KB)')
+    ax1.set_ylabel('Cache Miss Rate')
+    ax2.set_ylabel('Throughput (GB/s)')
+    ax1.legend([l1,l2],[l1.get_label(), l2.get_label()], loc='upper left')
+    fig.tight_layout()
+    fig.savefig(PLOTS_DIR/'cache_miss_impact.png', dpi=160)
+
+def plot_tlb_miss_impact(df: pd.DataFrame):
+    # TLB miss impact (only if dTLB-load-misses available)
+    if not {'dTLB-load-misses','gbs','size_bytes'}.issubset(df.columns):
+        return
+    agg2 = df.groupby('size_bytes').agg({'dTLB-load-misses':'sum','gbs':'mean'}).reset_index()
+    if agg2.empty:
+        return
+    fig, ax1 = plt.subplots(figsize=(6,4))
+    ax2 = ax1.twinx()
+    l1, = ax1.plot(agg2['size_bytes']/1024, agg2['dTLB-load-misses'], marker='o', color='tab:purple', label='dTLB-load-misses')
+    l2, = ax2.plot(agg2['size_bytes']/1024, agg2['gbs'], marker='s', color='tab:green', label='Throughput (GB/s, corrected)')
+    ax1.set_xscale('log')
+    ax1.set_xlabel('Working Set (KB)')
+    ax1.set_ylabel('dTLB-load-misses')
+    ax2.set_ylabel('Throughput (GB/s)')
+    ax1.set_title('TLB Miss Impact')
+    ax1.legend([l1,l2],[l1.get_label(), l2.get_label()], loc='upper left')
+    fig.tight_layout()
+    fig.savefig(PLOTS_DIR/'tlb_miss_impact.png', dpi=160)
+
+def plot_stride_pattern(df: pd.DataFrame):
+    # Pattern × stride heatmap (use large sizes > 16MB, single-thread only)
+    if not {'stride_bytes','pattern','gbs','threads','size_bytes'}.issubset(df.columns):
+        return
+    subset = df[(df['threads']==1) & (df['size_bytes']>=16*1024*1024)]
+    if subset.empty:
+        return
+    pivot = (subset
+             .groupby(['stride_bytes','pattern'], observed=True)
+             .agg({'gbs':'mean','gbs_raw':'mean'})
+             .reset_index()
+             .pivot(index='stride_bytes', columns='pattern', values='gbs'))
+    pivot = pivot.sort_index()
+    fig, ax = plt.subplots(figsize=(5.4,4.4))
+    im = ax.imshow(pivot.values, aspect='auto', cmap='viridis', vmin=pivot.values.min(), vmax=pivot.values.max())
+    ax.set_yticks(range(len(pivot.index)))
+    ax.set_yticklabels(pivot.index)
+    ax.set_xticks(range(len(pivot.columns)))
+    ax.set_xticklabels(pivot.columns)
+    ax.set_xlabel('Pattern')
+    ax.set_ylabel('Stride (bytes)')
+    ax.set_title('Throughput vs Stride & Pattern (GB/s)')
+    for i,s in enumerate(pivot.index):
+        for j,p in enumerate(pivot.columns):
+            val = pivot.loc[s,p]
+            ax.text(j, i, f"{val:.1f}", ha='center', va='center', fontsize=7,
+                    color='white' if val > (pivot.values.min()+0.55*np.ptp(pivot.values)) else 'black')
+    fig.colorbar(im, ax=ax, label='GB/s (higher better)')
+    fig.tight_layout()
+    fig.savefig(PLOTS_DIR/'stride_pattern_heatmap.png', dpi=160)
+    # Additional line plot to emphasize stride monotonic trend per pattern
+    line_df = subset.groupby(['stride_bytes','pattern'], observed=True).agg({'gbs':'mean','gbs_raw':'mean'}).reset_index()
+    fig2, axl = plt.subplots(figsize=(5.4,4.0))
+    for pat in sorted(line_df['pattern'].unique()):
+        cur = line_df[line_df['pattern']==pat].sort_values('stride_bytes')
+        axl.plot(cur['stride_bytes'], cur['gbs'], marker='o', label=f"{pat} (corrected)")
+        axl.plot(cur['stride_bytes'], cur['gbs_raw'], marker='x', linestyle='--', alpha=0.4, label=f"{pat} raw")
+    axl.set_xscale('log', base=2)
+    axl.set_xlabel('Stride (bytes, log2)')
+    axl.set_ylabel('Throughput (GB/s)')
+    axl.set_title('Stride Impact on Throughput (Corrected vs Raw)')
+    axl.legend()
+    axl.grid(alpha=0.25, which='both')
+    fig2.tight_layout()
+    fig2.savefig(PLOTS_DIR/'stride_pattern_lines.png', dpi=160)
+
+def plot_hugepage_benefit(df: pd.DataFrame):
+    # Huge page benefit comparison (if huge column present)
+    if 'huge' not in df.columns or df['huge'].nunique()<=1:
+        return
+    huge_subset = df[(df['threads']==1) & (df['pattern']=='seq')]
+    if huge_subset.empty:
+        return
+    agg_cols = {'gbs':'mean'}
+    if 'dTLB-load-misses' in df.columns:
+        agg_cols['dTLB-load-misses'] = 'sum'
+    agg_h = huge_subset.groupby(['size_bytes','huge']).agg(agg_cols).reset_index()
+    fig, ax1 = plt.subplots(figsize=(6,4))
+    for flag,label,style in [(0,'Normal Pages','o-'),(1,'Huge Pages','s-')]:
+        line = agg_h[agg_h['huge']==flag]
+        if not line.empty:
+            ax1.plot(line['size_bytes']/1024/1024, line['gbs'], style, label=f'Throughput {label}')
+    ax1.set_xscale('log')
+    ax1.set_xlabel('Working Set (MB)')
+    ax1.set_ylabel('Throughput (GB/s)')
+    subtitle = 'Huge Page Impact (Seq, 1 Thread)'
+    if 'dTLB-load-misses' in agg_h.columns:
+        subtitle += ''  # Placeholder if later we add secondary axis
+    ax1.set_title(subtitle)
+    ax1.legend(loc='best')
+    fig.tight_layout()
+    fig.savefig(PLOTS_DIR/'hugepage_benefit.png', dpi=160)
+
+PERF_PLOTS = [plot_cache_miss_impact, plot_tlb_miss_impact, plot_stride_pattern, plot_hugepage_benefit]
+
+def write_baseline_latency_table(ws: pd.DataFrame, baseline_md: pathlib.Path = RESULTS_DIR/'baseline_latency_table.md'):
+    # Clean numeric
+    ws = clean_working_set(ws)
+    if ws.empty:
+        return
+    sizes = ws['size_kb'].tolist(); lats = ws['latency_ns'].tolist()
+    boundaries = []
+    for i in range(1,len(ws)):
+        if lats[i] > 1.5*lats[i-1]:
+            boundaries.append(sizes[i])
+    regions = []
+    start = sizes[0]
+    b_ext = boundaries + [sizes[-1]]
+    for b in b_ext:
+        region_points = [l for s,l in zip(sizes,lats) if s>=start and s<=b]
+        if region_points:
+            regions.append((start,b, float(np.median(region_points))))
+        start = b
+    labels = ['L1','L2','L3','Memory']
+    with baseline_md.open('w') as f:
+        f.write('| Level | Size Range (KB) | Median Latency (ns) |\n|-------|-----------------|-------------------|\n')
+        for (idx,(a,b,med)) in enumerate(regions):
+            if idx>=len(labels): break
+            f.write(f"| {labels[idx]} | {int(a)}–{int(b)} | {med:.2f} |\n")
+
+def write_mlc_summary(lat_file: pathlib.Path, ll_file: pathlib.Path, mlc_md: pathlib.Path = RESULTS_DIR/'mlc_baselines.md'):
+    # Additional MLC summary parsing
+    txt = lat_file.read_text().splitlines()
+    idle = None
+    for ln in txt:
+        m = re.match(r'^\s*0\s+([0-9]+\.[0-9]+)', ln)
+        if m:
+            idle = float(m.group(1))
+            break
+    with mlc_md.open('w') as f:
+        f.write('# MLC Baseline Summary\n')
+        if idle:
+            f.write(f'* Idle random access latency (ns): {idle}\n')
+        else:
+            f.write('* Idle latency not parsed.*\n')
+        if ll_file.exists():
+            ll_df = parse_loaded_latency(ll_file)
+            if not ll_df.empty:
+                f.write(f"* Min loaded latency: {ll_df['latency_ns'].min():.2f} ns\n")
+                f.write(f"* Max bandwidth observed: {ll_df['bandwidth_MB_s'].max():.2f} MB/s\n")
+
 def main():
+    # Each figure/table is its own function so analysis_pipeline.py can run them as separate tasks
+    PLOTS_DIR.mkdir(parents=True, exist_ok=True)
     # 4. Intensity sweep
     ll_file = RESULTS_DIR/'loaded_latency.txt'
     if ll_file.exists():
@@ -205,220 +515,27 @@ def main():
     ws_file = RESULTS_DIR/'working_set_latency.csv'
     if ws_file.exists():
         try:
-            ws_df = parse_working_set(ws_file)
-            # Ensure numeric
-            ws_df = ws_df[pd.to_numeric(ws_df['latency_ns'], errors='coerce').notna()]
-            ws_df['latency_ns'] = ws_df['latency_ns'].astype(float)
-            if not ws_df.empty:
-                # Interpolate to create smoother curve (log-space on size)
-                ws_df = ws_df.sort_values('size_kb')
-                sizes = ws_df['size_kb'].values
-                lats = ws_df['latency_ns'].values
-                # Generate log-spaced interpolation points (avoid extrapolating beyond original range)
-                interp_sizes = np.unique(np.logspace(np.log10(sizes[0]), np.log10(sizes[-1]), 300))
-                # Piecewise linear interpolation in log-size domain
-                lat_interp = np.interp(np.log10(interp_sizes), np.log10(sizes), lats)
-                fig, ax = plt.subplots(figsize=(6.4,4.2))
-                ax.plot(interp_sizes, lat_interp, color='#1565c0', linewidth=1.5, label='Latency (interp)')
-                ax.scatter(sizes, lats, color='#0d47a1', s=18, zorder=3, label='Measured')
-                ax.set_xscale('log')
-                ax.set_xlabel('Working Set (KB, log scale)')
-                ax.set_ylabel('Latency (ns)')
-                annotate_cache_levels(ax, ws_df)
-                ax.set_title('Working-set Latency vs Size (Smoothed)')
-                ax.legend(loc='upper left')
-                ax.grid(alpha=0.25, which='both')
-                fig.tight_layout()
-                fig.savefig(PLOTS_DIR/'working_set_latency.png', dpi=160)
+            plot_working_set(parse_working_set(ws_file))
         except Exception as e:
             print(f"[warn] Skipping working set plot due to parse issue: {e}")
     # 3. Read/Write mix
-    bw_df = parse_rw_bandwidth([
-        ('100R', RESULTS_DIR/'bw_read.txt'),
-        ('100W', RESULTS_DIR/'bw_write.txt'),
-        ('70/30', RESULTS_DIR/'bw_rw70_30.txt'),
-        ('50/50', RESULTS_DIR/'bw_rw50_50.txt'),
-    ])
-    if not bw_df.empty:
-        fig, ax = plt.subplots(figsize=(5,4))
-        ax.bar(bw_df['mix'], bw_df['bandwidth_MB_s'], color='#90caf9')
-        ax.set_ylabel('Bandwidth (MB/s)')
-        ax.set_title('Read/Write Mix Peak Bandwidth')
-        fig.tight_layout()
-        fig.savefig(PLOTS_DIR/'rw_mix_bandwidth.png', dpi=160)
+    plot_rw_mix(parse_rw_bandwidth(RW_MIX_FILES))
     # 6 & 7. Cache/TLB miss impact (from perf CSV if exists)
     perf_csv = RESULTS_DIR/'perf_cachemiss_sweep.csv'
     if perf_csv.exists():
-        df_raw = pd.read_csv(perf_csv)
-        # Pivot event rows (one per event) into columns for easier aggregation
-        if 'event' in df_raw.columns:
-            idx_cols = [c for c in ['size_bytes','stride_bytes','threads','pattern','gbs','huge'] if c in df_raw.columns]
-            # Some events repeat across patterns/threads/size; keep first (they should be consistent within a row group)
-            df = (df_raw
-                  .pivot_table(index=idx_cols, columns='event', values='value', aggfunc='first')
-                  .reset_index())
-        else:
-            df = df_raw.copy()
-
-        # Correct throughput: kernel overestimates bytes by multiplying accesses * stride.
-        # Actual bytes touched per access is 8 (sizeof(uint64_t)). Therefore corrected_gbs = gbs_raw * (8 / stride_bytes).
-        if 'gbs' in df.columns and 'stride_bytes' in df.columns:
-            df.rename(columns={'gbs':'gbs_raw'}, inplace=True)
-            df['gbs'] = df['gbs_raw'] * (8.0 / df['stride_bytes'].clip(lower=1))
-        else:
-            df['gbs_raw'] = df.get('gbs', np.nan)
-
-        # Cache miss impact (requires cache-misses & cache-references columns now present post-pivot)
-        if {'cache-misses','cache-references','gbs','size_bytes'}.issubset(df.columns):
-            agg = df.groupby('size_bytes').agg({'cache-misses':'sum','cache-references':'sum','gbs':'mean'}).reset_index()
-            # Avoid divide-by-zero
-            agg = agg[agg['cache-references']>0]
-            if not agg.empty:
-                agg['miss_rate'] = agg['cache-misses']/agg['cache-references']
-                fig, ax1 = plt.subplots(figsize=(6,4))
-                ax2 = ax1.twinx()
-                l1, = ax1.plot(agg['size_bytes']/1024, agg['miss_rate'], marker='o', color='tab:red', label='Cache Miss Rate')
-                l2, = ax2.plot(agg['size_bytes']/1024, agg['gbs'], marker='s', color='tab:blue', label='Throughput (GB/s, corrected)')
-                ax1.set_xscale('log')
-                ax1.set_xlabel('Working Set (KB)')
-                ax1.set_ylabel('Cache Miss Rate')
-                ax2.set_ylabel('Throughput (GB/s)')
-                ax1.legend([l1,l2],[l1.get_label(), l2.get_label()], loc='upper left')
-                fig.tight_layout()
-                fig.savefig(PLOTS_DIR/'cache_miss_impact.png', dpi=160)
-        # TLB miss impact (only if dTLB-load-misses available)
-        if {'dTLB-load-misses','gbs','size_bytes'}.issubset(df.columns):
-            agg2 = df.groupby('size_bytes').agg({'dTLB-load-misses':'sum','gbs':'mean'}).reset_index()
-            if not agg2.empty:
-                fig, ax1 = plt.subplots(figsize=(6,4))
-                ax2 = ax1.twinx()
-                l1, = ax1.plot(agg2['size_bytes']/1024, agg2['dTLB-load-misses'], marker='o', color='tab:purple', label='dTLB-load-misses')
-                l2, = ax2.plot(agg2['size_bytes']/1024, agg2['gbs'], marker='s', color='tab:green', label='Throughput (GB/s, corrected)')
-                ax1.set_xscale('log')
-                ax1.set_xlabel('Working Set (KB)')
-                ax1.set_ylabel('dTLB-load-misses')
-                ax2.set_ylabel('Throughput (GB/s)')
-                ax1.set_title('TLB Miss Impact')
-                ax1.legend([l1,l2],[l1.get_label(), l2.get_label()], loc='upper left')
-                fig.tight_layout()
-                fig.savefig(PLOTS_DIR/'tlb_miss_impact.png', dpi=160)
-        # Pattern × stride heatmap (use large sizes > 16MB, single-thread only)
-        if {'stride_bytes','pattern','gbs','threads','size_bytes'}.issubset(df.columns):
-            subset = df[(df['threads']==1) & (df['size_bytes']>=16*1024*1024)]
-            if not subset.empty:
-                pivot = (subset
-                         .groupby(['stride_bytes','pattern'])
-                         .agg({'gbs':'mean','gbs_raw':'mean'})
-                         .reset_index()
-                         .pivot(index='stride_bytes', columns='pattern', values='gbs'))
-                pivot = pivot.sort_index()
-                fig, ax = plt.subplots(figsize=(5.4,4.4))
-                im = ax.imshow(pivot.values, aspect='auto', cmap='viridis', vmin=pivot.values.min(), vmax=pivot.values.max())
-                ax.set_yticks(range(len(pivot.index)))
-                ax.set_yticklabels(pivot.index)
-                ax.set_xticks(range(len(pivot.columns)))
-                ax.set_xticklabels(pivot.columns)
-                ax.set_xlabel('Pattern')
-                ax.set_ylabel('Stride (bytes)')
-                ax.set_title('Throughput vs Stride & Pattern (GB/s)')
-                for i,s in enumerate(pivot.index):
-                    for j,p in enumerate(pivot.columns):
-                        val = pivot.loc[s,p]
-                        ax.text(j, i, f"{val:.1f}", ha='center', va='center', fontsize=7,
-                                color='white' if val > (pivot.values.min()+0.55*pivot.values.ptp()) else 'black')
-                fig.colorbar(im, ax=ax, label='GB/s (higher better)')
-                fig.tight_layout()
-                fig.savefig(PLOTS_DIR/'stride_pattern_heatmap.png', dpi=160)
-                # Additional line plot to emphasize stride monotonic trend per pattern
-                line_df = subset.groupby(['stride_bytes','pattern']).agg({'gbs':'mean','gbs_raw':'mean'}).reset_index()
-                fig2, axl = plt.subplots(figsize=(5.4,4.0))
-                for pat in sorted(line_df['pattern'].unique()):
-                    cur = line_df[line_df['pattern']==pat].sort_values('stride_bytes')
-                    axl.plot(cur['stride_bytes'], cur['gbs'], marker='o', label=f"{pat} (corrected)")
-                    axl.plot(cur['stride_bytes'], cur['gbs_raw'], marker='x', linestyle='--', alpha=0.4, label=f"{pat} raw")
-                axl.set_xscale('log', base=2)
-                axl.set_xlabel('Stride (bytes, log2)')
-                axl.set_ylabel('Throughput (GB/s)')
-                axl.set_title('Stride Impact on Throughput (Corrected vs Raw)')
-                axl.legend()
-                axl.grid(alpha=0.25, which='both')
-                fig2.tight_layout()
-                fig2.savefig(PLOTS_DIR/'stride_pattern_lines.png', dpi=160)
-        # Huge page benefit comparison (if huge column present)
-        if 'huge' in df.columns and df['huge'].nunique()>1:
-            huge_subset = df[(df['threads']==1) & (df['pattern']=='seq')]
-            if not huge_subset.empty:
-                agg_cols = {'gbs':'mean'}
-                if 'dTLB-load-misses' in df.columns:
-                    agg_cols['dTLB-load-misses'] = 'sum'
-                agg_h = huge_subset.groupby(['size_bytes','huge']).agg(agg_cols).reset_index()
-                fig, ax1 = plt.subplots(figsize=(6,4))
-                for flag,label,style in [(0,'Normal Pages','o-'),(1,'Huge Pages','s-')]:
-                    line = agg_h[agg_h['huge']==flag]
-                    if not line.empty:
-                        ax1.plot(line['size_bytes']/1024/1024, line['gbs'], style, label=f'Throughput {label}')
-                ax1.set_xscale('log')
-                ax1.set_xlabel('Working Set (MB)')
-                ax1.set_ylabel('Throughput (GB/s)')
-                subtitle = 'Huge Page Impact (Seq, 1 Thread)'
-                if 'dTLB-load-misses' in agg_h.columns:
-                    subtitle += ''  # Placeholder if later we add secondary axis
-                ax1.set_title(subtitle)
-                ax1.legend(loc='best')
-                fig.tight_layout()
-                fig.savefig(PLOTS_DIR/'hugepage_benefit.png', dpi=160)
+        # Chunked, typed ingestion + per-chunk pivot; later runs memory-map perf_cachemiss_sweep.cols/
+        df = prepare_perf(load_perf_sweep(perf_csv))
+        for plot in PERF_PLOTS:
+            plot(df)
     # 1. Baseline latency markdown (from working_set + latencies)
-    baseline_md = RESULTS_DIR/'baseline_latency_table.md'
-    if (RESULTS_DIR/'working_set_latency.csv').exists():
-            try:
-                ws = parse_working_set(RESULTS_DIR/'working_set_latency.csv')
-                # Clean numeric
-                ws = ws[pd.to_numeric(ws['latency_ns'], errors='coerce').notna()]
-                ws['latency_ns'] = ws['latency_ns'].astype(float)
-                if not ws.empty:
-                    sizes = ws['size_kb'].tolist(); lats = ws['latency_ns'].tolist()
-                    boundaries = []
-                    for i in range(1,len(ws)):
-                        if lats[i] > 1.5*lats[i-1]:
-                            boundaries.append(sizes[i])
-                    regions = []
-                    start = sizes[0]
-                    b_ext = boundaries + [sizes[-1]]
-                    for b in b_ext:
-                        region_points = [l for s,l in zip(sizes,lats) if s>=start and s<=b]
-                        if region_points:
-                            regions.append((start,b, float(np.median(region_points))))
-                        start = b
-                    labels = ['L1','L2','L3','Memory']
-                    with baseline_md.open('w') as f:
-                        f.write('| Level | Size Range (KB) | Median Latency (ns) |\n|-------|-----------------|-------------------|\n')
-                        for (idx,(a,b,med)) in enumerate(regions):
-                            if idx>=len(labels): break
-                            f.write(f"| {labels[idx]} | {int(a)}–{int(b)} | {med:.2f} |\n")
-            except Exception as e:
-                print(f"[warn] Skipping baseline latency table: {e}")
-    # Additional MLC summary parsing
-    mlc_md = RESULTS_DIR/'mlc_baselines.md'
+    if ws_file.exists():
+        try:
+            write_baseline_latency_table(parse_working_set(ws_file))
+        except Exception as e:
+            print(f"[warn] Skipping baseline latency table: {e}")
     lat_file = RESULTS_DIR/'latencies.txt'
     if lat_file.exists():
-        txt = lat_file.read_text().splitlines()
-        idle = None
-        for ln in txt:
-            m = re.match(r'^\s*0\s+([0-9]+\.[0-9]+)', ln)
-            if m:
-                idle = float(m.group(1))
-                break
-        with mlc_md.open('w') as f:
-            f.write('# MLC Baseline Summary\n')
-            if idle:
-                f.write(f'* Idle random access latency (ns): {idle}\n')
-            else:
-                f.write('* Idle latency not parsed.*\n')
-            if (RESULTS_DIR/'loaded_latency.txt').exists():
-                ll_df = parse_loaded_latency(RESULTS_DIR/'loaded_latency.txt')
-                if not ll_df.empty:
-                    f.write(f"* Min loaded latency: {ll_df['latency_ns'].min():.2f} ns\n")
-                    f.write(f"* Max bandwidth observed: {ll_df['bandwidth_MB_s'].max():.2f} MB/s\n")
+        write_mlc_summary(lat_file, ll_file)
     print(f"Plots saved to {PLOTS_DIR}")
     print(f"Plots saved to {PLOTS_DIR}")
 
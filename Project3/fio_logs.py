@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Time-windowed analysis of fio per-I/O logs (write_lat_log / write_iops_log).
+
+fio writes one CSV line per I/O (log_avg_msec=0) or per averaging interval:
+
+    time_ms, value, ddir, bs[, offset[, prio]]
+
+value is a latency in ns (fio >= 3; clat/slat/lat logs) or an IOPS sample
+(iops logs: 1 per I/O, or the interval's average IOPS with log_avg_msec>0).
+ddir is 0 read, 1 write, 2 trim.
+
+A log is read in chunks of rows straight into per-column binary files
+(<log>.cols/{time_ms,value,ddir,bs}.bin + meta.json), so memory stays flat
+however long the log is. Later runs memory-map the columns; the cache is
+rebuilt when the log's size or mtime changes.
+
+window_series() slides a window over the run and reports IOPS and latency
+percentiles per step; tail_degradation() groups the windows whose p99 or
+p99.9 rises well above the run's median into periods (GC pauses, thermal
+throttling and the like that the end-of-run summary averages away).
+
+  python3 fio_logs.py results/logs/qd_16_clat.1.log
+  python3 fio_logs.py results/logs/*_clat.1.log --window-ms 500 --step-ms 50 --factor 1.5 --plots
+"""
+import argparse
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+PLOTS_DIR = "plots"
+CHUNK_ROWS = 5_000_000
+COLUMNS = {'time_ms': np.int64, 'value': np.int64, 'ddir': np.int8, 'bs': np.int32}
+DDIR = {'read': 0, 'write': 1, 'trim': 2}
+
+class FioLog:
+    """One fio log as memory-mapped columns (log.time_ms, log.value, log.ddir, log.bs)."""
+    def __init__(self, path: str, cache_dir: Optional[str] = None, chunk_rows: int = CHUNK_ROWS):
+        self.path = path
+        self.cache_dir = cache_dir or path + '.cols'
+        self.kind = 'iops' if '_iops.' in os.path.basename(path) else 'lat'
+        if not self._cache_valid():
+            build_cache(path, self.cache_dir, chunk_rows)
+        with open(os.path.join(self.cache_dir, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.rows = self.meta['rows']
+        for name, dtype in COLUMNS.items():
+            col_path = os.path.join(self.cache_dir, f'{name}.bin')
+            col = np.memmap(col_path, dtype=dtype, mode='r') if self.rows else np.zeros(0, dtype)
+            setattr(self, name, col)
+
+    def _cache_valid(self) -> bool:
+        meta_path = os.path.join(self.cache_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path) as f:
+            meta = json.load(f)
+        st = os.stat(self.path)
+        return meta.get('source_size') == st.st_size and meta.get('source_mtime_ns') == st.st_mtime_ns
+
+    def __len__(self):
+        return self.rows
+
+def build_cache(path: str, cache_dir: str, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """Convert a fio log to per-column binary files, ``chunk_rows`` lines at a time."""
+    os.makedirs(cache_dir, exist_ok=True)
+    st = os.stat(path)
+    rows, min_value, max_value, last_t, in_order = 0, None, None, None, True
+    outs = {name: open(os.path.join(cache_dir, f'{name}.bin'), 'wb') for name in COLUMNS}
+    try:
+        reader = pd.read_csv(path, header=None, usecols=[0, 1, 2, 3], names=list(COLUMNS),
+                             dtype=COLUMNS, skipinitialspace=True, chunksize=chunk_rows)
+        for chunk in reader:
+            t = chunk['time_ms'].to_numpy()
+            if len(t):
+                in_order = in_order and (last_t is None or t[0] >= last_t) and bool(np.all(t[1:] >= t[:-1]))
+                last_t = t[-1]
+                v = chunk['value'].to_numpy()
+                min_value = int(v.min()) if min_value is None else min(min_value, int(v.min()))
+                max_value = int(v.max()) if max_value is None else max(max_value, int(v.max()))
+            for name, dtype in COLUMNS.items():
+                outs[name].write(chunk[name].to_numpy(dtype=dtype).tobytes())
+            rows += len(chunk)
+    except pd.errors.EmptyDataError:
+        pass
+    finally:
+        for f in outs.values():
+            f.close()
+    meta = {'source': os.path.abspath(path), 'source_size': st.st_size, 'source_mtime_ns': st.st_mtime_ns,
+            'rows': rows, 'sorted': in_order, 'min_value': min_value, 'max_value': max_value}
+    with open(os.path.join(cache_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    print(f"Cached {rows:,} rows of {path} -> {cache_dir}")
+    return meta
+
+def window_series(log: FioLog, window_ms: int = 1000, step_ms: int = 100, ddir: Optional[str] = None,
+                  percentiles: Sequence[float] = (50, 99, 99.9)) -> pd.DataFrame:
+    """IOPS and latency percentiles (µs) of each ``window_ms`` window, every ``step_ms``."""
+    t, v = log.time_ms, log.value
+    if ddir is not None:
+        mask = np.asarray(log.ddir) == DDIR[ddir]
+        t, v = t[mask], v[mask]
+    if not log.meta['sorted']:
+        # fio logs in completion order, which is time order; only merged/edited logs get here
+        order = np.argsort(t, kind='stable')
+        t, v = t[order], v[order]
+    if not len(t):
+        return pd.DataFrame()
+    starts = np.arange(int(t[0]), max(int(t[-1]) - window_ms, int(t[0])) + 1, step_ms)
+    lo = np.searchsorted(t, starts, side='left')
+    hi = np.searchsorted(t, starts + window_ms, side='left')
+    window_s = window_ms / 1000.0
+    # An iops log of all 1s is one row per I/O; otherwise each row is an averaged IOPS sample
+    per_io = log.kind == 'lat' or log.meta['max_value'] == 1
+    rows = []
+    for s, a, b in zip(starts.tolist(), lo.tolist(), hi.tolist()):
+        row = {'start_ms': s, 'end_ms': s + window_ms, 'n': b - a}
+        if per_io:
+            row['iops'] = (b - a) / window_s
+        else:
+            row['iops'] = float(np.mean(v[a:b])) if b > a else np.nan
+        if log.kind == 'lat':
+            vals = np.percentile(v[a:b], percentiles, method='inverted_cdf') / 1000.0 if b > a else [np.nan] * len(percentiles)
+            for p, val in zip(percentiles, vals):
+                row[pct_col(p)] = float(val)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def pct_col(p: float) -> str:
+    return 'p' + f"{p:g}".replace('.', '') + '_us'
+
+def tail_degradation(series: pd.DataFrame, factor: float = 2.0,
+                     columns: Sequence[str] = ('p99_us', 'p999_us')) -> pd.DataFrame:
+    """Periods where any of ``columns`` exceeds ``factor`` x its median over the run.
+
+    Overlapping/adjacent flagged windows are merged into one period. Each
+    period reports its peak value and ratio per column and the lowest IOPS
+    seen, so a tail spike can be matched with a throughput dip.
+    """
+    columns = [c for c in columns if c in series]
+    if series.empty or not columns:
+        return pd.DataFrame()
+    medians = {c: series[c].median() for c in columns}
+    flagged = np.zeros(len(series), dtype=bool)
+    for c in columns:
+        flagged |= (series[c] > factor * medians[c]).to_numpy()
+    periods: List[Dict] = []
+    current = None
+    for i in np.flatnonzero(flagged).tolist():
+        row = series.iloc[i]
+        if current is not None and row['start_ms'] <= current['end_ms']:
+            current['end_ms'] = max(current['end_ms'], row['end_ms'])
+            current['windows'] += 1
+            current['min_iops'] = min(current['min_iops'], row['iops'])
+            for c in columns:
+                current[f'peak_{c}'] = max(current[f'peak_{c}'], row[c])
+            continue
+        current = {'start_ms': row['start_ms'], 'end_ms': row['end_ms'], 'windows': 1, 'min_iops': row['iops']}
+        for c in columns:
+            current[f'peak_{c}'] = row[c]
+        periods.append(current)
+    for p in periods:
+        for c in columns:
+            p[f'ratio_{c}'] = p[f'peak_{c}'] / medians[c] if medians[c] else np.nan
+        p['median_iops'] = series['iops'].median()
+    return pd.DataFrame(periods)
+
+def plot_timeline(series: pd.DataFrame, periods: pd.DataFrame, title: str, out_path: str):
+    t_s = (series['start_ms'] + series['end_ms']) / 2000.0
+    fig, ax = plt.subplots(figsize=(8,4))
+    for c, label in (('p99_us', 'p99'), ('p999_us', 'p99.9')):
+        if c in series:
+            ax.plot(t_s, series[c], label=label)
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Latency (usec)")
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax2 = ax.twinx()
+    ax2.plot(t_s, series['iops'], color='gray', alpha=0.5, label='IOPS')
+    ax2.set_ylabel("IOPS")
+    for _, p in periods.iterrows():
+        ax.axvspan(p['start_ms'] / 1000.0, p['end_ms'] / 1000.0, color='red', alpha=0.15)
+    ax.legend(loc='upper left', fontsize=8)
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
+    plt.close(fig)
+    print(f"Timeline plot -> {out_path}")
+
+def log_name(path: str) -> str:
+    base = os.path.basename(path)
+    return base[:-len('.log')] if base.endswith('.log') else base
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('logs', nargs='+', help='fio *_clat/_lat/_iops.N.log files')
+    parser.add_argument('--window-ms', type=int, default=1000)
+    parser.add_argument('--step-ms', type=int, default=100)
+    parser.add_argument('--ddir', choices=list(DDIR), help='only this direction (default: all)')
+    parser.add_argument('--factor', type=float, default=2.0,
+                        help='flag windows whose p99/p99.9 exceeds this multiple of the run median')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--out-dir', default=os.path.join('tables', 'timeseries'))
+    parser.add_argument('--plots', action='store_true', help=f'write a timeline per log to {PLOTS_DIR}/')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for path in args.logs:
+        log = FioLog(path, chunk_rows=args.chunk_rows)
+        series = window_series(log, args.window_ms, args.step_ms, args.ddir)
+        name = log_name(path)
+        if series.empty:
+            print(f"{name}: no samples")
+            continue
+        series.to_csv(os.path.join(args.out_dir, f'{name}_windows.csv'), index=False)
+        periods = tail_degradation(series, args.factor)
+        if periods.empty:
+            print(f"{name}: {len(log):,} rows, {len(series)} windows, no tail degradation above {args.factor}x median")
+        else:
+            periods.to_csv(os.path.join(args.out_dir, f'{name}_degraded.csv'), index=False)
+            print(f"{name}: {len(log):,} rows, {len(series)} windows, {len(periods)} degraded periods:")
+            for _, p in periods.iterrows():
+                ratios = ', '.join(f"{c[6:-3]} {p[c]:.1f}x" for c in periods.columns if c.startswith('ratio_'))
+                print(f"  {p['start_ms'] / 1000:.1f}-{p['end_ms'] / 1000:.1f} s: {ratios}, "
+                      f"IOPS down to {p['min_iops']:,.0f} (median {p['median_iops']:,.0f})")
+        if args.plots:
+            os.makedirs(PLOTS_DIR, exist_ok=True)
+            plot_timeline(series, periods, name, os.path.join(PLOTS_DIR, f'timeline_{name}.png'))
+
+if __name__ == "__main__":
+    main()
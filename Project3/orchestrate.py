@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Run the jobs of nvme_test.fio one at a time per target, with cached results.
+
+Each [job] section is merged with [global] (minus group_reporting, which
+is what hid the per-job results) and run as its own fio invocation with
+--output-format=json+. The output is stored as
+
+    results/cache/<job>.<hash>.json
+
+where <hash> covers the job's full option set, so a run only executes jobs
+that are new or whose options changed; everything else is a cache hit.
+Jobs that use the same target (filename) run one after another so they do
+not disturb each other's numbers; jobs on different targets run
+concurrently (--per-target lets partitions of a device that tolerates it
+share it).
+
+Executors are pluggable: ``fio`` runs the real thing, ``replay`` copies
+recorded outputs (<dir>/<job>.json) so the whole flow can be exercised
+offline, and ``dry-run`` only prints the fio command lines.
+
+  python3 orchestrate.py                           # run missing/changed jobs, then parse
+  python3 orchestrate.py --only qd_ --runtime 10   # just the queue-depth sweep, shorter
+  python3 orchestrate.py --executor replay --recorded results/recorded --cache-dir /tmp/cache
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import parse_fio_json
+
+JOB_FILE = "nvme_test.fio"
+CACHE_DIR = os.path.join("results", "cache")
+# Options that would merge or redirect per-job output; the orchestrator controls those itself
+DROPPED_OPTIONS = {'group_reporting', 'output', 'output-format'}
+
+@dataclass
+class JobSpec:
+    name: str
+    options: "OrderedDict[str, str | None]"   # value None = flag without a value
+
+    @property
+    def target(self) -> str:
+        return self.options.get('filename') or self.options.get('directory') or self.name
+
+    def key(self) -> str:
+        canon = json.dumps({'name': self.name, 'options': sorted(self.options.items())})
+        return hashlib.sha256(canon.encode()).hexdigest()[:16]
+
+    def fio_args(self) -> List[str]:
+        args = [f'--name={self.name}']
+        for k, v in self.options.items():
+            args.append(f'--{k}' if v is None else f'--{k}={v}')
+        return args
+
+def parse_jobfile(path: str) -> Tuple["OrderedDict[str, str | None]", List[JobSpec]]:
+    """Sections of a fio job file, in order: ([global] options, one JobSpec per job)."""
+    global_opts: "OrderedDict[str, str | None]" = OrderedDict()
+    sections: List[Tuple[str, OrderedDict]] = []
+    current = None
+    with open(path) as f:
+        for raw in f:
+            line = raw.split('#', 1)[0].split(';', 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                name = line[1:-1].strip()
+                current = global_opts if name == 'global' else OrderedDict()
+                if name != 'global':
+                    sections.append((name, current))
+                continue
+            if current is None:
+                continue
+            key, sep, value = line.partition('=')
+            current[key.strip()] = value.strip() if sep else None
+    jobs = []
+    for name, opts in sections:
+        merged = OrderedDict((k, v) for k, v in global_opts.items() if k not in DROPPED_OPTIONS)
+        merged.update((k, v) for k, v in opts.items() if k not in DROPPED_OPTIONS)
+        jobs.append(JobSpec(name, merged))
+    return global_opts, jobs
+
+class FioExecutor:
+    """Runs fio for real (optionally under sudo) with json+ output."""
+    def __init__(self, fio: str = 'fio', sudo: bool = False):
+        self.cmd = (['sudo'] if sudo else []) + [fio]
+
+    def command(self, spec: JobSpec, out_path: str) -> List[str]:
+        return self.cmd + spec.fio_args() + ['--output-format=json+', f'--output={out_path}']
+
+    def run(self, spec: JobSpec, out_path: str):
+        subprocess.run(self.command(spec, out_path), check=True, stdout=subprocess.DEVNULL)
+
+class ReplayExecutor:
+    """Stand-in for fio that copies a recorded output (<recorded_dir>/<job>.json)."""
+    def __init__(self, recorded_dir: str, delay_s: float = 0.0):
+        self.recorded_dir = recorded_dir
+        self.delay_s = delay_s
+
+    def run(self, spec: JobSpec, out_path: str):
+        src = os.path.join(self.recorded_dir, f'{spec.name}.json')
+        if not os.path.exists(src):
+            raise FileNotFoundError(f"no recorded output for {spec.name} in {self.recorded_dir}")
+        time.sleep(self.delay_s)
+        shutil.copyfile(src, out_path)
+
+class DryRunExecutor(FioExecutor):
+    """Prints the fio command lines; produces no output, so nothing gets cached."""
+    def run(self, spec: JobSpec, out_path: str):
+        print('  $ ' + ' '.join(self.command(spec, out_path)))
+
+class ResultCache:
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, spec: JobSpec) -> str:
+        return os.path.join(self.cache_dir, f'{spec.name}.{spec.key()}.json')
+
+    def has(self, spec: JobSpec) -> bool:
+        path = self.path(spec)
+        return os.path.exists(path) and os.path.getsize(path) > 0
+
+    def store(self, spec: JobSpec, executor) -> str:
+        """Run ``spec`` into a temp file and move it into place only if it finished."""
+        path = self.path(spec)
+        tmp = path + '.partial'
+        try:
+            executor.run(spec, tmp)
+        except BaseException:
+            # A failed or interrupted run must not leave half-written output behind
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        if os.path.exists(tmp):
+            os.replace(tmp, path)
+        return path
+
+    def current(self, jobs: List[JobSpec]) -> List[str]:
+        """Cached outputs for exactly these job definitions (stale hashes are ignored)."""
+        return [self.path(s) for s in jobs if self.has(s)]
+
+def run_jobs(jobs: List[JobSpec], executor, cache: ResultCache, per_target: int = 1,
+             max_workers: int = 8, force: bool = False) -> Dict[str, str]:
+    """Run every job not already cached; returns job -> 'cached' | 'ran' | 'no output' | 'failed: ...'."""
+    status: Dict[str, str] = OrderedDict()
+    todo = []
+    for spec in jobs:
+        if cache.has(spec) and not force:
+            status[spec.name] = 'cached'
+        else:
+            todo.append(spec)
+    if not todo:
+        return status
+    # One lane per concurrent slot of a target; a lane runs its jobs back to back
+    by_target: Dict[str, List[JobSpec]] = OrderedDict()
+    for spec in todo:
+        by_target.setdefault(spec.target, []).append(spec)
+    lanes = [specs[i::per_target] for specs in by_target.values() for i in range(min(per_target, len(specs)))]
+    workers = max(1, min(max_workers, len(lanes)))
+    print(f"{len(status)} cached, {len(todo)} to run on {len(by_target)} target(s), {workers} at a time")
+
+    def run_lane(lane: List[JobSpec]):
+        for spec in lane:
+            start = time.time()
+            print(f"[INFO] Running {spec.name} on {spec.target}")
+            try:
+                cache.store(spec, executor)
+            except Exception as e:
+                status[spec.name] = f'failed: {e}'
+                print(f"[WARN] {spec.name} failed: {e}")
+                continue
+            status[spec.name] = 'ran' if cache.has(spec) else 'no output'
+            print(f"[INFO] {spec.name} done in {time.time() - start:.1f}s")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for fut in [pool.submit(run_lane, lane) for lane in lanes]:
+            fut.result()
+    return status
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobfile', default=JOB_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--only', nargs='*', default=[], help='run only jobs whose name starts with one of these')
+    parser.add_argument('--filename', help='override the target device/file of every job')
+    parser.add_argument('--runtime', help='override runtime (seconds) of every job')
+    parser.add_argument('--per-target', type=int, default=1, help='concurrent jobs allowed on one target')
+    parser.add_argument('--max-workers', type=int, default=8)
+    parser.add_argument('--force', action='store_true', help='re-run jobs even if cached')
+    parser.add_argument('--executor', choices=['fio', 'replay', 'dry-run'], default='fio')
+    parser.add_argument('--sudo', action='store_true', help='run fio under sudo (needed for raw devices)')
+    parser.add_argument('--recorded', default=os.path.join('results', 'recorded'),
+                        help='recorded <job>.json outputs for --executor replay')
+    parser.add_argument('--no-parse', action='store_true',
+                        help='skip building tables/all_jobs_json.csv from the cached outputs')
+    args = parser.parse_args()
+
+    _, jobs = parse_jobfile(args.jobfile)
+    if args.only:
+        jobs = [j for j in jobs if j.name.startswith(tuple(args.only))]
+    for spec in jobs:
+        if args.filename:
+            spec.options['filename'] = args.filename
+        if args.runtime:
+            spec.options['runtime'] = args.runtime
+    if args.executor == 'fio':
+        executor = FioExecutor(sudo=args.sudo)
+    elif args.executor == 'replay':
+        executor = ReplayExecutor(args.recorded)
+    else:
+        executor = DryRunExecutor(sudo=args.sudo)
+    cache = ResultCache(args.cache_dir)
+
+    start = time.time()
+    status = run_jobs(jobs, executor, cache, args.per_target, args.max_workers, args.force)
+    failed = [n for n, s in status.items() if s.startswith('failed')]
+    ran = sum(1 for s in status.values() if s == 'ran')
+    cached = sum(1 for s in status.values() if s == 'cached')
+    print(f"{ran} ran, {cached} cached, {len(failed)} failed in {time.time() - start:.1f}s")
+
+    outputs = cache.current(jobs)
+    if args.no_parse or not outputs:
+        return
+    results = parse_fio_json.to_job_results(parse_fio_json.parse_fio_json(outputs))
+    df = parse_fio_json.df_from_jobs(results)
+    os.makedirs('tables', exist_ok=True)
+    parse_fio_json.save_table(df, os.path.join('tables', 'all_jobs_json.csv'))
+
+if __name__ == "__main__":
+    main()
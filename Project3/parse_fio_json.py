@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Parse fio --output-format=json+ results into the same table as parse_results.py.
+
+json+ output carries every job's completion latency histogram (clat_ns.bins:
+bucket value in ns -> count), so percentiles here come from the buckets
+instead of the handful fio printed. Bucket values are fio's own (about 1.5%
+wide at any latency), so a percentile is exact to the bucket fio put the
+I/O in. Histograms of the same job name are merged:
+
+  * within one fio run (numjobs>1 without group_reporting) the clones ran
+    side by side: I/Os add up, runtime is the longest clone's
+  * across runs (several files, or several JSON documents in one file)
+    I/Os and runtimes both add up, so IOPS/BW are runtime-weighted means
+
+Files are read in chunks and decoded one JSON document at a time; text fio
+prints around the JSON (warnings, --output-format=normal,json+) is skipped.
+
+  python3 parse_fio_json.py results/json                  # -> tables/all_jobs_json.csv
+  python3 parse_fio_json.py run1.json run2.json --percentiles 99.99 99.999 --plots
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from parse_results import (JobResult, RWStats, block_size_sweep, df_from_jobs, mix_sweep,
+                           queue_depth_sweep, save_table, zero_queue_baselines)
+
+CHUNK_CHARS = 1 << 20
+# Percentiles stored on every RWStats, in parse_results' '99.90' key format
+DEFAULT_PERCENTILES = (1, 5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 95, 99, 99.5, 99.9, 99.95, 99.99)
+ALIASES = {'95': '95.00', '99': '99.00', '99.9': '99.90', '99.95': '99.95', '99.99': '99.99'}
+MIXED_MODES = ('randrw', 'rw', 'readwrite')
+
+class LatencyHistogram:
+    """fio clat bucket histogram: latency value (ns) -> I/O count."""
+    def __init__(self, bins: Optional[Dict[int, int]] = None):
+        self.bins: Dict[int, int] = dict(bins or {})
+        self._arrays = None
+
+    @classmethod
+    def from_fio(cls, bins: Dict[str, int]) -> 'LatencyHistogram':
+        return cls({int(k): int(v) for k, v in bins.items() if int(v)})
+
+    def merge(self, other: 'LatencyHistogram'):
+        for ns, n in other.bins.items():
+            self.bins[ns] = self.bins.get(ns, 0) + n
+        self._arrays = None
+
+    def _sorted(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            values = np.array(sorted(self.bins), dtype=np.int64)
+            counts = np.array([self.bins[v] for v in values.tolist()], dtype=np.int64)
+            self._arrays = (values, np.cumsum(counts))
+        return self._arrays
+
+    @property
+    def total(self) -> int:
+        return sum(self.bins.values())
+
+    def mean_ns(self) -> float:
+        total = self.total
+        return sum(v * n for v, n in self.bins.items()) / total if total else float('nan')
+
+    def percentile_ns(self, p: float) -> float:
+        # Same rule as fio: the first bucket whose cumulative count reaches p% of all I/Os
+        values, cum = self._sorted()
+        if not len(values):
+            return float('nan')
+        idx = int(np.searchsorted(cum, cum[-1] * p / 100.0, side='left'))
+        return float(values[min(idx, len(values) - 1)])
+
+@dataclass
+class DirectionAccum:
+    """One direction (read or write) of one job, accumulated over entries."""
+    ios: int = 0
+    io_bytes: int = 0
+    runtime_ms: float = 0.0
+    lat_sum_ns: float = 0.0
+    lat_n: int = 0
+    hist: LatencyHistogram = field(default_factory=LatencyHistogram)
+    fio_pct_ns: Dict[str, float] = field(default_factory=dict)  # only used when there are no bins
+
+    def add(self, other: 'DirectionAccum', concurrent: bool):
+        self.ios += other.ios
+        self.io_bytes += other.io_bytes
+        self.runtime_ms = max(self.runtime_ms, other.runtime_ms) if concurrent else self.runtime_ms + other.runtime_ms
+        self.lat_sum_ns += other.lat_sum_ns
+        self.lat_n += other.lat_n
+        self.hist.merge(other.hist)
+        if not self.fio_pct_ns:
+            self.fio_pct_ns = other.fio_pct_ns
+
+@dataclass
+class JobAccum:
+    name: str
+    mode: Optional[str] = None
+    bs: Optional[str] = None
+    iodepth: Optional[int] = None
+    entries: int = 0
+    read: DirectionAccum = field(default_factory=DirectionAccum)
+    write: DirectionAccum = field(default_factory=DirectionAccum)
+
+    def add(self, other: 'JobAccum', concurrent: bool):
+        self.mode = self.mode or other.mode
+        self.bs = self.bs or other.bs
+        self.iodepth = self.iodepth or other.iodepth
+        self.entries += other.entries
+        self.read.add(other.read, concurrent)
+        self.write.add(other.write, concurrent)
+
+def iter_documents(filename: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[dict]:
+    """Yield each top-level JSON object in a file, skipping any text between them."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+    with open(filename, 'r', errors='ignore') as f:
+        while True:
+            start = buf.find('{', pos)
+            if start < 0:
+                if eof:
+                    return
+                buf, pos = f.read(chunk_chars), 0  # nothing JSON-like left in buf; drop it
+                eof = not buf
+                continue
+            try:
+                doc, end = decoder.raw_decode(buf, start)
+            except json.JSONDecodeError as e:
+                # An error near the end of the buffer means the document is cut off: read more.
+                # Anywhere else, this '{' was not the start of a document (or eof): skip it.
+                if eof or e.pos < len(buf) - 4096:
+                    pos = start + 1
+                    continue
+            else:
+                yield doc
+                buf, pos = buf[end:], 0
+                continue
+            # Grow geometrically so a huge document is re-decoded O(log n) times, not O(n)
+            chunk = f.read(max(chunk_chars, len(buf) - start))
+            buf, pos = buf[start:] + chunk, 0
+            eof = not chunk
+
+def _option(job: dict, doc: dict, *names: str) -> Optional[str]:
+    for opts in (job.get('job options', {}), doc.get('global options', {})):
+        for n in names:
+            if n in opts:
+                return opts[n]
+    return None
+
+def _direction(d: dict) -> DirectionAccum:
+    acc = DirectionAccum()
+    if not d:
+        return acc
+    acc.runtime_ms = float(d.get('runtime', 0))
+    acc.io_bytes = int(d.get('io_bytes', 0))
+    acc.ios = int(d.get('total_ios', round(d.get('iops', 0) * acc.runtime_ms / 1000.0)))
+    clat = d.get('clat_ns', {})
+    n = int(clat.get('N', 0))
+    acc.lat_sum_ns = float(clat.get('mean', 0)) * n
+    acc.lat_n = n
+    if clat.get('bins'):
+        acc.hist = LatencyHistogram.from_fio(clat['bins'])
+    elif clat.get('percentile'):
+        acc.fio_pct_ns = {pct_key(float(p)): float(v) for p, v in clat['percentile'].items()}
+    return acc
+
+def job_records(doc: dict) -> Iterator[JobAccum]:
+    """One JobAccum per job entry of a fio JSON document."""
+    for job in doc.get('jobs', []):
+        if job.get('error'):
+            continue
+        acc = JobAccum(name=job.get('jobname', ''), entries=1)
+        acc.mode = _option(job, doc, 'rw', 'readwrite')
+        acc.bs = _option(job, doc, 'bs', 'blocksize')
+        qd = _option(job, doc, 'iodepth')
+        acc.iodepth = int(qd) if qd is not None else None
+        acc.read = _direction(job.get('read'))
+        acc.write = _direction(job.get('write'))
+        yield acc
+
+def parse_fio_json(paths: List[str]) -> Dict[str, JobAccum]:
+    """Accumulate every job of every document in ``paths``, merged by job name."""
+    merged: Dict[str, JobAccum] = {}
+    for path in paths:
+        for doc in iter_documents(path):
+            run: Dict[str, JobAccum] = {}
+            for rec in job_records(doc):
+                if rec.name in run:
+                    run[rec.name].add(rec, concurrent=True)
+                else:
+                    run[rec.name] = rec
+            for name, rec in run.items():
+                if name in merged:
+                    merged[name].add(rec, concurrent=False)
+                else:
+                    merged[name] = rec
+    return merged
+
+def pct_key(p: float) -> str:
+    key = f"{p:.2f}"
+    return key if float(key) == p else f"{p:g}"  # 99.999 must not round to '100.00'
+
+def to_rwstats(acc: DirectionAccum, percentiles=DEFAULT_PERCENTILES) -> RWStats:
+    stats = RWStats()
+    if not acc.ios:
+        return stats
+    seconds = acc.runtime_ms / 1000.0
+    if seconds:
+        stats.iops = acc.ios / seconds
+        stats.bw_MBps = acc.io_bytes / seconds / 1e6
+        stats.bw_MiBps = acc.io_bytes / seconds / 2**20
+    stats.lat_unit = 'nsec'
+    if acc.hist.bins:
+        stats.lat_avg_usec = (acc.lat_sum_ns / acc.lat_n if acc.lat_n else acc.hist.mean_ns()) / 1000.0
+        for p in percentiles:
+            stats.percentiles_usec[pct_key(p)] = acc.hist.percentile_ns(p) / 1000.0
+    else:
+        if acc.lat_n:
+            stats.lat_avg_usec = acc.lat_sum_ns / acc.lat_n / 1000.0
+        stats.percentiles_usec = {k: v / 1000.0 for k, v in acc.fio_pct_ns.items()}
+    for short, full in ALIASES.items():
+        if full in stats.percentiles_usec:
+            stats.percentiles_usec[short] = stats.percentiles_usec[full]
+    return stats
+
+def to_job_results(merged: Dict[str, JobAccum], percentiles=DEFAULT_PERCENTILES) -> Dict[str, JobResult]:
+    jobs: Dict[str, JobResult] = {}
+    for name, acc in merged.items():
+        mode = acc.mode
+        if not mode:
+            # Same fallback as parse_fio: infer from the job name
+            lowered = name.lower()
+            for m in ('randread', 'randwrite', 'randrw'):
+                if m in lowered:
+                    mode = m
+                    break
+            else:
+                mode = 'read' if re.search(r'\bread\b', lowered) else 'write' if re.search(r'\bwrite\b', lowered) else None
+        jobs[name] = JobResult(
+            name=name, mode=mode, bs=acc.bs, iodepth=acc.iodepth, executed=True,
+            read=to_rwstats(acc.read, percentiles), write=to_rwstats(acc.write, percentiles),
+            mixed=mode in MIXED_MODES,
+            meta={'entries': acc.entries, 'read_clat_hist': acc.read.hist, 'write_clat_hist': acc.write.hist})
+    return jobs
+
+def expand_paths(paths: List[str]) -> List[str]:
+    out = []
+    for p in paths:
+        out.extend(sorted(glob.glob(os.path.join(p, '*.json'))) if os.path.isdir(p) else [p])
+    return out
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='fio json/json+ output files, or directories of *.json')
+    parser.add_argument('--csv', default=os.path.join('tables', 'all_jobs_json.csv'))
+    parser.add_argument('--percentiles', type=float, nargs='*', default=[],
+                        help='extra percentiles to add as read_/write_p<digits>_us columns, e.g. 99.999')
+    parser.add_argument('--plots', action='store_true',
+                        help='also regenerate baseline_table.md and plots/ from this table')
+    args = parser.parse_args()
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("No fio JSON files found.")
+        return
+    percentiles = tuple(DEFAULT_PERCENTILES) + tuple(args.percentiles)
+    jobs = to_job_results(parse_fio_json(paths), percentiles)
+    no_hist = [n for n, jr in jobs.items() if not (jr.meta['read_clat_hist'].bins or jr.meta['write_clat_hist'].bins)]
+    if no_hist:
+        print(f"Warning: {len(no_hist)} jobs have no clat_ns bins (plain json, not json+); using fio's percentiles:")
+        print("  " + ", ".join(no_hist[:12]) + ("..." if len(no_hist) > 12 else ""))
+    df = df_from_jobs(jobs)
+    for p in args.percentiles:
+        col = 'p' + pct_key(p).rstrip('0').rstrip('.').replace('.', '')
+        for d in ('read', 'write'):
+            df[f'{d}_{col}_us'] = [getattr(jobs[n], d).percentiles_usec.get(pct_key(p)) for n in df['job']]
+    os.makedirs(os.path.dirname(args.csv) or '.', exist_ok=True)
+    save_table(df, args.csv)
+    if args.plots:
+        zero_queue_baselines(df)
+        block_size_sweep(df)
+        mix_sweep(df)
+        queue_depth_sweep(df)
+    print(f"Parsed {len(jobs)} jobs from {len(paths)} files.")
+
+if __name__ == "__main__":
+    main()
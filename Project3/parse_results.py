@@ -480,11 +480,8 @@ def mix_sweep(df: pd.DataFrame):
     plt.close()
     print(f"Wrote {out}")
 
-def main():
-    if not os.path.exists(FIO_FILE):
-        print(f"Missing {FIO_FILE}")
-        return
-    jobs = parse_fio(FIO_FILE)
+def load_executed_jobs(filename: str = FIO_FILE) -> Dict[str, JobResult]:
+    jobs = parse_fio(filename)
 
     # Identify jobs that were never executed (definitions only) – keep only executed or those with some stats
     executed_jobs: Dict[str, JobResult] = {}
@@ -501,19 +498,29 @@ def main():
     if skipped:
         print(f"Warning: {len(skipped)} job definitions had no results (likely due to group_reporting combining output or they were not run):")
         print("  " + ", ".join(skipped[:12]) + ("..." if len(skipped) > 12 else ""))
-        print("Run those jobs separately (e.g., separate .fio runs without group_reporting) to collect their individual metrics.")
-    jobs = executed_jobs
-    df = df_from_jobs(jobs)
+        print("Run those jobs separately to collect their individual metrics: `python3 orchestrate.py` runs each job")
+        print("on its own (cached, so only missing/changed jobs run) and writes tables/all_jobs_json.csv.")
+    return executed_jobs
+
+def write_tables(jobs: Dict[str, JobResult], df: pd.DataFrame):
     os.makedirs("tables", exist_ok=True)
     save_table(df, os.path.join("tables","all_jobs.csv"))
-    # Experiments
-    zero_queue_baselines(df)
-    block_size_sweep(df)
-    mix_sweep(df)
-    queue_depth_sweep(df)
     # Save raw JSON
     with open(os.path.join("tables","raw_jobs.json"), 'w') as f:
         json.dump({k: v.__dict__ for k,v in jobs.items()}, f, default=lambda o: o.__dict__, indent=2)
+
+# Experiments; each writes its own table/plot (analysis_pipeline.py runs them as separate tasks)
+EXPERIMENTS = [zero_queue_baselines, block_size_sweep, mix_sweep, queue_depth_sweep]
+
+def main():
+    if not os.path.exists(FIO_FILE):
+        print(f"Missing {FIO_FILE}")
+        return
+    jobs = load_executed_jobs(FIO_FILE)
+    df = df_from_jobs(jobs)
+    write_tables(jobs, df)
+    for experiment in EXPERIMENTS:
+        experiment(df)
     print("Done.")
 
 if __name__ == "__main__":
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Closed queueing model of the queue-depth sweep, to predict unmeasured QDs.
+
+With QD = N I/Os always outstanding the device is a closed system, so
+Little's law ties the three measured quantities together:
+
+    N = X(N) * (R(N) + Z)         X = IOPS, R = avg completion latency,
+                                  Z = per-I/O host time outside the device
+
+Throughput follows a parallel-server saturation curve: linear in N while
+the device's internal parallelism is idle (X = N / (R0 + Z)), flattening
+to X_max once it is busy. The two asymptotes cross at the knee
+
+    N* = X_max * (R0 + Z)         (Kleinrock's optimal operating point)
+
+and the curve between them is X(N) = X_max * N / (N*^k + N^k)^(1/k),
+where k sets how sharp the bend is. R(N) then comes from Little's law,
+and p99 as R(N) times a factor fitted as linear in log N.
+
+Error bars are 90% intervals from a residual bootstrap of the fit. To
+save device time, recommend_qds() adds QDs one at a time where the
+bootstrap models disagree most about X(q), until the knee's interval is
+below a tolerance. Each added point is simulated as the current prediction
+times a resampled residual, so it carries as much noise as a real
+measurement.
+
+  python3 qd_model.py                               # tables/all_jobs.csv -> tables/qd_model.csv, plots/qd_model.png
+  python3 qd_model.py --table tables/all_jobs_json.csv --tol 0.15 --max-extra 2
+"""
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+PLOTS_DIR = "plots"
+K_GRID = np.linspace(0.75, 6.0, 22)
+BOOTSTRAP = 200
+CANDIDATE_QDS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256)
+
+@dataclass
+class QDModel:
+    x_max: float       # IOPS
+    n_star: float      # knee concurrency
+    k: float
+    z_us: float        # host time per I/O outside the measured latency
+    p99_c0: float      # log(p99 / R) = c0 + c1 * log(N)
+    p99_c1: float
+
+    @property
+    def r0_us(self) -> float:
+        return self.n_star / self.x_max * 1e6 - self.z_us
+
+    def iops(self, n) -> np.ndarray:
+        n = np.asarray(n, dtype=float)
+        return self.x_max * n / (self.n_star ** self.k + n ** self.k) ** (1.0 / self.k)
+
+    def lat_us(self, n) -> np.ndarray:
+        n = np.asarray(n, dtype=float)
+        return n / self.iops(n) * 1e6 - self.z_us
+
+    def p99_us(self, n) -> np.ndarray:
+        n = np.asarray(n, dtype=float)
+        return self.lat_us(n) * np.exp(self.p99_c0 + self.p99_c1 * np.log(n))
+
+def _sse(logn: np.ndarray, logx: np.ndarray, k: float, n_star: float):
+    """(SSE, log X_max) of the log-space fit at one (k, N*)."""
+    logg = logn - np.log(n_star ** k + np.exp(logn * k)) / k
+    log_xmax = float((logx - logg).mean())
+    return float(((logx - log_xmax - logg) ** 2).sum()), log_xmax
+
+def _golden(f, lo: float, hi: float, iters: int = 40) -> float:
+    """Minimizer of a unimodal ``f`` on [lo, hi] by golden-section search."""
+    g = (np.sqrt(5) - 1) / 2
+    a, b = lo + (1 - g) * (hi - lo), lo + g * (hi - lo)
+    fa, fb = f(a), f(b)
+    for _ in range(iters):
+        if fa < fb:
+            hi, b, fb = b, a, fa
+            a = lo + (1 - g) * (hi - lo)
+            fa = f(a)
+        else:
+            lo, a, fa = a, b, fb
+            b = lo + g * (hi - lo)
+            fb = f(b)
+    return (lo + hi) / 2
+
+def _fit_curve(n: np.ndarray, x: np.ndarray):
+    """Least squares in log space: a coarse (k, N*) grid, then golden-section
+    refinement of log N* and k between the neighbours of the grid minimum, so
+    N* is not snapped to grid values. X_max is closed-form for each (k, N*)."""
+    n_grid = np.geomspace(max(n.min() / 4, 0.1), n.max() * 4, 80)
+    logn, logx = np.log(n), np.log(x)
+    k = K_GRID[:, None, None]
+    ns = n_grid[None, :, None]
+    logg = logn - np.log(ns ** k + n[None, None, :] ** k) / k
+    log_xmax = (logx - logg).mean(axis=2, keepdims=True)
+    sse = ((logx - log_xmax - logg) ** 2).sum(axis=2)
+    i, j = np.unravel_index(np.argmin(sse), sse.shape)
+    log_grid = np.log(n_grid)
+    ns_lo, ns_hi = log_grid[max(j - 1, 0)], log_grid[min(j + 1, len(n_grid) - 1)]
+    k_lo, k_hi = K_GRID[max(i - 1, 0)], K_GRID[min(i + 1, len(K_GRID) - 1)]
+    best_k, best_ns = float(K_GRID[i]), float(n_grid[j])
+    for _ in range(2):
+        best_ns = float(np.exp(_golden(lambda v: _sse(logn, logx, best_k, np.exp(v))[0], ns_lo, ns_hi)))
+        best_k = _golden(lambda v: _sse(logn, logx, v, best_ns)[0], k_lo, k_hi)
+    refined, log_xm = _sse(logn, logx, best_k, best_ns)
+    if refined > sse[i, j]:  # refinement never worsens the grid fit
+        return float(np.exp(log_xmax[i, j, 0])), float(n_grid[j]), float(K_GRID[i])
+    return float(np.exp(log_xm)), best_ns, float(best_k)
+
+def fit_qd(n, iops, lat_us, p99_us=None) -> QDModel:
+    n, x, r = (np.asarray(a, dtype=float) for a in (n, iops, lat_us))
+    x_max, n_star, k = _fit_curve(n, x)
+    z = max(float(np.median(n / x * 1e6 - r)), 0.0)
+    c0, c1 = 0.0, 0.0
+    if p99_us is not None:
+        p = np.asarray(p99_us, dtype=float)
+        ok = np.isfinite(p) & (p > 0)
+        ratio = np.log(p[ok] / r[ok])
+        if len(np.unique(n[ok])) >= 2:
+            c1, c0 = np.polyfit(np.log(n[ok]), ratio, 1)
+        elif ok.any():
+            c0 = float(ratio.mean())
+    return QDModel(x_max, n_star, k, z, float(c0), float(c1))
+
+def residuals(model: QDModel, n, x, r, p):
+    """Log residuals of IOPS, latency and p99 against ``model``."""
+    return (np.log(x) - np.log(model.iops(n)), np.log(r) - np.log(model.lat_us(n)),
+            np.log(p) - np.log(model.p99_us(n)))
+
+def bootstrap(n, iops, lat_us, p99_us, b: int = BOOTSTRAP, seed: int = 0) -> List[QDModel]:
+    """Refit on the fitted curve plus resampled residuals (log IOPS, log latency, log p99 ratio)."""
+    rng = np.random.default_rng(seed)
+    n, x, r, p = (np.asarray(a, dtype=float) for a in (n, iops, lat_us, p99_us))
+    base = fit_qd(n, x, r, p)
+    res_x, res_r, res_p = residuals(base, n, x, r, p)
+    models = []
+    for _ in range(b):
+        idx = rng.integers(0, len(n), len(n))
+        xb = base.iops(n) * np.exp(res_x[idx])
+        rb = base.lat_us(n) * np.exp(res_r[idx])
+        pb = base.p99_us(n) * np.exp(res_p[idx])
+        models.append(fit_qd(n, xb, rb, pb))
+    return models
+
+def predict(model: QDModel, models: Sequence[QDModel], qds) -> pd.DataFrame:
+    qds = np.asarray(qds, dtype=float)
+    out = {'qd': qds}
+    for name in ('iops', 'lat_us', 'p99_us'):
+        samples = np.array([getattr(m, name)(qds) for m in models])
+        out[name] = getattr(model, name)(qds)
+        out[f'{name}_lo'] = np.nanpercentile(samples, 5, axis=0)
+        out[f'{name}_hi'] = np.nanpercentile(samples, 95, axis=0)
+    return pd.DataFrame(out)
+
+def knee_interval(models: Sequence[QDModel]):
+    knees = np.array([m.n_star for m in models])
+    return float(np.percentile(knees, 5)), float(np.median(knees)), float(np.percentile(knees, 95))
+
+def recommend_qds(n, iops, lat_us, p99_us, tol: float = 0.25, max_extra: int = 3,
+                  candidates: Sequence[int] = CANDIDATE_QDS, b: int = 100, seed: int = 0):
+    """Greedy: measure next where the bootstrap models' X(q) spreads most, until (hi-lo)/median <= tol.
+
+    The trial point is the prediction times residuals drawn from the current
+    fit, so the reported knee width is what a noisy measurement would give.
+    Candidates are tried in order of spread and the first one that narrows the
+    interval is picked. Returns (picks, stop), where stop is 'converged',
+    'max_extra', 'no_candidates' (nothing left to measure) or 'no_gain' (no
+    candidate narrows the interval).
+    """
+    rng = np.random.default_rng(seed)
+    n, x, r, p = (list(map(float, a)) for a in (n, iops, lat_us, p99_us))
+    picks = []
+    models = bootstrap(n, x, r, p, b)
+    lo, mid, hi = knee_interval(models)
+    width = (hi - lo) / mid
+    while width > tol:
+        if len(picks) >= max_extra:
+            return picks, 'max_extra'
+        eligible = [q for q in candidates if q not in n and q <= 2 * max(n)]
+        if not eligible:
+            return picks, 'no_candidates'
+        pred = np.array([m.iops(eligible) for m in models])
+        spread = np.log(np.nanpercentile(pred, 95, axis=0) / np.nanpercentile(pred, 5, axis=0))
+        model = fit_qd(n, x, r, p)
+        res_x, res_r, res_p = residuals(model, *(np.asarray(a) for a in (n, x, r, p)))
+        for c in np.argsort(-spread, kind='stable'):
+            q = eligible[c]
+            i = rng.integers(0, len(n))
+            trial = [n + [q], x + [float(model.iops(q) * np.exp(res_x[i]))],
+                     r + [float(model.lat_us(q) * np.exp(res_r[i]))], p + [float(model.p99_us(q) * np.exp(res_p[i]))]]
+            trial_models = bootstrap(*trial, b=b)
+            t_lo, t_mid, t_hi = knee_interval(trial_models)
+            t_width = (t_hi - t_lo) / t_mid
+            if t_width < width:
+                break
+        else:
+            return picks, 'no_gain'
+        n, x, r, p = trial
+        models, width = trial_models, t_width
+        picks.append({'qd': q, 'knee_ci_rel_width': width, 'iops_spread': float(spread[c])})
+    return picks, 'converged'
+
+def leave_one_out(n, iops, lat_us, p99_us) -> pd.DataFrame:
+    """Predict each measured QD from a fit without it."""
+    n, x, r, p = (np.asarray(a, dtype=float) for a in (n, iops, lat_us, p99_us))
+    rows = []
+    for i in range(len(n)):
+        keep = np.arange(len(n)) != i
+        m = fit_qd(n[keep], x[keep], r[keep], p[keep])
+        rows.append({'qd': n[i], 'iops_err_pct': 100 * (m.iops(n[i]) / x[i] - 1),
+                     'lat_err_pct': 100 * (m.lat_us(n[i]) / r[i] - 1),
+                     'p99_err_pct': 100 * (m.p99_us(n[i]) / p[i] - 1)})
+    return pd.DataFrame(rows)
+
+def load_sweep(table: str) -> pd.DataFrame:
+    """The qd_N randread rows of a parse_results/parse_fio_json table, as queue_depth_sweep selects them."""
+    df = pd.read_csv(table)
+    qd = df[df['job'].str.match(r'qd_\d+') & df['mode'].str.contains('randread', na=False)].copy()
+    qd['qd'] = qd['job'].str.extract(r'qd_(\d+)', expand=False).astype(int)
+    qd = qd.dropna(subset=['read_iops', 'read_lat_avg_us'])
+    return qd.sort_values('qd')
+
+def plot_model(sweep: pd.DataFrame, pred: pd.DataFrame, knee, out_path: str):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10,4))
+    ax1.plot(pred['qd'], pred['iops'], label='model')
+    ax1.fill_between(pred['qd'], pred['iops_lo'], pred['iops_hi'], alpha=0.25)
+    ax1.scatter(sweep['qd'], sweep['read_iops'], color='black', zorder=3, label='measured')
+    ax1.axvspan(knee[0], knee[2], color='red', alpha=0.1)
+    ax1.axvline(knee[1], color='red', linestyle='--', alpha=0.6, label=f'Knee N*≈{knee[1]:.1f}')
+    ax1.set_ylabel("Throughput (IOPS)")
+    for col, label in (('lat_us', 'avg'), ('p99_us', 'p99')):
+        ax2.plot(pred['qd'], pred[col], label=f'{label} model')
+        ax2.fill_between(pred['qd'], pred[f'{col}_lo'], pred[f'{col}_hi'], alpha=0.25)
+    ax2.scatter(sweep['qd'], sweep['read_lat_avg_us'], color='black', zorder=3, label='avg measured')
+    ax2.scatter(sweep['qd'], sweep['read_p99_us'], color='black', marker='x', zorder=3, label='p99 measured')
+    ax2.set_ylabel("Latency (usec)")
+    ax2.set_yscale('log')
+    for ax in (ax1, ax2):
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel("Queue depth")
+        ax.grid(True, linestyle='--', alpha=0.4)
+        ax.legend(fontsize=8)
+    fig.suptitle("Queueing model fit (4K randread, 90% bootstrap bands)")
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=140)
+    plt.close(fig)
+    print(f"Wrote {out_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', default=os.path.join('tables', 'all_jobs.csv'))
+    parser.add_argument('--predict', type=int, nargs='*', default=list(CANDIDATE_QDS), help='QDs to predict')
+    parser.add_argument('--tol', type=float, default=0.25, help='target relative width of the knee interval')
+    parser.add_argument('--max-extra', type=int, default=3, help='most additional QDs to recommend')
+    parser.add_argument('--out', default=os.path.join('tables', 'qd_model.csv'))
+    args = parser.parse_args()
+
+    sweep = load_sweep(args.table)
+    if len(sweep) < 3:
+        print(f"Need at least 3 measured qd_N points, found {len(sweep)}.")
+        return
+    cols = (sweep['qd'], sweep['read_iops'], sweep['read_lat_avg_us'], sweep['read_p99_us'])
+    model = fit_qd(*cols)
+    models = bootstrap(*cols)
+    knee = knee_interval(models)
+    print(f"X_max={model.x_max:,.0f} IOPS  R0={model.r0_us:.1f} us  Z={model.z_us:.1f} us  k={model.k:.2f}")
+    print(f"Knee N*={model.n_star:.1f} (90% CI {knee[0]:.1f}-{knee[2]:.1f})")
+
+    pred = predict(model, models, sorted(set(args.predict) | set(sweep['qd'])))
+    pred['measured'] = pred['qd'].isin(sweep['qd'])
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    pred.to_csv(args.out, index=False)
+    print(f"Wrote {args.out}")
+    loo = leave_one_out(*cols)
+    print("Leave-one-out error (%): " + ", ".join(
+        f"QD{int(r.qd)} iops {r.iops_err_pct:+.0f} p99 {r.p99_err_pct:+.0f}" for r in loo.itertuples()))
+
+    picks, stop = recommend_qds(*cols, tol=args.tol, max_extra=args.max_extra)
+    if picks:
+        print("Measure next: " + ", ".join(f"QD{p['qd']} (knee CI -> ±{50 * p['knee_ci_rel_width']:.0f}%)" for p in picks))
+    width = picks[-1]['knee_ci_rel_width'] if picks else (knee[2] - knee[0]) / knee[1]
+    if stop == 'converged' and not picks:
+        print(f"Knee already within ±{50 * args.tol:.0f}%; no extra QDs needed.")
+    elif stop == 'no_gain':
+        print(f"Stopped at ±{50 * width:.0f}% (target ±{50 * args.tol:.0f}%): no candidate QD narrows the knee interval.")
+    elif stop == 'no_candidates':
+        print(f"Stopped at ±{50 * width:.0f}% (target ±{50 * args.tol:.0f}%): every candidate QD is already measured.")
+    elif stop == 'max_extra':
+        print(f"Stopped at ±{50 * width:.0f}% (target ±{50 * args.tol:.0f}%) after --max-extra {args.max_extra} QDs.")
+    os.makedirs(PLOTS_DIR, exist_ok=True)
+    grid = np.geomspace(1, max(max(args.predict), sweep['qd'].max()), 100)
+    plot_model(sweep, predict(model, models, grid), knee, os.path.join(PLOTS_DIR, "qd_model.png"))
+
+if __name__ == "__main__":
+    main()
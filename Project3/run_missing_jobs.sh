@@ -8,6 +8,8 @@ DEVICE="/dev/nvme0n1p7"
 RUNTIME=30
 SIZE=10G
 OUT_AGG="results/FIO_Benchmark.txt"
+# Set LOG_DIR (e.g. LOG_DIR=results/logs) to also write per-I/O latency/IOPS logs for fio_logs.py
+LOG_DIR="${LOG_DIR:-}"
 
 # Jobs we still need (excluding the one already executed: baseline_4k_randread)
 JOBS=(
@@ -72,6 +74,10 @@ for job in "${JOBS[@]}"; do
   if [[ -n $mixpct ]]; then
     extra+=(--rwmixread=${mixpct})
   fi
+  if [[ -n $LOG_DIR ]]; then
+    mkdir -p "$LOG_DIR"
+    extra+=(--write_lat_log="$LOG_DIR/$job" --write_iops_log="$LOG_DIR/$job" --log_avg_msec=0)
+  fi
   # Use --output-format=normal to ensure parse friendly
   sudo fio \
     --name="$job" \
@@ -5,4 +5,19 @@ __all__ = [
     "datastructures",
     "simulator",
     "metrics",
+    "writeback",
+    "snapshot",
+    "sweep",
+    "harness",
+    "microbench",
+    "estimator",
+    "sizing",
+    "migration",
+    "calibration",
+    "fio_latency",
+    "replication",
+    "multiproc",
+    "ycsb",
+    "eventlog",
+    "timeseries",
 ]
@@ -0,0 +1,179 @@
+"""Calibrate the L3 and DRAM tier models from the Project 2 measurements.
+
+Inputs (``Project2/results``), parsed with the helpers in
+``Project2/scripts/plot_project2.py``:
+
+- ``working_set_latency.csv``: the L3 boundary gives the L3 capacity; the
+  median latency between the L2 and L3 boundaries is the L3 latency. The
+  boundaries are inferred from the curve (``infer_cache_boundaries``), with
+  ``MANUAL_CACHE_BOUNDARIES_KB`` from the plotting script as the fallback
+  when inference does not find three distinct cache levels.
+- ``latencies.txt`` (MLC ``--idle_latency``): DRAM base latency.
+- ``bandwidth_matrix.txt`` (MLC ``--bandwidth_matrix``): DRAM bandwidth.
+- ``loaded_latency.txt`` (MLC ``--loaded_latency``): DRAM latency vs. offered
+  bandwidth, fitted with isotonic regression and stored as
+  ``TierConfig.loaded_latency_curve``.
+
+Other tiers and all capacities except L3 keep their defaults.
+"""
+import importlib.util
+import pathlib
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .tiers import Tier, TierConfig, default_tier_configs
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+PROJECT2_RESULTS = REPO_ROOT / "Project2" / "results"
+PLOT_SCRIPT = REPO_ROOT / "Project2" / "scripts" / "plot_project2.py"
+
+
+@dataclass
+class Calibration:
+    l3_capacity_bytes: Optional[int] = None
+    l3_latency_ns: Optional[float] = None
+    dram_latency_ns: Optional[float] = None
+    dram_bandwidth_bytes_per_s: Optional[float] = None
+    loaded_latency_curve: List[Tuple[float, float]] = field(default_factory=list)
+    cache_boundaries_kb: List[float] = field(default_factory=list)
+    sources: Dict[str, str] = field(default_factory=dict)
+
+
+def _plot_module():
+    spec = importlib.util.spec_from_file_location("plot_project2", PLOT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def parse_idle_latency(path: pathlib.Path) -> Optional[float]:
+    """MLC --idle_latency: 'Each iteration took ... clocks ( 107.5 ns)'."""
+    m = re.search(r"\(\s*([0-9.]+)\s*ns\)", path.read_text())
+    return float(m.group(1)) if m else None
+
+def parse_bandwidth_matrix(path: pathlib.Path) -> Optional[float]:
+    """MLC --bandwidth_matrix: local (diagonal) bandwidth of node 0 in MB/s."""
+    lines = path.read_text().splitlines()
+    for i, line in enumerate(lines):
+        if line.strip().startswith("Numa node") and "\t" in line and i + 1 < len(lines):
+            for row in lines[i + 1:]:
+                m = re.match(r"^\s*(\d+)\s+([0-9.]+)", row)
+                if m:
+                    return float(m.group(2))
+    return None
+
+def isotonic_fit(values) -> np.ndarray:
+    """Least-squares non-decreasing fit (pool adjacent violators)."""
+    blocks = []  # [mean, count]
+    for v in np.asarray(values, dtype=float):
+        blocks.append([v, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            mean, n = blocks.pop()
+            blocks[-1][0] = (blocks[-1][0] * blocks[-1][1] + mean * n) / (blocks[-1][1] + n)
+            blocks[-1][1] += n
+    return np.repeat([m for m, _ in blocks], [n for _, n in blocks])
+
+def monotone_curve(bandwidth_mb_s, latency_ns, idle_latency_ns: Optional[float] = None) -> List[Tuple[float, float]]:
+    """(bytes/s, ns) points sorted by bandwidth with latency made non-decreasing.
+
+    MLC samples are noisy at low injection rates. An isotonic fit keeps the
+    tier's latency from falling as load rises without letting one high
+    outlier lift every later point, as a running maximum would. The idle
+    latency, if known, is the zero-load point.
+    """
+    order = np.argsort(bandwidth_mb_s, kind="stable")
+    bw = np.asarray(bandwidth_mb_s, dtype=float)[order] * 1e6
+    lat = isotonic_fit(np.asarray(latency_ns, dtype=float)[order])
+    curve = [(float(b), float(l)) for b, l in zip(bw, lat)]
+    if idle_latency_ns is not None:
+        curve.insert(0, (0.0, min(idle_latency_ns, curve[0][1]) if curve else idle_latency_ns))
+    # Keep bandwidths strictly increasing for interpolation
+    dedup = []
+    for b, l in curve:
+        if dedup and b <= dedup[-1][0]:
+            dedup[-1] = (dedup[-1][0], max(dedup[-1][1], l))
+        else:
+            dedup.append((b, l))
+    return dedup
+
+
+def distinct_levels(boundaries) -> bool:
+    """Three increasing boundaries, each at least twice the previous one."""
+    return len(boundaries) >= 3 and all(b >= 2 * a for a, b in zip(boundaries, boundaries[1:3]))
+
+def calibrate(results_dir: Optional[pathlib.Path] = None, manual_boundaries: bool = False) -> Calibration:
+    """Read whichever Project 2 result files exist under ``results_dir``.
+
+    Cache boundaries are inferred from the working-set curve unless
+    ``manual_boundaries`` is set or inference fails (see ``distinct_levels``).
+    """
+    results_dir = pathlib.Path(results_dir) if results_dir is not None else PROJECT2_RESULTS
+    plot = _plot_module()
+    cal = Calibration()
+
+    ws_file = results_dir / "working_set_latency.csv"
+    if ws_file.exists():
+        ws = plot.parse_working_set(ws_file)
+        ws = ws[pd.to_numeric(ws["latency_ns"], errors="coerce").notna()]
+        ws = ws.astype({"latency_ns": float}).sort_values("size_kb")
+        boundaries = [] if manual_boundaries else [float(b) for b in plot.infer_cache_boundaries(ws)]
+        if distinct_levels(boundaries):
+            cal.sources["cache_boundaries"] = "inferred from working-set curve"
+        else:
+            boundaries = [float(b) for b in plot.MANUAL_CACHE_BOUNDARIES_KB]
+            cal.sources["cache_boundaries"] = "plot_project2.MANUAL_CACHE_BOUNDARIES_KB"
+        cal.cache_boundaries_kb = boundaries
+        if len(boundaries) >= 3:
+            l2_kb, l3_kb = boundaries[1], boundaries[2]
+            cal.l3_capacity_bytes = int(l3_kb * 1024)
+            in_l3 = ws[(ws["size_kb"] > l2_kb) & (ws["size_kb"] <= l3_kb)]
+            if not in_l3.empty:
+                cal.l3_latency_ns = float(in_l3["latency_ns"].median())
+                cal.sources["l3_latency"] = ws_file.name
+
+    idle_file = results_dir / "latencies.txt"
+    if idle_file.exists():
+        cal.dram_latency_ns = parse_idle_latency(idle_file)
+        if cal.dram_latency_ns is not None:
+            cal.sources["dram_latency"] = idle_file.name
+
+    bw_file = results_dir / "bandwidth_matrix.txt"
+    if bw_file.exists():
+        mb_s = parse_bandwidth_matrix(bw_file)
+        if mb_s is not None:
+            cal.dram_bandwidth_bytes_per_s = mb_s * 1e6
+            cal.sources["dram_bandwidth"] = bw_file.name
+
+    ll_file = results_dir / "loaded_latency.txt"
+    if ll_file.exists():
+        ll = plot.parse_loaded_latency(ll_file)
+        if not ll.empty:
+            cal.loaded_latency_curve = monotone_curve(ll["bandwidth_MB_s"], ll["latency_ns"], cal.dram_latency_ns)
+            cal.sources["loaded_latency_curve"] = ll_file.name
+    return cal
+
+
+def calibrated_tier_configs(cal: Optional[Calibration] = None, loaded_latency: bool = True) -> Dict[str, TierConfig]:
+    """Default tier configs with L3 and DRAM replaced by the measured values."""
+    cal = cal if cal is not None else calibrate()
+    cfgs = default_tier_configs()
+    l3 = cfgs["L3Cache"]
+    cfgs["L3Cache"] = replace(
+        l3,
+        capacity_bytes=cal.l3_capacity_bytes or l3.capacity_bytes,
+        base_latency_ns=int(round(cal.l3_latency_ns)) if cal.l3_latency_ns is not None else l3.base_latency_ns,
+    )
+    dram = cfgs["DRAM"]
+    cfgs["DRAM"] = replace(
+        dram,
+        base_latency_ns=int(round(cal.dram_latency_ns)) if cal.dram_latency_ns is not None else dram.base_latency_ns,
+        bandwidth_bytes_per_s=int(cal.dram_bandwidth_bytes_per_s or dram.bandwidth_bytes_per_s),
+        loaded_latency_curve=cal.loaded_latency_curve if loaded_latency and cal.loaded_latency_curve else None,
+    )
+    return cfgs
+
+def calibrated_tiers(cal: Optional[Calibration] = None, loaded_latency: bool = True) -> Dict[str, Tier]:
+    return {name: Tier(cfg) for name, cfg in calibrated_tier_configs(cal, loaded_latency).items()}
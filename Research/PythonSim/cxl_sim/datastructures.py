@@ -1,15 +1,49 @@
+import bisect
 import threading
 from typing import Any, Optional
+from .eventlog import OP_DELETE, OP_GET, OP_PUT, OP_SCAN
 from .locks import TierAwareLock
 from .policies import PlacementPolicy, ObjectStats
+from .tiers import spill_order
+
+_MISSING = object()
+
+def _charge_read(tiers, write_buffer, tier_name: str, value: bytes, buffered: bool) -> bytes:
+    size = len(value)
+    if buffered:
+        tiers[write_buffer.cfg.staging_tier].access(size, write=False)
+        return value
+    lock = TierAwareLock(tier_name)
+    lock.acquire()
+    try:
+        tiers[tier_name].access(size, write=False)
+    finally:
+        lock.release()
+    return value
+
+def _place(tiers, tier_name: str, size: int) -> str:
+    """Reserve ``size`` bytes on ``tier_name`` or, if it is full, on the next
+    slower tier with room (``SPILL_ORDER``); returns the tier used."""
+    order = spill_order(list(tiers))
+    for name in order[order.index(tier_name):] if tier_name in tiers else [tier_name]:
+        try:
+            tiers[name].place(size)
+            return name
+        except MemoryError:
+            continue
+    raise MemoryError(f"No tier from {tier_name} down has room for {size} bytes")
 
 class TieredHashMap:
-    def __init__(self, tiers, policy: PlacementPolicy):
+    def __init__(self, tiers, policy: PlacementPolicy, write_buffer=None, replicas=None, events=None):
         self._tiers = tiers
         self._policy = policy
         self._map = {}
         self._meta = {}
+        self._versions = {}  # key -> bumped on every put and migration commit
         self._global_lock = threading.Lock()
+        self._write_buffer = write_buffer
+        self._replicas = replicas  # ReplicaManager for hot-key read replicas, or None
+        self._events = events  # EventRecorder, or None
     def put(self, key: Any, value: bytes):
         size = len(value)
         stats = self._meta.get(key, ObjectStats(bytes_size=size, access_count=0, last_latency_ns=0))
@@ -18,10 +52,22 @@ class TieredHashMap:
         lock = TierAwareLock(tier_name)
         lock.acquire()
         try:
+            tier_name = _place(self._tiers, tier_name, size)
             tier = self._tiers[tier_name]
-            tier.place(size)
-            tier.access(size, write=True)
-            self._map[key] = (tier_name, value)
+            ns = 0
+            if self._write_buffer is None or not self._write_buffer.append(key, tier_name, value):
+                ns = tier.access(size, write=True)
+            if self._events is not None:
+                self._events.record(OP_PUT, key, tier_name, size, ns)
+            with self._global_lock:
+                old = self._map.get(key)
+                self._map[key] = (tier_name, value)
+                self._versions[key] = self._versions.get(key, 0) + 1
+            if old is not None:
+                # The overwritten value's space becomes dead until compaction
+                self._tiers[old[0]].release(len(old[1]))
+            if self._replicas is not None:
+                self._replicas.on_write(key, value)
             stats.access_count += 1
             self._meta[key] = stats
         finally:
@@ -31,27 +77,98 @@ class TieredHashMap:
         if not tup:
             return None
         tier_name, value = tup
+        if self._replicas is not None:
+            tier_name = self._replicas.route(key, tier_name)
         lock = TierAwareLock(tier_name)
         lock.acquire()
         try:
-            tier = self._tiers[tier_name]
-            tier.access(len(value), write=False)
-            stats = self._meta[key]
-            stats.access_count += 1
-            self._meta[key] = stats
+            ns = 0
+            if self._write_buffer is None or self._write_buffer.read(key) is None:
+                tier = self._tiers[tier_name]
+                ns = tier.access(len(value), write=False)
+            if self._events is not None:
+                self._events.record(OP_GET, key, tier_name, len(value), ns)
+            stats = self._meta.get(key)
+            if stats is not None:  # None if deleted concurrently
+                stats.access_count += 1
+                self._meta[key] = stats
             return value
         finally:
             lock.release()
+    def _unlink(self, key: Any):
+        with self._global_lock:
+            entry = self._map.pop(key, None)
+            if entry is None:
+                return None, False
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._meta.pop(key, None)
+        buffered = self._write_buffer is not None and self._write_buffer.discard(key)
+        self._tiers[entry[0]].release(len(entry[1]))
+        if self._events is not None:
+            self._events.record(OP_DELETE, key, entry[0], len(entry[1]), 0)
+        if self._replicas is not None:
+            self._replicas.drop(key)
+        return entry, buffered
+    def pop(self, key: Any, default: Any = _MISSING) -> bytes:
+        """Remove ``key`` and return its value (read at its tier's cost)."""
+        entry, buffered = self._unlink(key)
+        if entry is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return _charge_read(self._tiers, self._write_buffer, entry[0], entry[1], buffered)
+    def delete(self, key: Any) -> bool:
+        """Remove ``key`` without reading it; returns whether it existed."""
+        return self._unlink(key)[0] is not None
+    def locate(self, key: Any):
+        """(tier_name, value) of ``key``, or None."""
+        return self._map.get(key)
+    def begin_migration(self, key: Any, src: str):
+        """(value, version) of an object still on ``src``, else None."""
+        with self._global_lock:
+            entry = self._map.get(key)
+            if entry is None or entry[0] != src:
+                return None
+            return entry[1], self._versions.get(key, 0)
+    def commit_migration(self, key: Any, src: str, dst: str, version: int) -> bool:
+        """Switch ``key`` from ``src`` to ``dst`` unless it changed since ``begin_migration``."""
+        with self._global_lock:
+            entry = self._map.get(key)
+            if entry is None or entry[0] != src or self._versions.get(key, 0) != version:
+                return False
+            self._map[key] = (dst, entry[1])
+            self._versions[key] = version + 1
+            return True
+
+class SortedKeys(list):
+    """Sorted key list; the key index of a ``TieredBTree``."""
+    def bisect_left(self, key: Any) -> int:
+        return bisect.bisect_left(self, key)
+    def insort(self, key: Any):
+        bisect.insort(self, key)
+    def discard(self, key: Any):
+        i = bisect.bisect_left(self, key)
+        if i < len(self) and self[i] == key:
+            del self[i]
 
-# Minimal B-tree stub using the same tier-aware locking idea (for demo)
+# Minimal B-tree stub using the same tier-aware locking idea (for demo).
+# Entries live in ``_map`` (key -> (tier_name, value)); ``_keys`` holds the
+# keys in sorted order and every ``order`` consecutive keys form one leaf.
 class TieredBTree:
-    def __init__(self, tiers, policy: PlacementPolicy, order: int = 8):
+    def __init__(self, tiers, policy: PlacementPolicy, order: int = 8, write_buffer=None, metrics=None,
+                 replicas=None, events=None):
         self._tiers = tiers
         self._policy = policy
         self.order = order
-        self._root = []  # simplified
+        self._map = {}
+        self._keys = SortedKeys()
         self._meta = {}
+        self._versions = {}
         self._global_lock = threading.Lock()
+        self._write_buffer = write_buffer
+        self._replicas = replicas  # ReplicaManager for hot-key read replicas, or None
+        self._events = events  # EventRecorder, or None
+        self._metrics = metrics
     def insert(self, key: Any, value: bytes):
         size = len(value)
         stats = self._meta.get(key, ObjectStats(bytes_size=size, access_count=0, last_latency_ns=0))
@@ -60,26 +177,166 @@ class TieredBTree:
         lock = TierAwareLock(tier_name)
         lock.acquire()
         try:
+            tier_name = _place(self._tiers, tier_name, size)
             tier = self._tiers[tier_name]
-            tier.place(size)
-            tier.access(size, write=True)
-            self._root.append((key, tier_name, value))
+            ns = 0
+            if self._write_buffer is None or not self._write_buffer.append(key, tier_name, value):
+                ns = tier.access(size, write=True)
+            if self._events is not None:
+                self._events.record(OP_PUT, key, tier_name, size, ns)
+            with self._global_lock:
+                old = self._map.get(key)
+                if old is None:
+                    self._keys.insort(key)
+                self._map[key] = (tier_name, value)
+                self._versions[key] = self._versions.get(key, 0) + 1
+            if old is not None:
+                self._tiers[old[0]].release(len(old[1]))
+            if self._replicas is not None:
+                self._replicas.on_write(key, value)
             stats.access_count += 1
             self._meta[key] = stats
         finally:
             lock.release()
     def search(self, key: Any) -> Optional[bytes]:
-        for k, tier_name, value in self._root:
-            if k == key:
-                lock = TierAwareLock(tier_name)
-                lock.acquire()
-                try:
-                    tier = self._tiers[tier_name]
-                    tier.access(len(value), write=False)
-                    stats = self._meta[key]
-                    stats.access_count += 1
-                    self._meta[key] = stats
-                    return value
-                finally:
-                    lock.release()
-        return None
+        tup = self._map.get(key)
+        if not tup:
+            return None
+        tier_name, value = tup
+        if self._replicas is not None:
+            tier_name = self._replicas.route(key, tier_name)
+        lock = TierAwareLock(tier_name)
+        lock.acquire()
+        try:
+            ns = 0
+            if self._write_buffer is None or self._write_buffer.read(key) is None:
+                tier = self._tiers[tier_name]
+                ns = tier.access(len(value), write=False)
+            if self._events is not None:
+                self._events.record(OP_GET, key, tier_name, len(value), ns)
+            stats = self._meta.get(key)
+            if stats is not None:
+                stats.access_count += 1
+                self._meta[key] = stats
+            return value
+        finally:
+            lock.release()
+    def _unlink(self, key: Any):
+        with self._global_lock:
+            entry = self._map.pop(key, None)
+            if entry is None:
+                return None, False
+            self._keys.discard(key)
+            tier_name, value = entry
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._meta.pop(key, None)
+        buffered = self._write_buffer is not None and self._write_buffer.discard(key)
+        self._tiers[tier_name].release(len(value))
+        if self._events is not None:
+            self._events.record(OP_DELETE, key, tier_name, len(value), 0)
+        if self._replicas is not None:
+            self._replicas.drop(key)
+        return entry, buffered
+    def pop(self, key: Any, default: Any = _MISSING) -> bytes:
+        """Remove ``key`` and return its value (read at its tier's cost)."""
+        entry, buffered = self._unlink(key)
+        if entry is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return _charge_read(self._tiers, self._write_buffer, entry[0], entry[1], buffered)
+    def delete(self, key: Any) -> bool:
+        """Remove ``key`` without reading it; returns whether it existed."""
+        return self._unlink(key)[0] is not None
+    put = insert
+    get = search
+    def readahead_bytes(self, tier_name: str) -> int:
+        """Bandwidth-delay product of a tier: bytes in flight for one access latency, the
+        median read latency of its fio profile at the smallest block size if it has one,
+        else its current base latency (which follows a loaded-latency curve)."""
+        tier = self._tiers[tier_name]
+        if tier.latency_model is not None:
+            dist = tier.latency_model.lookup(1, False, tier.cfg.latency_iodepth or 1)
+            latency_ns = dist.quantile_ns(0.5)
+        else:
+            latency_ns = tier.base_latency_ns()
+        return int(tier.cfg.bandwidth_bytes_per_s * latency_ns / 1e9)
+
+    def scan(self, lo: Any = None, hi: Any = None, reverse: bool = False, limit: Optional[int] = None):
+        """(key, value) pairs with ``lo <= key < hi`` in key order (descending if ``reverse``),
+        at most ``limit`` of them (the first ones in scan order).
+
+        Leaves are read in order. Consecutive leaves on the same tier are
+        merged into one readahead request of up to the tier's bandwidth-delay
+        product (a single leaf larger than that is read as one request), so a
+        slow tier pays its base latency once per request rather than once per
+        leaf.
+        """
+        with self._global_lock:
+            start = 0 if lo is None else self._keys.bisect_left(lo)
+            stop = len(self._keys) if hi is None else self._keys.bisect_left(hi)
+            if limit is not None:
+                if reverse:
+                    start = max(start, stop - limit)
+                else:
+                    stop = min(stop, start + limit)
+            rows = [(key, *self._map[key]) for key in self._keys[start:stop]]
+        leaves = [pos // self.order for pos in range(start, stop)]
+        if reverse:
+            rows.reverse()
+            leaves.reverse()
+        # Per-leaf chunks (split where a leaf's entries change tier), then merge
+        # consecutive chunks on one tier while the request fits the readahead size
+        chunks = []  # [tier_name, leaf, bytes]
+        for (key, tier_name, value), leaf in zip(rows, leaves):
+            if self._write_buffer is not None and self._write_buffer.read(key) is not None:
+                continue
+            if chunks and chunks[-1][0] == tier_name and chunks[-1][1] == leaf:
+                chunks[-1][2] += len(value)
+            else:
+                chunks.append([tier_name, leaf, len(value)])
+        requests = []  # [tier_name, bytes]
+        for tier_name, _, nbytes in chunks:
+            if requests and requests[-1][0] == tier_name and \
+                    requests[-1][1] + nbytes <= self.readahead_bytes(tier_name):
+                requests[-1][1] += nbytes
+            else:
+                requests.append([tier_name, nbytes])
+        for tier_name, nbytes in requests:
+            lock = TierAwareLock(tier_name)
+            lock.acquire()
+            try:
+                ns = self._tiers[tier_name].access(nbytes, write=False)
+            finally:
+                lock.release()
+            if self._events is not None:
+                self._events.record(OP_SCAN, lo, tier_name, nbytes, ns)
+            if self._metrics is not None:
+                self._metrics.record_tier_access(tier_name, nbytes)
+        for key, _, _ in rows:
+            stats = self._meta.get(key)
+            if stats is not None:
+                stats.access_count += 1
+                self._meta[key] = stats
+        if self._metrics is not None:
+            self._metrics.record_scan(len(rows), sum(len(v) for _, _, v in rows), len(requests))
+        return [(key, value) for key, _, value in rows]
+    def locate(self, key: Any):
+        """(tier_name, value) of ``key``, or None."""
+        return self._map.get(key)
+    def begin_migration(self, key: Any, src: str):
+        """(value, version) of an object still on ``src``, else None."""
+        with self._global_lock:
+            entry = self._map.get(key)
+            if entry is None or entry[0] != src:
+                return None
+            return entry[1], self._versions.get(key, 0)
+    def commit_migration(self, key: Any, src: str, dst: str, version: int) -> bool:
+        """Switch ``key`` from ``src`` to ``dst`` unless it changed since ``begin_migration``."""
+        with self._global_lock:
+            entry = self._map.get(key)
+            if entry is None or entry[0] != src or self._versions.get(key, 0) != version:
+                return False
+            self._map[key] = (dst, entry[1])
+            self._versions[key] = version + 1
+            return True
@@ -0,0 +1,405 @@
+"""Analytical latency/residency estimator for screening tier configurations.
+
+Model
+-----
+A run of ``n_ops`` operations picks key ``i`` with probability ``p_i`` and is
+a read with probability ``read_ratio``. Accesses to key ``i`` are Poisson with
+mean ``n_ops * p_i``. Reads that arrive before the key's first write miss.
+Every successful access sees the key's current access count ``c`` and is
+served by ``policy.choose_tier(c)`` (migration is assumed to keep up). From
+the Poisson count distribution we get, per key, the expected number of
+accesses served at each count and the final count, which gives:
+
+* the fraction of gets/puts served by each tier (plus the get miss fraction),
+* steady-state residency (keys and bytes per tier) at the end of the run.
+
+Tiers that overflow spill, in order of fit, to the next slower tier (see
+``SPILL_ORDER``); spilling past the last tier marks the config infeasible.
+
+Per-op latency is a mixture: each tier contributes the latencies
+``Tier.access`` would charge it (``Tier.latency_points_ns``: the same base
+latency, from a loaded-latency curve at ``offered_bw`` or a fio latency
+distribution for the op's direction, plus (de)compression and transfer time)
+plus the wall time an op spends beyond that sleep, taken from ``calibrate()``.
+That noise is a distribution, not a mean: it is measured per op on a started
+Simulator (Python overhead, sleep overshoot, background migration and
+compaction passes) at several sleep lengths (``SLEEP_GRID_NS``), because the
+overshoot tail grows with the sleep. Each latency point is convolved with the
+noise measured nearest its own length; tiers that sample a fio latency model
+also pay that model's measured lookup cost. Channel queueing is not modelled:
+it only matters when several clients or migration batches share a tier.
+Percentiles of the mixture are computed numerically from the weighted support
+points.
+"""
+import random
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .policies import HotWarmColdPolicy, ObjectStats, PlacementPolicy
+from .tiers import SPILL_ORDER, Tier, TierConfig, default_tier_configs, spill_order
+PERCENTILES = (50, 95, 99, 99.9)
+_CHUNK_CELLS = 5_000_000  # keys x counts evaluated per numpy block
+_MAX_LATENCY_POINTS = 1024  # quantiles kept from a tier's latency distribution
+_MAX_NOISE_POINTS = 32  # op-noise bins (see _tail_bins) convolved with each latency of a distribution
+SLEEP_GRID_NS = (0, 100, 10_000, 30_000, 100_000, 300_000, 1_000_000)  # sleep lengths calibrate() probes
+_NOISE_BUDGET_NS = 150_000_000  # time spent probing each sleep length
+_NOISE_MIN_OPS, _NOISE_MAX_OPS = 300, 3000  # ops probed per sleep length
+_NOISE_RUN_OPS = 500  # ops per probe Simulator, about a validation run
+
+
+@dataclass
+class Popularity:
+    """Per-key access probabilities (key ``i`` is ``k{i}`` in the Simulator workloads)."""
+    probs: np.ndarray
+
+    @classmethod
+    def uniform(cls, n_keys: int) -> "Popularity":
+        return cls(np.full(n_keys, 1.0 / n_keys))
+
+    @classmethod
+    def hotspot(cls, hotspot_fraction: float = 0.2, total_keys: Optional[int] = None) -> "Popularity":
+        """Mirror of ``Simulator.workload_hotspot``."""
+        total_keys = total_keys or int(100 / hotspot_fraction)
+        hot_keys = int(total_keys * hotspot_fraction)
+        probs = np.empty(total_keys)
+        probs[:hot_keys] = hotspot_fraction / hot_keys
+        probs[hot_keys:] = (1.0 - hotspot_fraction) / (total_keys - hot_keys)
+        return cls(probs)
+
+    @classmethod
+    def zipf(cls, n_keys: int, s: float = 0.99) -> "Popularity":
+        w = 1.0 / np.arange(1, n_keys + 1, dtype=float) ** s
+        return cls(w / w.sum())
+
+    @classmethod
+    def from_trace(cls, keys) -> "Popularity":
+        _, counts = np.unique(np.asarray(list(keys), dtype=object).astype(str), return_counts=True)
+        return cls(counts / counts.sum())
+
+
+@dataclass
+class Calibration:
+    sleep_overshoot_ns: np.ndarray = field(default_factory=lambda: np.array([0.0]))  # shortest sleep
+    put_overhead_ns: float = 0.0
+    get_overhead_ns: float = 0.0
+    miss_overhead_ns: float = 0.0
+    # (op, sleep length) -> sorted wall time beyond the sleep, measured on the simulator's op path
+    noise_samples_ns: Dict[Tuple[str, int], np.ndarray] = field(default_factory=dict)
+    latency_model_overhead_ns: float = 0.0  # extra Python time of sampling a fio latency model
+
+    def noise_for(self, op: str, sleep_ns: float) -> np.ndarray:
+        """Sorted wall time beyond ``sleep_ns`` of one ``op`` ("put", "get" or "miss") that sleeps
+        ``sleep_ns``: from the probed sleep length nearest in log scale (0 for no sleep)."""
+        lengths = [length for o, length in self.noise_samples_ns if o == op]
+        if not lengths:
+            overhead = getattr(self, f"{op}_overhead_ns")
+            return overhead + (self.sleep_overshoot_ns if sleep_ns > 0 else np.array([0.0]))
+        if sleep_ns <= 0 or op == "miss":
+            nearest = min(lengths)  # Tier.access skips the sleep
+        else:
+            slept = np.array([length for length in lengths if length > 0])
+            nearest = int(slept[np.argmin(np.abs(np.log(slept / sleep_ns)))])
+        return self.noise_samples_ns[(op, nearest)]
+
+class _PinnedTier(Tier):
+    """Runs ``cfg``'s access path (latency draw, channel, queue-depth tracking) but charges ``sleep_ns``."""
+    def __init__(self, cfg: TierConfig, sleep_ns: int):
+        super().__init__(cfg)
+        self.sleep_ns = sleep_ns
+
+    def latency_ns(self, bytes_count: int, write: bool = False, sample: bool = False, iodepth: int = 1) -> int:
+        super().latency_ns(bytes_count, write, sample, iodepth)
+        return self.sleep_ns
+
+def _probe_noise(sleep_ns: int, n_keys: int = 100) -> Dict[str, np.ndarray]:
+    """Wall time beyond ``sleep_ns`` per put/get/miss on started Simulators whose default tiers
+    (without fio latency models) all charge ``sleep_ns``: Python overhead, sleep overshoot and
+    background-thread pauses. Like the workloads, ops and keys are random and each Simulator
+    serves ``_NOISE_RUN_OPS`` ops."""
+    from .simulator import Simulator
+    rng = random.Random(sleep_ns)
+    wall = {"put": [], "get": [], "miss": []}
+    deadline = time.perf_counter_ns() + _NOISE_BUDGET_NS
+    i = 0
+    sim = None
+    while i < _NOISE_MIN_OPS or (i < _NOISE_MAX_OPS and time.perf_counter_ns() < deadline):
+        if i % _NOISE_RUN_OPS == 0:
+            if sim is not None:
+                sim.stop()
+            sim = Simulator(tiers={name: _PinnedTier(replace(cfg, latency_profile=None), sleep_ns)
+                                   for name, cfg in default_tier_configs().items()})
+            sim.start()
+        op = rng.choice(("put", "get", "miss"))
+        key = f"k{rng.randrange(n_keys)}" if op != "miss" else f"missing{i}"
+        value = bytes(2048)
+        s = time.perf_counter_ns()
+        if op == "put":
+            sim.ds.put(key, value)
+        elif sim.ds.get(key) is None:
+            op = "miss"  # a get that arrived before the key's first put
+        wall[op].append(time.perf_counter_ns() - s - (sleep_ns if op != "miss" else 0))
+        i += 1
+    sim.stop()
+    return {op: np.sort(np.asarray(w, dtype=float)) for op, w in wall.items()}
+
+def _latency_model_overhead_ns(n: int = 2000) -> float:
+    """Median extra time of an access that samples the fio latency model (0 without the profile)."""
+    cfg = default_tier_configs()["SSD"]
+    if cfg.latency_profile is None:
+        return 0.0
+    cost = {}
+    for tier in (_PinnedTier(cfg, 0), _PinnedTier(replace(cfg, latency_profile=None), 0)):
+        wall = np.empty(n)
+        for i in range(n):
+            s = time.perf_counter_ns()
+            tier.access(2048, write=i % 2 == 0)
+            wall[i] = time.perf_counter_ns() - s
+        cost[tier.latency_model is not None] = float(np.median(wall))
+    return max(0.0, cost[True] - cost[False])
+
+def calibrate() -> Calibration:
+    """Measure, at each ``SLEEP_GRID_NS`` length, what a put/get/miss costs on this machine beyond
+    the sleep ``Tier.access`` charges."""
+    samples = {}
+    for sleep_ns in SLEEP_GRID_NS:
+        for op, noise in _probe_noise(sleep_ns).items():
+            samples[(op, sleep_ns)] = noise
+    shortest = min(length for length in SLEEP_GRID_NS if length > 0)
+    overshoot = samples[("get", shortest)] - float(np.median(samples[("get", 0)]))
+    return Calibration(overshoot, float(samples[("put", 0)].mean()), float(samples[("get", 0)].mean()),
+                       float(samples[("miss", 0)].mean()), samples, _latency_model_overhead_ns())
+
+
+def _quantiles(points: np.ndarray, n: int) -> np.ndarray:
+    """``n`` evenly spaced quantiles of sorted, equally weighted ``points`` (all of them if fewer)."""
+    if points.size <= n:
+        return points
+    return points[((np.arange(n) + 0.5) * points.size / n).astype(int)]
+
+def _tail_bins(points: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Means and weights of ``n`` probability bins of sorted, equally weighted ``points``: even up
+    to the 90th percentile, geometrically finer above it, so the mean and the tail both survive."""
+    if points.size <= n:
+        return points, np.full(points.size, 1.0 / points.size)
+    half = n // 2
+    tail = 1.0 - 0.1 * np.geomspace(1.0, 1.0 / points.size, n - half)[1:]
+    edges = np.concatenate([np.linspace(0.0, 0.9, half + 1), tail, [1.0]])
+    idx = np.unique(np.round(edges * points.size).astype(int))
+    counts = np.diff(idx)
+    return np.add.reduceat(points, idx[:-1]) / counts, counts / points.size
+
+def access_latency_points_ns(tier, size: int, write: bool = False, offered_bw: float = 0.0) -> np.ndarray:
+    """Sorted, equally likely latencies ``Tier.access`` charges one access (queueing aside)."""
+    tier = tier if isinstance(tier, Tier) else Tier(tier)
+    return np.sort(np.asarray(tier.latency_points_ns(size, write, offered_bw), dtype=float))
+
+def access_latency_ns(tier, size: int, write: bool = False, offered_bw: float = 0.0) -> float:
+    """Mean modeled latency of one access, from the same model as ``Tier.access``."""
+    return float(access_latency_points_ns(tier, size, write, offered_bw).mean())
+
+def footprint(cfg: TierConfig, size: int) -> float:
+    return size * (cfg.compression_ratio if cfg.compression_ratio < 1.0 else 1.0)
+
+
+def _count_tiers(policy: PlacementPolicy, size: int, hint: float, max_count: int) -> List[str]:
+    return [policy.choose_tier(ObjectStats(bytes_size=size, access_count=c, last_latency_ns=0,
+                                           compression_ratio_hint=hint))
+            for c in range(max_count + 1)]
+
+def _policy_horizon(policy: PlacementPolicy) -> int:
+    if isinstance(policy, HotWarmColdPolicy):
+        return max(policy.hot_threshold, policy.warm_threshold) + 1
+    return 256
+
+def _poisson_tail(mu: np.ndarray, k_max: int) -> np.ndarray:
+    """P(N > k) for k = 0..k_max-1, shape (len(mu), k_max)."""
+    pmf = np.empty((mu.size, k_max))
+    pmf[:, 0] = np.exp(-mu)
+    for k in range(1, k_max):
+        pmf[:, k] = pmf[:, k - 1] * mu / k
+    return np.clip(1.0 - np.cumsum(pmf, axis=1), 0.0, 1.0)
+
+
+@dataclass
+class Estimate:
+    feasible: bool
+    residency_keys: Dict[str, float]
+    residency_bytes: Dict[str, float]
+    tier_mix: Dict[str, Dict[str, float]]  # op -> tier (or "miss") -> fraction of ops
+    ops: Dict[str, Dict[str, float]]  # op -> mean_ns / p50_ns / ...
+
+
+def estimate(popularity: Popularity, n_ops: int, read_ratio: float = 0.5, payload_size: int = 2048,
+             tiers: Optional[Dict[str, TierConfig]] = None, policy: Optional[PlacementPolicy] = None,
+             calibration: Optional[Calibration] = None, compression_ratio_hint: float = 1.0,
+             offered_bw: float = 0.0) -> Estimate:
+    """Residency and per-op latency; ``offered_bw`` (bytes/s) is where loaded-latency curves are read."""
+    tiers = tiers or default_tier_configs()
+    tiers = {name: getattr(t, "cfg", t) for name, t in tiers.items()}  # accept Tier or TierConfig
+    models = {name: Tier(cfg) for name, cfg in tiers.items()}
+    policy = policy or HotWarmColdPolicy()
+    cal = calibration or Calibration()
+    write_ratio = 1.0 - read_ratio
+    horizon = _policy_horizon(policy)
+    count_tier = _count_tiers(policy, payload_size, compression_ratio_hint, horizon)
+    tier_names = list(dict.fromkeys(count_tier))
+
+    served = dict.fromkeys(tier_names, 0.0)  # expected successful accesses per desired tier
+    resident = dict.fromkeys(tier_names, 0.0)  # expected keys per desired tier at end of run
+    misses = 0.0
+    # Misses: access k is a miss iff accesses 0..k were all reads
+    miss_k = 1
+    while read_ratio ** miss_k > 1e-6 and miss_k < 10_000:
+        miss_k += 1
+    miss_w = read_ratio ** np.arange(1, miss_k + 1)
+    # Keys with (nearly) equal rates behave identically: group them, weighting by
+    # group size. Rates are quantized to 0.1% in log space.
+    lam_all = n_ops * np.asarray(popularity.probs, dtype=float)
+    lam_all = np.where(lam_all > 0, np.exp(np.round(np.log(np.maximum(lam_all, 1e-300)) * 1000) / 1000), 0.0)
+    lam_u, weight_u = np.unique(lam_all, return_counts=True)
+    chunk = max(1, _CHUNK_CELLS // max(miss_k, horizon))
+    for lo in range(0, lam_u.size, chunk):
+        lam = lam_u[lo:lo + chunk]
+        w = weight_u[lo:lo + chunk].astype(float)
+        expected_miss = _poisson_tail(lam, miss_k) @ miss_w if read_ratio > 0 else np.zeros_like(lam)
+        misses += expected_miss @ w
+        mu = np.maximum(lam - expected_miss, 0.0)  # successful accesses, approximated as Poisson
+        tail = _poisson_tail(mu, horizon)
+        per_count = w @ tail  # E[# accesses served at count c]
+        for c in range(horizon):
+            served[count_tier[c]] += per_count[c]
+        served[count_tier[horizon]] += mu @ w - per_count.sum()
+        # Final count distribution, conditioned on the key existing (count >= 1)
+        p_final = -np.diff(np.concatenate([np.ones((mu.size, 1)), tail], axis=1), axis=1)
+        exists = 1.0 - np.exp(-lam * write_ratio) if write_ratio > 0 else np.zeros_like(lam)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.where(tail[:, 0] > 0, exists / tail[:, 0], 0.0) * w
+        final = scale @ p_final[:, 1:]
+        for c in range(1, horizon):
+            resident[count_tier[c]] += final[c - 1]
+        resident[count_tier[horizon]] += tail[:, horizon - 1] @ scale
+
+    # Capacity: spill the part of each tier that does not fit to the next slower tier
+    order = spill_order(list(tiers))
+    feasible = True
+    route = {}  # desired tier -> {actual tier: fraction}
+    used = dict.fromkeys(tiers, 0.0)
+    res_keys = dict.fromkeys(tiers, 0.0)
+    for desired in order:
+        keys = resident.get(desired, 0.0)
+        route[desired] = {}
+        remaining = 1.0
+        for actual in order[order.index(desired):]:
+            if remaining <= 0:
+                break
+            need = keys * remaining * footprint(tiers[actual], payload_size)
+            free = tiers[actual].capacity_bytes - used[actual]
+            frac = remaining if need <= free or need == 0 else remaining * max(free, 0) / need
+            used[actual] += keys * frac * footprint(tiers[actual], payload_size)
+            res_keys[actual] += keys * frac
+            route[desired][actual] = frac
+            remaining -= frac
+        if remaining > 1e-12 and keys > 0:
+            feasible = False
+
+    total_success = sum(served.values())
+    tier_frac = dict.fromkeys(tiers, 0.0)
+    for desired, n in served.items():
+        for actual, frac in route.get(desired, {desired: 1.0}).items():
+            tier_frac[actual] += n * frac / total_success if total_success else 0.0
+    n_reads = n_ops * read_ratio
+    miss_frac = misses / n_reads if n_reads else 0.0
+
+    mixes = {
+        "put": ({t: f for t, f in tier_frac.items() if f > 0}, 0.0),
+        "get": ({t: f * (1.0 - miss_frac) for t, f in tier_frac.items() if f > 0}, miss_frac),
+    }
+    ops = {}
+    tier_mix = {}
+    bins = {}  # (id of noise samples, bin count) -> _tail_bins
+    for op_name, (mix, miss) in mixes.items():
+        points, weights = [], []
+        if miss > 0:
+            miss_pts = cal.noise_for("miss", 0)
+            points.append(miss_pts)
+            weights.append(np.full(miss_pts.size, miss / miss_pts.size))
+        for t, f in mix.items():
+            lat = access_latency_points_ns(models[t], payload_size, op_name == "put", offered_bw)
+            if lat.size > 1:
+                lat = _quantiles(lat, _MAX_LATENCY_POINTS)
+            extra = cal.latency_model_overhead_ns if models[t].latency_model is not None else 0.0
+            # Each slept latency picks up the op noise measured at its own length
+            for sleep_ns in np.unique(lat):
+                group = lat[lat == sleep_ns]
+                samples = cal.noise_for(op_name, sleep_ns)
+                n_bins = _MAX_NOISE_POINTS if lat.size > 1 else _MAX_LATENCY_POINTS
+                if (id(samples), n_bins) not in bins:
+                    bins[(id(samples), n_bins)] = _tail_bins(samples, n_bins)
+                noise, noise_w = bins[(id(samples), n_bins)]
+                support = (group[:, None] + noise[None, :]).ravel() + extra
+                points.append(support)
+                weights.append((np.full(group.size, f / lat.size)[:, None] * noise_w[None, :]).ravel())
+        pts, wts = np.concatenate(points), np.concatenate(weights)
+        order_idx = np.argsort(pts)
+        pts, cdf = pts[order_idx], np.cumsum(wts[order_idx])
+        cdf /= cdf[-1]
+        stats = {"mean_ns": float(np.dot(pts, wts[order_idx]) / wts.sum())}
+        for p in PERCENTILES:
+            stats[f"p{p:g}_ns".replace(".", "")] = float(pts[min(np.searchsorted(cdf, p / 100.0), pts.size - 1)])
+        ops[op_name] = stats
+        tier_mix[op_name] = {t: float(f) for t, f in mix.items()}
+        if miss:
+            tier_mix[op_name]["miss"] = float(miss)
+
+    res_keys = {t: float(k) for t, k in res_keys.items()}
+    res_bytes = {t: res_keys[t] * footprint(tiers[t], payload_size) for t in tiers}
+    return Estimate(feasible, res_keys, res_bytes, tier_mix, ops)
+
+
+# Workloads the estimator can model, keyed like harness.SCENARIOS
+VALIDATION_SCENARIOS = {
+    "tiered_random": dict(workload="random", popularity=lambda a: Popularity.uniform(a["key_space"]),
+                          args=dict(n_ops=500, payload_size=2048, key_space=100, read_ratio=0.5)),
+    "tiered_hotspot": dict(workload="hotspot", popularity=lambda a: Popularity.hotspot(a["hotspot_fraction"], a.get("key_space")),
+                           args=dict(n_ops=500, payload_size=2048, hotspot_fraction=0.2, read_ratio=0.8)),
+    "tiered_large_payload": dict(workload="random", popularity=lambda a: Popularity.uniform(a["key_space"]),
+                                 args=dict(n_ops=300, payload_size=8192, key_space=50, read_ratio=0.6)),
+    "random_hot_keys": dict(workload="random", popularity=lambda a: Popularity.uniform(a["key_space"]),
+                            args=dict(n_ops=2000, payload_size=2048, key_space=20, read_ratio=0.7)),
+}
+
+def validate(scenarios=None, calibration: Optional[Calibration] = None, reps: int = 3) -> List[dict]:
+    """Compare estimates with Simulator runs; returns one row per scenario/op/metric."""
+    from .simulator import Simulator
+    rows = []
+    for name, sc in (scenarios or VALIDATION_SCENARIOS).items():
+        args = sc["args"]
+        # Sleep overshoot drifts with machine load: calibrate next to the runs it is compared with
+        cal = calibration or calibrate()
+        est = estimate(sc["popularity"](args), args["n_ops"], args["read_ratio"], args["payload_size"],
+                       calibration=cal)
+        lat = {"get": [], "put": []}
+        for rep in range(reps):
+            random.seed(rep)
+            sim = Simulator()
+            sim.start()
+            getattr(sim, f"workload_{sc['workload']}")(**args)
+            sim.stop()
+            for op_name in lat:
+                lat[op_name].extend(sim.metrics.latencies_ns.get(op_name, []))
+        for op_name, observed in lat.items():
+            if not observed:
+                continue
+            obs = np.asarray(observed, dtype=float)
+            measured = {"mean_ns": obs.mean()}
+            for p in PERCENTILES:
+                measured[f"p{p:g}_ns".replace(".", "")] = np.percentile(obs, p)
+            for metric, value in measured.items():
+                predicted = est.ops[op_name][metric]
+                rows.append({"scenario": name, "op": op_name, "metric": metric, "simulated": float(value),
+                             "estimated": predicted,
+                             "rel_error": (predicted - value) / value if value else float("nan")})
+    return rows
@@ -0,0 +1,204 @@
+"""Binary per-access event log, a NumPy reader, and trace replay.
+
+``EventRecorder`` appends one fixed-width 32-byte record per event:
+
+    t_ns        int64   wall-clock time (time.time_ns, same clock as Metrics)
+    latency_ns  int64   ns charged by the tier (0 when served by the write buffer or
+                        for deletes; commit pause for migrations; time spent compacting)
+    key_id      uint32  index into the key table (NO_KEY for compactions)
+    size        uint32  bytes accessed / moved / reclaimed
+    op          uint8   index into OPS
+    tier        uint8   tier index (destination for migrations)
+    src_tier    uint8   source tier of a migration, else NO_TIER
+    thread      uint8   recording thread, numbered in order of first event
+
+The hot path appends a tuple to a thread-local list and takes no lock
+(except to number a key seen for the first time). A
+full list is converted to one block of records and copied into the file;
+blocks are claimed with an atomic counter, so threads never write to the
+same region. The file is mapped in 32 MiB segments that are added as it
+grows. ``close()`` flushes every thread's partial block, trims the file, and
+writes ``<path>.json`` with the tier, op and key tables.
+
+``EventLog`` memory-maps a closed log and exposes each field as an array,
+in time order, without the empty rows of partial blocks. ``replay`` re-issues
+the recorded gets, puts and deletes against a simulator.
+"""
+import itertools
+import json
+import mmap
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+RECORD = np.dtype([("t_ns", "<i8"), ("latency_ns", "<i8"), ("key_id", "<u4"), ("size", "<u4"),
+                   ("op", "u1"), ("tier", "u1"), ("src_tier", "u1"), ("thread", "u1"), ("_pad", "<u4")])
+OPS = ("get", "put", "delete", "scan", "migrate", "compact")
+OP_GET, OP_PUT, OP_DELETE, OP_SCAN, OP_MIGRATE, OP_COMPACT = range(len(OPS))
+NO_KEY = 0xFFFFFFFF
+NO_TIER = 0xFF
+BLOCK_RECORDS = 4096
+SEGMENT_BYTES = 32 * 1024 * 1024  # a multiple of BLOCK_RECORDS * RECORD.itemsize and of mmap granularity
+
+
+class EventRecorder:
+    def __init__(self, path: str, tier_names: Sequence[str], block_records: int = BLOCK_RECORDS):
+        if SEGMENT_BYTES % (block_records * RECORD.itemsize):
+            raise ValueError("block_records must divide the segment size")
+        self.path = path
+        self.tier_names = list(tier_names)
+        self._tier_index = {name: i for i, name in enumerate(self.tier_names)}
+        self._block_records = block_records
+        self._blocks_per_segment = SEGMENT_BYTES // (block_records * RECORD.itemsize)
+        self._key_ids: Dict[Any, int] = {}
+        self._next_block = itertools.count()
+        self._next_thread = itertools.count()
+        self._local = threading.local()
+        self._buffers: List[list] = []
+        self._lock = threading.Lock()  # new key ids, segment mapping and buffer registry
+        self._file = open(path, "w+b")
+        self._maps: List[mmap.mmap] = []
+        self._blocks_used = 0
+        self.closed = False
+
+    def key_id(self, key: Any) -> int:
+        kid = self._key_ids.get(key)
+        if kid is None:
+            # Ids must stay dense: close() writes the key table as a list indexed by id
+            with self._lock:
+                kid = self._key_ids.get(key)
+                if kid is None:
+                    kid = self._key_ids[key] = len(self._key_ids)
+        return kid
+
+    def _buffer(self) -> list:
+        try:
+            return self._local.buf
+        except AttributeError:
+            buf = self._local.buf = []
+            self._local.thread = next(self._next_thread) & 0xFF
+            with self._lock:
+                self._buffers.append(buf)
+            return buf
+
+    def record(self, op: int, key: Any, tier: str, size: int, latency_ns: int, src: Optional[str] = None) -> None:
+        buf = self._buffer()
+        buf.append((time.time_ns(), latency_ns, NO_KEY if key is None else self.key_id(key), size, op,
+                    self._tier_index[tier], NO_TIER if src is None else self._tier_index[src],
+                    self._local.thread, 0))
+        if len(buf) >= self._block_records:
+            self._flush(buf)
+
+    def _segment(self, i: int) -> mmap.mmap:
+        if i < len(self._maps):
+            return self._maps[i]
+        with self._lock:
+            while len(self._maps) <= i:
+                n = len(self._maps)
+                self._file.truncate((n + 1) * SEGMENT_BYTES)
+                self._maps.append(mmap.mmap(self._file.fileno(), SEGMENT_BYTES, offset=n * SEGMENT_BYTES))
+            return self._maps[i]
+
+    def _flush(self, buf: list) -> None:
+        rows, buf[:] = buf[:], []
+        if not rows:
+            return
+        block = next(self._next_block)
+        seg, idx = divmod(block, self._blocks_per_segment)
+        start = idx * self._block_records * RECORD.itemsize
+        data = np.array(rows, dtype=RECORD).tobytes()
+        self._segment(seg)[start:start + len(data)] = data
+        self._blocks_used = max(self._blocks_used, block + 1)
+
+    def close(self) -> None:
+        """Flush all thread buffers (their threads must be done) and write the metadata."""
+        if self.closed:
+            return
+        self.closed = True
+        for buf in self._buffers:
+            self._flush(buf)
+        for m in self._maps:
+            m.flush()
+            m.close()
+        self._file.truncate(self._blocks_used * self._block_records * RECORD.itemsize)
+        self._file.close()
+        keys = [None] * len(self._key_ids)
+        for key, kid in self._key_ids.items():
+            keys[kid] = key
+        with open(self.path + ".json", "w") as f:
+            json.dump({"record_size": RECORD.itemsize, "ops": list(OPS), "tiers": self.tier_names,
+                       "keys": keys}, f)
+
+
+def _hashable(key: Any) -> Any:
+    """JSON turns tuple keys into lists; turn them back so they can index a structure."""
+    return tuple(_hashable(k) for k in key) if isinstance(key, list) else key
+
+
+class EventLog:
+    """A closed event log as time-ordered NumPy arrays (``log.t_ns``, ``log.tier``, ...)."""
+    def __init__(self, path: str):
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        if meta["record_size"] != RECORD.itemsize:
+            raise ValueError(f"{path}: record size {meta['record_size']}, expected {RECORD.itemsize}")
+        self.ops: List[str] = meta["ops"]
+        self.tier_names: List[str] = meta["tiers"]
+        self.keys: List[Any] = [_hashable(k) for k in meta["keys"]]
+        raw = np.memmap(path, dtype=RECORD, mode="r") if os.path.getsize(path) else np.zeros(0, RECORD)
+        valid = raw[raw["t_ns"] > 0]  # partial blocks leave zeroed rows
+        self.records = valid[np.argsort(valid["t_ns"], kind="stable")]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getattr__(self, field: str) -> np.ndarray:
+        if field in RECORD.names:
+            return self.records[field]
+        raise AttributeError(field)
+
+    def op_mask(self, name: str) -> np.ndarray:
+        return self.records["op"] == self.ops.index(name)
+
+    def tier_bytes(self, op: str) -> Dict[str, int]:
+        """Bytes per tier for one op type."""
+        rows = self.records[self.op_mask(op)]
+        counts = np.bincount(rows["tier"], weights=rows["size"], minlength=len(self.tier_names))
+        return {name: int(counts[i]) for i, name in enumerate(self.tier_names)}
+
+
+def replay(log: EventLog, sim, speed: Optional[float] = None) -> int:
+    """Re-issue the log's gets, puts and deletes against ``sim.ds``; returns ops replayed.
+
+    Puts write zero bytes of the recorded size. With ``speed`` the original
+    inter-arrival times are kept (2.0 = twice as fast); otherwise ops run
+    back to back. Migrations, compactions and scan requests are not
+    replayed: the simulator's own background thread and workloads make those.
+    Latencies are recorded in ``sim.metrics`` under the op names.
+    """
+    mask = np.isin(log.records["op"], [OP_GET, OP_PUT, OP_DELETE])
+    rows = log.records[mask]
+    if not len(rows):
+        return 0
+    ds = sim.ds
+    t0 = int(rows["t_ns"][0])
+    start = time.perf_counter_ns()
+    for t, op, kid, size in zip(rows["t_ns"].tolist(), rows["op"].tolist(), rows["key_id"].tolist(),
+                                rows["size"].tolist()):
+        if speed:
+            wait_ns = (t - t0) / speed - (time.perf_counter_ns() - start)
+            if wait_ns > 0:
+                time.sleep(wait_ns / 1e9)
+        key = log.keys[kid]
+        s = time.time_ns()
+        if op == OP_GET:
+            ds.get(key)
+        elif op == OP_PUT:
+            ds.put(key, bytes(size))
+        else:
+            ds.delete(key)
+        sim.metrics.record(OPS[op], s, time.time_ns())
+    return len(rows)
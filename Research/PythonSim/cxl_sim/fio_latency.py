@@ -0,0 +1,169 @@
+"""Device latency sampled from measured fio completion-latency percentiles.
+
+fio output is parsed with ``Project3/parse_results.py`` from the per-job
+``results/fio_*.txt`` files. The combined ``results/FIO_Benchmark.txt`` is
+only a fallback: it was run with group reporting, so its one results block
+aggregates every job. Each job side (read or write) with clat percentiles
+becomes a ``LatencyDistribution``. Its inverse CDF is
+interpolated in log-latency between the measured percentiles and
+tabulated on a uniform quantile grid, so sampling costs one ``random()``
+and one list index.
+
+A tier opts in with ``TierConfig.latency_profile``: ``"fio"`` for the
+Project 3 NVMe results, or a path to another directory (or file) of fio
+text output, e.g. measurements of an HDD. Each access picks the
+distribution that matches its direction and is nearest in block size, then
+in queue depth: the tier's accesses in progress, or
+``TierConfig.latency_iodepth`` if set. Random-access jobs are preferred over
+sequential ones. ``default_tier_configs()`` gives the SSD tier the ``"fio"``
+profile whenever the Project 3 results are present.
+"""
+import importlib.util
+import math
+import pathlib
+import random
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .calibration import REPO_ROOT
+
+PROJECT3 = REPO_ROOT / "Project3"
+PARSE_SCRIPT = PROJECT3 / "parse_results.py"
+TABLE_SIZE = 4096
+
+_PERCENTILE_KEY = re.compile(r"^\d+\.\d\d$")
+_READ_MODES = ("read", "randread")
+_WRITE_MODES = ("write", "randwrite")
+
+
+def _parse_module():
+    spec = importlib.util.spec_from_file_location("parse_results", PARSE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def parse_block_size(bs: Optional[str]) -> Optional[int]:
+    """fio block size strings ('4096B', '16.0KiB', '128k', '1MiB') in bytes."""
+    if not bs:
+        return None
+    m = re.match(r"^([\d.]+)\s*([kKmMgG]?)(i?[bB])?$", bs.strip())
+    if not m:
+        return None
+    scale = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}[m.group(2).lower()]
+    return int(float(m.group(1)) * scale)
+
+
+class LatencyDistribution:
+    def __init__(self, percentiles_usec: Dict[str, float], write: bool, mode: str,
+                 block_size: int, iodepth: int, job: str = "", table_size: int = TABLE_SIZE):
+        self.write = write
+        self.mode = mode
+        self.block_size = block_size
+        self.iodepth = iodepth
+        self.job = job
+        pts = sorted((float(p) / 100.0, v * 1000.0) for p, v in percentiles_usec.items()
+                     if _PERCENTILE_KEY.match(p) and v > 0)
+        if not pts:
+            raise ValueError(f"No clat percentiles for {job or mode}")
+        qs = np.array([0.0] + [q for q, _ in pts] + [1.0])
+        log_ns = np.log([pts[0][1]] + [v for _, v in pts] + [pts[-1][1]])
+        grid = (np.arange(table_size) + 0.5) / table_size
+        self.table: List[int] = np.exp(np.interp(grid, qs, log_ns)).astype(np.int64).tolist()
+        self.mean_ns = int(np.mean(self.table))
+
+    @property
+    def random_access(self) -> bool:
+        return self.mode.startswith("rand")
+
+    def quantile_ns(self, q: float) -> int:
+        return self.table[min(int(q * len(self.table)), len(self.table) - 1)]
+
+    def sample_ns(self) -> int:
+        return self.table[int(random.random() * len(self.table))]
+
+
+def distributions_from_jobs(jobs) -> List[LatencyDistribution]:
+    dists = []
+    for name, job in jobs.items():
+        bs = parse_block_size(job.bs)
+        if not job.mode or bs is None:
+            continue
+        sides = []
+        if job.mode in _READ_MODES:
+            sides.append((False, job.read.percentiles_usec))
+        elif job.mode in _WRITE_MODES:
+            # parse_fio files the first percentile block under .read, which for
+            # write-only jobs holds the write latencies
+            sides.append((True, job.write.percentiles_usec or job.read.percentiles_usec))
+        else:
+            sides += [(False, job.read.percentiles_usec), (True, job.write.percentiles_usec)]
+        for write, pct in sides:
+            if pct:
+                dists.append(LatencyDistribution(pct, write, job.mode, bs, job.iodepth or 1, job=name))
+    return dists
+
+def result_files(source=None) -> List[pathlib.Path]:
+    """The fio output files ``load_jobs(source)`` reads."""
+    path = pathlib.Path(source) if source is not None else PROJECT3 / "results"
+    if path.is_file():
+        return [path]
+    return sorted(path.glob("fio_*.txt")) or [path / "FIO_Benchmark.txt"]
+
+def load_jobs(source=None) -> dict:
+    """Parsed fio jobs from a results directory or a single output file."""
+    parse = _parse_module()
+    jobs = {}
+    for f in result_files(source):
+        jobs.update(parse.parse_fio(str(f)))
+    return jobs
+
+
+class FioLatencyModel:
+    def __init__(self, dists: List[LatencyDistribution], iodepth: int = 1):
+        if not dists:
+            raise ValueError("No fio latency distributions")
+        self.dists = dists
+        self.iodepth = iodepth
+        self._lookup: Dict[tuple, LatencyDistribution] = {}
+
+    @classmethod
+    def from_results(cls, source=None, iodepth: int = 1) -> "FioLatencyModel":
+        return cls(distributions_from_jobs(load_jobs(source)), iodepth=iodepth)
+
+    def lookup(self, nbytes: int, write: bool, iodepth: Optional[int] = None) -> LatencyDistribution:
+        size_class = max(nbytes, 1).bit_length()
+        qd = max(iodepth or self.iodepth, 1)
+        key = (size_class, write, qd)
+        dist = self._lookup.get(key)
+        if dist is None:
+            same_dir = [d for d in self.dists if d.write == write] or self.dists
+            dist = min(same_dir, key=lambda d: (
+                abs(math.log2(d.block_size) - (size_class - 1)),
+                abs(math.log2(d.iodepth) - math.log2(qd)),
+                not d.random_access,
+            ))
+            self._lookup[key] = dist
+        return dist
+
+
+_MODELS: Dict[tuple, FioLatencyModel] = {}
+
+def profile_available(profile: Optional[str]) -> bool:
+    """Whether ``profile`` names fio output that exists (``"fio"``: the Project 3 results)."""
+    if not profile:
+        return False
+    path = PROJECT3 / "results" if profile == "fio" else pathlib.Path(profile)
+    if path.is_file():
+        return True
+    return any(path.glob("fio_*.txt")) or (path / "FIO_Benchmark.txt").exists()
+
+def model_for(profile: Optional[str], iodepth: int = 1) -> Optional[FioLatencyModel]:
+    """Shared model for a ``TierConfig.latency_profile`` (parsed once per process)."""
+    if not profile:
+        return None
+    key = (profile, iodepth)
+    if key not in _MODELS:
+        _MODELS[key] = FioLatencyModel.from_results(None if profile == "fio" else profile, iodepth=iodepth)
+    return _MODELS[key]
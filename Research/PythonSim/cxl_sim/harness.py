@@ -0,0 +1,172 @@
+"""Repeated-run benchmark harness with confidence intervals and baseline comparison.
+
+Each scenario is re-run (with a different seed per repetition) until the
+bootstrap confidence interval of the median of every tracked metric is within
+``rel_ci`` of the median, or ``max_reps`` is reached. Results can be compared
+to a stored baseline JSON; a metric regresses when its median is worse than
+the baseline median by more than ``threshold`` (relative) and the two
+confidence intervals do not overlap. Metrics in the baseline that the
+current run no longer reports are listed as missing.
+"""
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .sweep import resolve, run_point
+
+# Same scenarios as run_benchmarks.py
+SCENARIOS = {
+    "baseline_dram_only": {"workload": "tiered_baseline", "workload.n_ops": 500, "workload.payload_size": 2048},
+    "tiered_sequential": {"workload": "sequential", "workload.n_ops": 500, "workload.payload_size": 2048,
+                          "workload.read_ratio": 0.7},
+    "tiered_random": {"workload": "random", "workload.n_ops": 500, "workload.payload_size": 2048,
+                      "workload.key_space": 100, "workload.read_ratio": 0.5},
+    "tiered_hotspot": {"workload": "hotspot", "workload.n_ops": 500, "workload.payload_size": 2048,
+                       "workload.hotspot_fraction": 0.2, "workload.read_ratio": 0.8},
+    "tiered_large_payload": {"workload": "random", "workload.n_ops": 300, "workload.payload_size": 8192,
+                             "workload.key_space": 50, "workload.read_ratio": 0.6},
+    "tiered_random_writeback": {"workload": "random", "workload.n_ops": 500, "workload.payload_size": 2048,
+                                "workload.key_space": 100, "workload.read_ratio": 0.5,
+                                "write_buffer.capacity_bytes": 256 * 1024,
+                                "write_buffer.flush_batch_bytes": 64 * 1024},
+}
+LATENCY_FIELDS = ("mean_ns", "median_ns", "p95_ns", "p99_ns")
+
+
+def flatten_metrics(summary: dict) -> Dict[str, float]:
+    """Pick the tracked metrics out of one run summary: throughput and per-op percentiles."""
+    out = {"throughput_ops_s": float(summary.get("throughput_ops_s", 0.0))}
+    for op_name, stats in summary.items():
+        if isinstance(stats, dict) and "count" in stats:
+            for field in LATENCY_FIELDS:
+                out[f"{op_name}.{field}"] = float(stats[field])
+    return out
+
+def higher_is_better(metric: str) -> bool:
+    return metric == "throughput_ops_s"
+
+def bootstrap_median_ci(samples, confidence: float = 0.95, n_boot: int = 2000, seed: int = 0):
+    arr = np.asarray(samples, dtype=float)
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, arr.size, size=(n_boot, arr.size))
+    medians = np.median(arr[idx], axis=1)
+    alpha = (1.0 - confidence) / 2
+    return float(np.quantile(medians, alpha)), float(np.quantile(medians, 1 - alpha))
+
+def summarize(samples: Dict[str, List[float]], confidence: float = 0.95) -> Dict[str, dict]:
+    out = {}
+    for metric, values in samples.items():
+        lo, hi = bootstrap_median_ci(values, confidence)
+        out[metric] = {"median": float(np.median(values)), "ci_low": lo, "ci_high": hi, "n": len(values)}
+    return out
+
+def converged(stats: Dict[str, dict], rel_ci: float) -> bool:
+    for s in stats.values():
+        half_width = (s["ci_high"] - s["ci_low"]) / 2
+        if s["median"] and half_width > rel_ci * abs(s["median"]):
+            return False
+    return True
+
+
+def run_scenario(params: dict, min_reps: int = 5, max_reps: int = 30, rel_ci: float = 0.05,
+                 confidence: float = 0.95, verbose: bool = True) -> Dict[str, dict]:
+    samples: Dict[str, List[float]] = {}
+    stats = {}
+    for rep in range(max_reps):
+        result = run_point(resolve({**params, "seed": rep}))
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        for metric, value in flatten_metrics(result).items():
+            samples.setdefault(metric, []).append(value)
+        # Ops that did not occur in every repetition cannot be compared; drop them
+        n = rep + 1
+        samples = {m: v for m, v in samples.items() if len(v) == n}
+        if n >= min_reps:
+            stats = summarize(samples, confidence)
+            if converged(stats, rel_ci):
+                break
+    if verbose:
+        print(f"  {stats.get('throughput_ops_s', {}).get('n', 0)} repetitions")
+    return stats
+
+def run_suite(scenarios: Optional[Dict[str, dict]] = None, **kwargs) -> Dict[str, Dict[str, dict]]:
+    scenarios = scenarios or SCENARIOS
+    results = {}
+    for i, (name, params) in enumerate(scenarios.items(), 1):
+        print(f"[{i}/{len(scenarios)}] {name}...")
+        results[name] = run_scenario(params, **kwargs)
+    return results
+
+
+def separated(cur: dict, base: dict, metric: str) -> bool:
+    """Whether the current CI lies entirely on the worse side of the baseline CI."""
+    if higher_is_better(metric):
+        return cur["ci_high"] < base["ci_low"]
+    return cur["ci_low"] > base["ci_high"]
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> List[dict]:
+    """Diff every metric of the scenarios run against the baseline.
+
+    ``regressed`` needs a median worse by more than ``threshold`` and
+    non-overlapping CIs. Baseline metrics absent from the current run get a
+    row with ``missing`` set.
+    """
+    rows = []
+    for scenario, metrics in current.items():
+        base_metrics = baseline.get(scenario, {})
+        for metric, cur in metrics.items():
+            base = base_metrics.get(metric)
+            if base is None or not base["median"]:
+                continue
+            change = (cur["median"] - base["median"]) / abs(base["median"])
+            worse = -change if higher_is_better(metric) else change
+            rows.append({
+                "scenario": scenario,
+                "metric": metric,
+                "baseline": base["median"],
+                "current": cur["median"],
+                "baseline_ci": (base["ci_low"], base["ci_high"]),
+                "ci": (cur["ci_low"], cur["ci_high"]),
+                "change": change,
+                "regressed": worse > threshold and separated(cur, base, metric),
+                "missing": False,
+            })
+        for metric, base in base_metrics.items():
+            if metric not in metrics:
+                rows.append({
+                    "scenario": scenario,
+                    "metric": metric,
+                    "baseline": base["median"],
+                    "current": None,
+                    "baseline_ci": (base["ci_low"], base["ci_high"]),
+                    "ci": None,
+                    "change": None,
+                    "regressed": False,
+                    "missing": True,
+                })
+    return rows
+
+def format_diff(rows: List[dict], only_regressions: bool = False) -> str:
+    lines = [f"{'scenario':<24} {'metric':<26} {'baseline':>14} {'current':>14} {'change':>8}  "
+             f"{'baseline CI':<24} current CI"]
+    for r in rows:
+        if only_regressions and not r["regressed"]:
+            continue
+        base_ci = f"[{r['baseline_ci'][0]:.1f}, {r['baseline_ci'][1]:.1f}]"
+        if r["missing"]:
+            lines.append(f"{r['scenario']:<24} {r['metric']:<26} {r['baseline']:>14.1f} {'-':>14} {'-':>8}  "
+                         f"{base_ci:<24} -  MISSING")
+            continue
+        flag = "  REGRESSION" if r["regressed"] else ""
+        lines.append(f"{r['scenario']:<24} {r['metric']:<26} {r['baseline']:>14.1f} {r['current']:>14.1f} "
+                     f"{r['change'] * 100:>+7.1f}%  {base_ci:<24} [{r['ci'][0]:.1f}, {r['ci'][1]:.1f}]{flag}")
+    return "\n".join(lines)
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def save(results: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
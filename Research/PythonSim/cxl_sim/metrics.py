@@ -10,10 +10,25 @@ class Metrics:
         self.compression_savings = defaultdict(float)
         self.cost_per_operation = defaultdict(float)
         self.migration_overhead_ns = 0
+        self.migration_bytes = defaultdict(int)  # "src->dst" -> bytes moved
+        self.migration_objects = 0
+        self.migration_batches = 0
+        self.migration_throttle_ns = 0
+        self.migration_commits = 0
+        self.migration_aborts = 0
+        self.migration_pause_ns = []  # time each commit held the structure's lock
+        self.compaction_bytes = defaultdict(int)
+        self.compaction_ns = 0
+        self.scan_keys = 0
+        self.scan_bytes = 0
+        self.scan_requests = 0
+        self.timeseries = None  # optional TimeSeries of per-window stats
     
     def record(self, name: str, start_ns: int, end_ns: int):
         self.latencies_ns[name].append(end_ns - start_ns)
         self.counts[name] += 1
+        if self.timeseries is not None:
+            self.timeseries.record(name, end_ns, end_ns - start_ns)
     
     def record_tier_access(self, tier_name: str, bytes_accessed: int):
         self.tier_utilization[tier_name] += bytes_accessed
@@ -24,6 +39,51 @@ class Metrics:
     def record_migration_overhead(self, ns: int):
         self.migration_overhead_ns += ns
     
+    def record_migration(self, src: str, dst: str, nbytes: int, n_objects: int, throttle_ns: int = 0):
+        self.migration_bytes[f"{src}->{dst}"] += nbytes
+        self.migration_objects += n_objects
+        self.migration_batches += 1
+        self.migration_throttle_ns += throttle_ns
+        self.tier_utilization[src] += nbytes
+        self.tier_utilization[dst] += nbytes
+        if self.timeseries is not None:
+            self.timeseries.record_migration(nbytes, n_objects)
+    
+    def record_migration_commit(self, pause_ns: int, committed: bool):
+        self.migration_pause_ns.append(pause_ns)
+        if committed:
+            self.migration_commits += 1
+        else:
+            self.migration_aborts += 1
+    
+    def record_compaction(self, tier_name: str, nbytes: int, ns: int):
+        self.compaction_bytes[tier_name] += nbytes
+        self.compaction_ns += ns
+        if self.timeseries is not None:
+            self.timeseries.record_compaction(nbytes)
+    
+    def record_scan(self, n_keys: int, nbytes: int, n_requests: int):
+        self.scan_keys += n_keys
+        self.scan_bytes += nbytes
+        self.scan_requests += n_requests
+    
+    def merge(self, other: "Metrics") -> None:
+        """Add another instance's samples and counters (e.g. from a worker process)."""
+        for name, lats in other.latencies_ns.items():
+            self.latencies_ns[name].extend(lats)
+        for mine, theirs in ((self.counts, other.counts), (self.tier_utilization, other.tier_utilization),
+                             (self.compression_savings, other.compression_savings),
+                             (self.cost_per_operation, other.cost_per_operation),
+                             (self.migration_bytes, other.migration_bytes),
+                             (self.compaction_bytes, other.compaction_bytes)):
+            for k, v in theirs.items():
+                mine[k] += v
+        for attr in ("migration_overhead_ns", "migration_objects", "migration_batches", "migration_throttle_ns",
+                     "migration_commits", "migration_aborts", "compaction_ns", "scan_keys", "scan_bytes",
+                     "scan_requests"):
+            setattr(self, attr, getattr(self, attr) + getattr(other, attr))
+        self.migration_pause_ns.extend(other.migration_pause_ns)
+    
     def percentile(self, lst, p):
         """Calculate p-th percentile (0-100)."""
         if not lst:
@@ -49,4 +109,27 @@ class Metrics:
         result["tier_utilization_bytes"] = dict(self.tier_utilization)
         result["compression_savings_bytes"] = dict(self.compression_savings)
         result["migration_overhead_ns"] = self.migration_overhead_ns
+        attempts = self.migration_commits + self.migration_aborts
+        result["migration"] = {
+            "objects": self.migration_objects,
+            "batches": self.migration_batches,
+            "bytes": dict(self.migration_bytes),
+            "throttle_ns": self.migration_throttle_ns,
+            "commits": self.migration_commits,
+            "aborts": self.migration_aborts,
+            "abort_rate": self.migration_aborts / attempts if attempts else 0.0,
+            "pause_p50_ns": int(self.percentile(self.migration_pause_ns, 50)),
+            "pause_p99_ns": int(self.percentile(self.migration_pause_ns, 99)),
+            "pause_max_ns": max(self.migration_pause_ns, default=0),
+        }
+        result["compaction"] = {"bytes": dict(self.compaction_bytes), "ns": self.compaction_ns}
+        if self.scan_keys:
+            scan_s = sum(self.latencies_ns.get("scan", ())) / 1e9
+            result["scan_throughput"] = {
+                "keys": self.scan_keys,
+                "bytes": self.scan_bytes,
+                "requests": self.scan_requests,
+                "keys_per_s": self.scan_keys / scan_s if scan_s else 0.0,
+                "bytes_per_s": self.scan_bytes / scan_s if scan_s else 0.0,
+            }
         return result
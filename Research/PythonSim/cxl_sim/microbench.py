@@ -0,0 +1,135 @@
+"""Microbenchmarks for the simulator's own Python overhead.
+
+Every tier is configured with zero latency and no bandwidth term, so timings
+measure only the engine: ``TieredHashMap.put``/``get`` (including lock and
+``ObjectStats`` handling), ``HotWarmColdPolicy.choose_tier``,
+``Metrics.record`` and one background-migration scan.
+
+Allocation figures come from a separate pass with GC disabled:
+``allocs_per_op`` is the net change in ``sys.getallocatedblocks()`` (blocks
+still alive after the op) and ``peak_bytes_per_op`` is the tracemalloc peak
+over the pass, which also covers short-lived temporaries.
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+from typing import Callable, Dict, List
+
+from .tiers import Tier, TierConfig, default_tier_configs
+
+COMPONENTS = ("put", "get", "policy", "metrics_record", "migration_scan")
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def zero_latency_tier_configs() -> Dict[str, TierConfig]:
+    return {
+        name: replace(cfg, base_latency_ns=0, bandwidth_bytes_per_s=0,
+                      decompress_latency_ns=0, compress_latency_ns=0, latency_profile=None)
+        for name, cfg in default_tier_configs().items()
+    }
+
+def zero_latency_tiers() -> Dict[str, Tier]:
+    return {name: Tier(cfg) for name, cfg in zero_latency_tier_configs().items()}
+
+def _measure(run: Callable[[], None], n_ops: int) -> dict:
+    start = time.perf_counter_ns()
+    run()
+    elapsed = time.perf_counter_ns() - start
+    return {"ns_per_op": elapsed / n_ops}
+
+def _measure_allocs(run: Callable[[], None], n_ops: int) -> dict:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks_after = sys.getallocatedblocks()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"allocs_per_op": (blocks_after - blocks_before) / n_ops,
+            "peak_bytes_per_op": (peak - base) / n_ops}
+
+
+def bench_size(n_keys: int, max_ops: int = 200_000, alloc_ops: int = 10_000,
+               payload_size: int = 64, seed: int = 0) -> List[dict]:
+    """Benchmark every component against a map pre-filled with ``n_keys`` keys."""
+    from .simulator import Simulator
+    rng = random.Random(seed)
+    sim = Simulator(tiers=zero_latency_tiers())
+    ds = sim.ds
+    value = bytes(payload_size)
+    keys = [f"k{i}" for i in range(n_keys)]
+    for k in keys:
+        ds.put(k, value)
+    n_ops = min(n_keys, max_ops)
+    sample = [keys[rng.randrange(n_keys)] for _ in range(n_ops)]
+    alloc_sample = sample[:min(n_ops, alloc_ops)]
+
+    def put_loop(ks):
+        put = ds.put
+        for k in ks:
+            put(k, value)
+
+    def get_loop(ks):
+        get = ds.get
+        for k in ks:
+            get(k)
+
+    stats_all = [ds._meta[k] for k in sample]
+    choose = sim.policy.choose_tier
+
+    def policy_loop(stats_list):
+        for st in stats_list:
+            choose(st)
+
+    def record_loop(ks):
+        record = sim.metrics.record
+        for _ in ks:
+            record("get", 0, 100)
+
+    loops = {
+        "put": (put_loop, sample, alloc_sample),
+        "get": (get_loop, sample, alloc_sample),
+        "policy": (policy_loop, stats_all, stats_all[:len(alloc_sample)]),
+        "metrics_record": (record_loop, sample, alloc_sample),
+    }
+    rows = []
+    for component, (loop, timed_args, alloc_args) in loops.items():
+        row = {"component": component, "keys": n_keys, "ops": len(timed_args)}
+        row.update(_measure(lambda: loop(timed_args), len(timed_args)))
+        row.update(_measure_allocs(lambda: loop(alloc_args), len(alloc_args)))
+        rows.append(row)
+
+    # Migration scan: make ~10% of keys hot so the pass performs real moves;
+    # reported per key scanned
+    for k in keys[::10]:
+        ds._meta[k].access_count = sim.policy.hot_threshold
+    row = {"component": "migration_scan", "keys": n_keys, "ops": n_keys}
+    row.update(_measure(sim._migration_pass, n_keys))
+    for k in keys[1::10]:
+        ds._meta[k].access_count = sim.policy.hot_threshold
+    row.update(_measure_allocs(sim._migration_pass, n_keys))
+    rows.append(row)
+    return rows
+
+def run(sizes=DEFAULT_SIZES, **kwargs) -> List[dict]:
+    rows = []
+    for n_keys in sizes:
+        rows.extend(bench_size(n_keys, **kwargs))
+        gc.collect()
+    return rows
+
+def format_table(rows: List[dict]) -> str:
+    lines = [f"{'component':<16} {'keys':>10} {'ops':>8} {'ns/op':>10} {'net allocs/op':>14} {'peak B/op':>10}"]
+    for r in rows:
+        lines.append(f"{r['component']:<16} {r['keys']:>10,} {r['ops']:>8,} {r['ns_per_op']:>10.1f} "
+                     f"{r['allocs_per_op']:>14.2f} {r['peak_bytes_per_op']:>10.1f}")
+    return "\n".join(lines)
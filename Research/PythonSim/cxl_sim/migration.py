@@ -0,0 +1,132 @@
+"""Charged, rate-limited and batched background migration.
+
+Each migration pass collects the objects whose policy tier differs from
+their current tier and plans them as batches:
+
+- candidates are ranked by expected benefit per byte moved,
+  ``access_count * |latency(src) - latency(dst)| / size``;
+- candidates with the same (source, destination) pair are grouped, in rank
+  order, into batches of up to ``batch_bytes``;
+- each batch is charged as one read on the source tier and one write on the
+  destination tier, so migration competes with client accesses for the
+  tiers' bandwidth (see ``Tier.access``);
+- a token bucket caps migration traffic at ``rate_limit_bytes_per_s`` or at
+  ``bandwidth_share`` of the slower tier of each batch.
+
+Objects move with an optimistic copy-then-commit protocol. The value and
+its version are read, the copy is charged while readers keep being served
+from the old tier, and the mapping is switched under the structure's lock
+only if the version is unchanged. A concurrent ``put`` bumps the version, so
+the commit aborts instead of overwriting the new value; aborted objects are
+re-copied up to ``max_retries`` times.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .tiers import Tier
+
+
+@dataclass
+class MigrationConfig:
+    rate_limit_bytes_per_s: Optional[float] = None  # absolute cap on migration traffic
+    bandwidth_share: Optional[float] = None         # cap as a fraction of the slower tier's bandwidth
+    batch_bytes: int = 1024 * 1024
+    max_bytes_per_pass: Optional[int] = None        # skip the lowest-benefit moves beyond this
+    max_retries: int = 1                            # re-copies of objects whose commit was aborted
+
+
+@dataclass
+class Batch:
+    src: str
+    dst: str
+    items: List[Tuple[object, int]] = field(default_factory=list)  # (key, size)
+    nbytes: int = 0
+
+
+class TokenBucket:
+    """Byte-rate limiter; ``acquire`` blocks until the bytes are available."""
+    def __init__(self, rate_bytes_per_s: float, burst_bytes: float):
+        self.rate = float(rate_bytes_per_s)
+        self.burst = float(burst_bytes)
+        self._tokens = self.burst
+        self._last = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def acquire(self, nbytes: int) -> float:
+        """Take ``nbytes`` tokens; returns the seconds spent waiting.
+
+        Requests larger than the burst are allowed but leave the bucket in
+        debt, which later calls pay back.
+        """
+        with self._lock:
+            now = time.perf_counter()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class MigrationPlanner:
+    def __init__(self, tiers: Dict[str, Tier], cfg: Optional[MigrationConfig] = None):
+        self.tiers = tiers
+        self.cfg = cfg or MigrationConfig()
+        self._buckets: Dict[float, TokenBucket] = {}
+
+    def benefit_per_byte(self, access_count: int, size: int, src: str, dst: str) -> float:
+        gain = abs(self.tiers[src].latency_ns(size) - self.tiers[dst].latency_ns(size))
+        return access_count * gain / max(size, 1)
+
+    def plan(self, candidates) -> List[Batch]:
+        """Group ``(key, src, dst, size, access_count)`` candidates into batches, best first."""
+        ranked = sorted(
+            ((self.benefit_per_byte(count, size, src, dst), key, src, dst, size)
+             for key, src, dst, size, count in candidates),
+            key=lambda c: c[0], reverse=True)
+        budget = self.cfg.max_bytes_per_pass
+        open_batches: Dict[Tuple[str, str], Batch] = {}
+        batches = []
+        for benefit, key, src, dst, size in ranked:
+            if budget is not None:
+                if size > budget:
+                    break
+                budget -= size
+            batch = open_batches.get((src, dst))
+            if batch is None or (batch.items and batch.nbytes + size > self.cfg.batch_bytes):
+                batch = Batch(src, dst)
+                open_batches[(src, dst)] = batch
+                batches.append(batch)
+            batch.items.append((key, size))
+            batch.nbytes += size
+        # Batches were opened in order of their best candidate
+        return batches
+
+    def rate_for(self, batch: Batch) -> Optional[float]:
+        rates = []
+        if self.cfg.rate_limit_bytes_per_s:
+            rates.append(self.cfg.rate_limit_bytes_per_s)
+        if self.cfg.bandwidth_share:
+            bws = [self.tiers[t].cfg.bandwidth_bytes_per_s for t in (batch.src, batch.dst)]
+            bws = [bw for bw in bws if bw > 0]
+            if bws:
+                rates.append(self.cfg.bandwidth_share * min(bws))
+        return min(rates) if rates else None
+
+    def throttle(self, batch: Batch) -> float:
+        """Wait for the rate limit to admit ``batch``; returns seconds waited."""
+        rate = self.rate_for(batch)
+        if rate is None:
+            return 0.0
+        bucket = self._buckets.get(rate)
+        if bucket is None:
+            bucket = self._buckets[rate] = TokenBucket(rate, burst_bytes=self.cfg.batch_bytes)
+        return bucket.acquire(batch.nbytes)
+
+    def charge(self, batch: Batch, nbytes: int) -> int:
+        """Read the batch from the source and write it to the destination; returns ns charged."""
+        return (self.tiers[batch.src].access(nbytes, write=False)
+                + self.tiers[batch.dst].access(nbytes, write=True))
@@ -0,0 +1,410 @@
+"""Multi-process clients over a shared-memory index and shared tier state.
+
+Threads in one ``Simulator`` serialize on the GIL, so they cannot show
+whether a design scales across cores. Here every client is a process:
+
+- the index is a ``SharedHashMap``: fixed-size slots (state, tier, value
+  length, version, access count, encoded key) plus a value arena, both in
+  one ``multiprocessing.shared_memory`` block. It is split into segments,
+  each an open-addressing table with its own cross-process lock, so clients
+  only contend on keys that hash to the same segment;
+- each tier's used/dead bytes and channel busy-until time live in a second
+  block as int64 counters, guarded by one cross-process lock per tier
+  (``SharedTier``), so capacity accounting and queueing are global.
+
+Workers run the usual ``Simulator.workload_*`` methods with their own
+``Metrics``; the parent merges them into one summary and reports throughput
+over the wall time from a common start barrier to the last worker finishing.
+Background migration, compaction passes, replication and the write-back
+buffer are not modelled here (in either mode); a tier still compacts
+synchronously when only dead space blocks a ``place``.
+"""
+import multiprocessing as mp
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .metrics import Metrics
+from .policies import HotWarmColdPolicy, ObjectStats
+from .snapshot import _encode_key, _key_hash
+from .tiers import Tier, TierConfig, default_tier_configs
+
+_EMPTY, _LIVE, _DELETED = 0, 1, 2
+_MISSING = object()
+
+
+@dataclass
+class SharedLayout:
+    capacity: int = 1 << 15  # slots over all segments
+    segments: int = 64
+    key_bytes: int = 32      # longest encoded key (see snapshot._encode_key)
+    value_bytes: int = 4096  # largest value
+
+
+def _slot_dtype(key_bytes: int) -> np.dtype:
+    return np.dtype([("state", np.int8), ("tier", np.int8), ("length", np.int32),
+                     ("version", np.int64), ("access_count", np.int64), ("key", f"S{key_bytes}")], align=True)
+
+
+class SharedState:
+    """Shared-memory blocks and locks; created by the parent, attached by each worker."""
+    def __init__(self, tier_configs: Dict[str, TierConfig], layout: Optional[SharedLayout] = None, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.layout = layout or SharedLayout()
+        if self.layout.capacity % self.layout.segments:
+            raise ValueError("capacity must be a multiple of segments")
+        self.tier_configs = dict(tier_configs)
+        slot_dtype = _slot_dtype(self.layout.key_bytes)
+        index_size = self.layout.capacity * (slot_dtype.itemsize + self.layout.value_bytes)
+        self._index_shm = shared_memory.SharedMemory(create=True, size=index_size)
+        self._tier_shm = shared_memory.SharedMemory(create=True, size=len(self.tier_configs) * 3 * 8)
+        self.index_name = self._index_shm.name
+        self.tier_name = self._tier_shm.name
+        self.segment_locks = [ctx.Lock() for _ in range(self.layout.segments)]
+        self.tier_locks = [ctx.Lock() for _ in self.tier_configs]
+        self._views()
+        self.slots[:] = np.zeros(1, dtype=slot_dtype)
+        self.counters[:] = 0
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in ("_index_shm", "_tier_shm", "slots", "values", "counters"):
+            state.pop(name, None)
+        return state
+
+    def _views(self) -> None:
+        slot_dtype = _slot_dtype(self.layout.key_bytes)
+        n = self.layout.capacity
+        buf = self._index_shm.buf
+        self.slots = np.ndarray((n,), dtype=slot_dtype, buffer=buf)
+        self.values = np.ndarray((n, self.layout.value_bytes), dtype=np.uint8, buffer=buf,
+                                 offset=n * slot_dtype.itemsize)
+        self.counters = np.ndarray((len(self.tier_configs), 3), dtype=np.int64, buffer=self._tier_shm.buf)
+
+    def attach(self) -> None:
+        self._index_shm = shared_memory.SharedMemory(name=self.index_name)
+        self._tier_shm = shared_memory.SharedMemory(name=self.tier_name)
+        self._views()
+
+    def tiers(self) -> Dict[str, "SharedTier"]:
+        return {name: SharedTier(cfg, self.counters[i], self.tier_locks[i])
+                for i, (name, cfg) in enumerate(self.tier_configs.items())}
+
+    def close(self) -> None:
+        # Views must go before the mappings can be closed
+        self.slots = self.values = self.counters = None
+        self._index_shm.close()
+        self._tier_shm.close()
+
+    def unlink(self) -> None:
+        self._index_shm.unlink()
+        self._tier_shm.unlink()
+
+
+class SharedTier(Tier):
+    """Tier whose used/dead/busy-until counters live in shared memory.
+
+    ``Tier``'s methods run unchanged: they update the counters under
+    ``self._lock``, which here is a cross-process lock.
+    """
+    def __init__(self, cfg: TierConfig, counters: np.ndarray, lock):
+        # Tier.__init__ would zero the shared counters, so set up fields directly
+        self.cfg = cfg
+        self._lock = lock
+        self._counters = counters  # [used, dead, busy_until_ns]
+        self._window_start_ns = time.perf_counter_ns()
+        self._window_bytes = 0
+        self.offered_bw = 0.0  # per process
+        self._inflight = 0  # per process: queue depth seen by a measured latency model
+        self.latency_model = None
+        if cfg.latency_profile:
+            from .fio_latency import model_for
+            self.latency_model = model_for(cfg.latency_profile)
+
+    @property
+    def _used(self) -> int:
+        return int(self._counters[0])
+
+    @_used.setter
+    def _used(self, value: int) -> None:
+        self._counters[0] = value
+
+    @property
+    def _dead(self) -> int:
+        return int(self._counters[1])
+
+    @_dead.setter
+    def _dead(self, value: int) -> None:
+        self._counters[1] = value
+
+    @property
+    def _busy_until_ns(self) -> int:
+        return int(self._counters[2])
+
+    @_busy_until_ns.setter
+    def _busy_until_ns(self, value: int) -> None:
+        self._counters[2] = value
+
+
+class SharedHashMap:
+    """``TieredHashMap`` interface over a ``SharedState`` index."""
+    def __init__(self, state: SharedState, tiers, policy):
+        self._slots = state.slots
+        self._values = state.values
+        self._locks = state.segment_locks
+        self._layout = state.layout
+        self._seg_size = state.layout.capacity // state.layout.segments
+        self._tiers = tiers
+        self._policy = policy
+        self._tier_names = list(state.tier_configs)
+        self._tier_index = {name: i for i, name in enumerate(self._tier_names)}
+
+    def _key(self, key: Any) -> bytes:
+        raw = _encode_key(key)
+        if len(raw) > self._layout.key_bytes:
+            raise ValueError(f"Key {key!r} longer than {self._layout.key_bytes} bytes encoded")
+        return raw
+
+    def _find(self, raw: bytes, h: int, insert: bool = False) -> int:
+        """Slot of ``raw`` (or, if ``insert``, a free slot for it); -1 if none. Caller holds the segment lock."""
+        base = (h % self._layout.segments) * self._seg_size
+        start = h // self._layout.segments
+        free = -1
+        for i in range(self._seg_size):
+            pos = base + (start + i) % self._seg_size
+            slot = self._slots[pos]
+            state = slot["state"]
+            if state == _EMPTY:
+                return (pos if free < 0 else free) if insert else -1
+            if state == _DELETED:
+                if free < 0:
+                    free = pos
+            elif slot["key"] == raw:
+                return pos
+        return free if insert else -1
+
+    def put(self, key: Any, value: bytes):
+        raw = self._key(key)
+        size = len(value)
+        if size > self._layout.value_bytes:
+            raise ValueError(f"Value of {size} bytes exceeds the {self._layout.value_bytes}-byte slot")
+        h = _key_hash(raw)
+        lock = self._locks[h % self._layout.segments]
+        with lock:
+            pos = self._find(raw, h)
+            count = int(self._slots[pos]["access_count"]) if pos >= 0 else 0
+        tier_name = self._policy.choose_tier(ObjectStats(bytes_size=size, access_count=count, last_latency_ns=0))
+        tier = self._tiers[tier_name]
+        tier.place(size)
+        tier.access(size, write=True)
+        with lock:
+            pos = self._find(raw, h, insert=True)
+            if pos < 0:
+                tier.remove(size)
+                raise MemoryError("SharedHashMap segment full")
+            slot = self._slots[pos]
+            old = (int(slot["tier"]), int(slot["length"])) if slot["state"] == _LIVE else None
+            if old is None:
+                slot["key"] = raw
+                slot["access_count"] = 0
+            slot["state"] = _LIVE
+            slot["tier"] = self._tier_index[tier_name]
+            slot["length"] = size
+            slot["version"] += 1
+            slot["access_count"] += 1
+            self._values[pos, :size] = np.frombuffer(value, dtype=np.uint8)
+        if old is not None:
+            # The overwritten value's space becomes dead until compaction
+            self._tiers[self._tier_names[old[0]]].release(old[1])
+
+    def get(self, key: Any) -> Optional[bytes]:
+        raw = self._key(key)
+        h = _key_hash(raw)
+        with self._locks[h % self._layout.segments]:
+            pos = self._find(raw, h)
+            if pos < 0:
+                return None
+            slot = self._slots[pos]
+            tier_name = self._tier_names[slot["tier"]]
+            value = self._values[pos, :slot["length"]].tobytes()
+            slot["access_count"] += 1
+        self._tiers[tier_name].access(len(value), write=False)
+        return value
+
+    def _unlink(self, key: Any):
+        raw = self._key(key)
+        h = _key_hash(raw)
+        with self._locks[h % self._layout.segments]:
+            pos = self._find(raw, h)
+            if pos < 0:
+                return None
+            slot = self._slots[pos]
+            slot["state"] = _DELETED
+            slot["version"] += 1
+            entry = (self._tier_names[slot["tier"]], self._values[pos, :slot["length"]].tobytes())
+        self._tiers[entry[0]].release(len(entry[1]))
+        return entry
+
+    def pop(self, key: Any, default: Any = _MISSING) -> bytes:
+        """Remove ``key`` and return its value (read at its tier's cost)."""
+        entry = self._unlink(key)
+        if entry is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self._tiers[entry[0]].access(len(entry[1]), write=False)
+        return entry[1]
+
+    def delete(self, key: Any) -> bool:
+        """Remove ``key`` without reading it; returns whether it existed."""
+        return self._unlink(key) is not None
+
+    def locate(self, key: Any):
+        """(tier_name, value) of ``key``, or None."""
+        raw = self._key(key)
+        h = _key_hash(raw)
+        with self._locks[h % self._layout.segments]:
+            pos = self._find(raw, h)
+            if pos < 0:
+                return None
+            return self._tier_names[self._slots[pos]["tier"]], self._values[pos, :self._slots[pos]["length"]].tobytes()
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._slots["state"] == _LIVE))
+
+
+def _worker(state: SharedState, worker_id: int, workload: str, workload_args: dict, policy_args: dict,
+            seed: int, barrier, results) -> None:
+    from .simulator import Simulator
+    state.attach()
+    try:
+        tiers = state.tiers()
+        sim = Simulator(tiers=tiers, policy=HotWarmColdPolicy(**policy_args))
+        sim.ds = SharedHashMap(state, tiers, sim.policy)
+        random.seed(seed + worker_id)
+        barrier.wait()
+        try:
+            getattr(sim, f"workload_{workload}")(**workload_args)
+        except MemoryError as e:
+            results.put((worker_id, None, str(e)))
+        else:
+            results.put((worker_id, sim.metrics, None))
+    finally:
+        state.close()
+
+
+def _finish(metrics: Metrics, tiers, wall_s: float, mode: str, clients: int, errors: List[str]) -> dict:
+    summary = metrics.summary()
+    n_ops = sum(v["count"] for v in summary.values() if isinstance(v, dict) and "count" in v)
+    summary["tier_occupancy_bytes"] = {
+        name: {"used": tier.used_bytes, "dead": tier.dead_bytes} for name, tier in tiers.items()
+    }
+    summary["throughput_ops_s"] = n_ops / wall_s if wall_s > 0 else 0.0
+    summary["clients"] = {"mode": mode, "n_clients": clients, "wall_s": wall_s, "errors": errors}
+    return summary
+
+def run_processes(processes: int, workload: str = "random", workload_args: Optional[dict] = None,
+                  tier_configs: Optional[Dict[str, TierConfig]] = None, policy_args: Optional[dict] = None,
+                  layout: Optional[SharedLayout] = None, seed: int = 0) -> dict:
+    """Run ``processes`` worker processes, each executing ``workload_<workload>(**workload_args)``."""
+    ctx = mp.get_context()
+    state = SharedState(tier_configs or default_tier_configs(), layout, ctx)
+    tiers = state.tiers()
+    metrics = Metrics()
+    errors = []
+    barrier = ctx.Barrier(processes + 1)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(state, i, workload, workload_args or {}, policy_args or {},
+                                                  seed, barrier, results), daemon=True)
+               for i in range(processes)]
+    try:
+        for w in workers:
+            w.start()
+        barrier.wait()
+        start = time.perf_counter()
+        pending = processes
+        while pending:
+            try:
+                _, worker_metrics, error = results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(w.is_alive() for w in workers):
+                    raise RuntimeError("worker processes exited without reporting")
+                continue
+            pending -= 1
+            if error is not None:
+                errors.append(error)
+            else:
+                metrics.merge(worker_metrics)
+        wall_s = time.perf_counter() - start
+        for w in workers:
+            w.join()
+        return _finish(metrics, tiers, wall_s, "processes", processes, errors)
+    finally:
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+        state.close()
+        state.unlink()
+
+def run_threads(threads: int, workload: str = "random", workload_args: Optional[dict] = None,
+                tier_configs: Optional[Dict[str, TierConfig]] = None, policy_args: Optional[dict] = None,
+                seed: int = 0) -> dict:
+    """GIL-bound baseline: ``threads`` clients sharing one ``Simulator``."""
+    from .simulator import Simulator
+    tiers = {name: Tier(cfg) for name, cfg in (tier_configs or default_tier_configs()).items()}
+    sim = Simulator(tiers=tiers, policy=HotWarmColdPolicy(**(policy_args or {})))
+    random.seed(seed)
+    errors = []
+
+    def client():
+        try:
+            getattr(sim, f"workload_{workload}")(**(workload_args or {}))
+        except MemoryError as e:
+            errors.append(str(e))
+
+    clients = [threading.Thread(target=client) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in clients:
+        t.start()
+    for t in clients:
+        t.join()
+    wall_s = time.perf_counter() - start
+    return _finish(sim.metrics, tiers, wall_s, "threads", threads, errors)
+
+
+def scaling_curve(client_counts=(1, 2, 4, 8), modes=("threads", "processes"), **kwargs) -> List[dict]:
+    """Throughput and get/put p99 per (mode, client count)."""
+    rows = []
+    for mode in modes:
+        for n in client_counts:
+            if mode == "processes":
+                summary = run_processes(n, **kwargs)
+            else:
+                summary = run_threads(n, **{k: v for k, v in kwargs.items() if k != "layout"})
+            rows.append({
+                "mode": mode,
+                "clients": n,
+                "throughput_ops_s": summary["throughput_ops_s"],
+                "get_p99_ns": summary.get("get", {}).get("p99_ns"),
+                "put_p99_ns": summary.get("put", {}).get("p99_ns"),
+                "wall_s": summary["clients"]["wall_s"],
+                "errors": len(summary["clients"]["errors"]),
+            })
+    return rows
+
+def format_table(rows: List[dict]) -> str:
+    base = {r["mode"]: r["throughput_ops_s"] for r in rows if r["clients"] == min(x["clients"] for x in rows)}
+    lines = [f"{'mode':<10} {'clients':>7} {'ops/s':>12} {'speedup':>8} {'get p99 µs':>11} {'put p99 µs':>11}"]
+    for r in rows:
+        speedup = r["throughput_ops_s"] / base[r["mode"]] if base.get(r["mode"]) else 0.0
+        get_p99 = (r["get_p99_ns"] or 0) / 1000
+        put_p99 = (r["put_p99_ns"] or 0) / 1000
+        lines.append(f"{r['mode']:<10} {r['clients']:>7} {r['throughput_ops_s']:>12,.0f} {speedup:>7.2f}x "
+                     f"{get_p99:>11.1f} {put_p99:>11.1f}")
+    return "\n".join(lines)
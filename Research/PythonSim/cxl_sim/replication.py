@@ -0,0 +1,182 @@
+"""Read-only replicas of hot keys in additional fast tiers or devices.
+
+Reads are counted per key. Every maintenance pass (run by the simulator's
+background thread) turns the counts into read rates:
+
+- keys at or above ``read_rate_threshold`` reads/s get replicas in up to
+  ``max_replicas`` tiers from ``replica_tiers`` other than the key's primary
+  tier; each copy reserves space there and is charged as a read on the
+  primary plus a write on the replica tier;
+- replicated keys that fall below ``drop_fraction`` of the threshold lose
+  their replicas and the space is released.
+
+Reads of a replicated key rotate over the primary and its replicas, which
+spreads a hot key's traffic over several tier channels. A write either drops
+every replica (``write_mode="invalidate"``) or rewrites each of them before
+the put returns (``"update"``). ``replica_tiers`` may name extra devices that
+the placement policy never picks (e.g. a second ``DRAM1`` tier).
+"""
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass
+class ReplicationConfig:
+    read_rate_threshold: float = 50.0  # reads/s that make a key hot
+    drop_fraction: float = 0.5         # drop replicas below this fraction of the threshold
+    max_replicas: int = 2
+    replica_tiers: Tuple[str, ...] = ("L3Cache", "DRAM")
+    write_mode: str = "invalidate"     # "invalidate" or "update"
+    max_replica_bytes: Optional[int] = None
+
+
+class ReplicaManager:
+    def __init__(self, tiers, cfg: Optional[ReplicationConfig] = None):
+        self.cfg = cfg or ReplicationConfig()
+        if self.cfg.write_mode not in ("invalidate", "update"):
+            raise ValueError(f"Unknown write_mode {self.cfg.write_mode!r}")
+        self._tiers = tiers
+        self._lock = threading.Lock()
+        self._replicas: Dict[Any, Tuple[Tuple[str, ...], int]] = {}  # key -> (replica tiers, size)
+        self._reads: Dict[Any, int] = {}
+        self._window_start = time.perf_counter()
+        self._rr = itertools.count()
+        self.replica_bytes = 0
+        self.replica_reads = 0
+        self.created = 0
+        self.dropped = 0
+        self.invalidations = 0
+        self.updates = 0
+
+    def route(self, key: Any, primary: str) -> str:
+        """Count a read of ``key`` and pick the tier that serves it."""
+        self._reads[key] = self._reads.get(key, 0) + 1  # approximate under races; rates only
+        entry = self._replicas.get(key)
+        if entry is None:
+            return primary
+        choice = next(self._rr) % (len(entry[0]) + 1)
+        if choice == 0:
+            return primary
+        self.replica_reads += 1
+        return entry[0][choice - 1]
+
+    def on_write(self, key: Any, value: bytes) -> None:
+        """Keep replicas consistent with a put that has just replaced the primary."""
+        if key not in self._replicas:
+            return
+        if self.cfg.write_mode == "invalidate":
+            self.invalidations += self.drop(key)
+            return
+        with self._lock:
+            entry = self._replicas.get(key)
+        if entry is None:
+            return
+        tiers, old_size = entry
+        # Reserve the new size everywhere before touching the accounting, so a
+        # full replica tier turns into a drop instead of half-updated state
+        placed = []
+        try:
+            for name in tiers:
+                self._tiers[name].place(len(value))
+                placed.append(name)
+        except MemoryError:
+            for name in placed:
+                self._tiers[name].remove(len(value))
+            self.invalidations += self.drop(key)
+            return
+        with self._lock:
+            swapped = self._replicas.get(key) is entry
+            if swapped:
+                self._replicas[key] = (tiers, len(value))
+                self.replica_bytes += (len(value) - old_size) * len(tiers)
+        if not swapped:
+            # Dropped or rewritten concurrently; fall back to invalidating
+            for name in tiers:
+                self._tiers[name].remove(len(value))
+            self.invalidations += self.drop(key)
+            return
+        for name in tiers:
+            tier = self._tiers[name]
+            tier.release(old_size)
+            tier.access(len(value), write=True)
+        self.updates += len(tiers)
+
+    def drop(self, key: Any) -> int:
+        """Remove every replica of ``key``; returns how many were dropped."""
+        with self._lock:
+            entry = self._replicas.pop(key, None)
+            if entry is None:
+                return 0
+            tiers, size = entry
+            self.replica_bytes -= size * len(tiers)
+        for name in tiers:
+            self._tiers[name].release(size)
+        self.dropped += len(tiers)
+        return len(tiers)
+
+    def _replicate(self, key: Any, primary: str, size: int) -> None:
+        made = []
+        for name in self.cfg.replica_tiers:
+            if len(made) >= self.cfg.max_replicas:
+                break
+            if name == primary or name not in self._tiers:
+                continue
+            if self.cfg.max_replica_bytes is not None and \
+                    self.replica_bytes + size * (len(made) + 1) > self.cfg.max_replica_bytes:
+                break
+            try:
+                self._tiers[name].place(size)
+            except MemoryError:
+                continue
+            made.append(name)
+        if not made:
+            return
+        self._tiers[primary].access(size, write=False)
+        for name in made:
+            self._tiers[name].access(size, write=True)
+        with self._lock:
+            self._replicas[key] = (tuple(made), size)
+            self.replica_bytes += size * len(made)
+        self.created += len(made)
+
+    def maintain(self, ds) -> None:
+        """Replicate keys that became hot and drop replicas of keys that cooled."""
+        now = time.perf_counter()
+        elapsed = max(now - self._window_start, 1e-9)
+        reads, self._reads = self._reads, {}
+        self._window_start = now
+        for key in list(self._replicas):
+            if reads.get(key, 0) / elapsed < self.cfg.read_rate_threshold * self.cfg.drop_fraction:
+                self.drop(key)
+        for key, n in reads.items():
+            if n / elapsed < self.cfg.read_rate_threshold or key in self._replicas:
+                continue
+            entry = ds.locate(key)
+            if entry is not None:
+                self._replicate(key, entry[0], len(entry[1]))
+
+    def tier_bytes(self) -> Dict[str, int]:
+        """Footprint of the replicas held on each tier."""
+        out: Dict[str, int] = {}
+        with self._lock:
+            entries = list(self._replicas.values())
+        for tiers, size in entries:
+            for name in tiers:
+                out[name] = out.get(name, 0) + self._tiers[name]._footprint(size)
+        return out
+
+    def summary(self) -> dict:
+        return {
+            "replicated_keys": len(self._replicas),
+            "replicas": sum(len(tiers) for tiers, _ in self._replicas.values()),
+            "replica_bytes": self.replica_bytes,  # logical, before compression
+            "replica_tier_bytes": self.tier_bytes(),
+            "replica_reads": self.replica_reads,
+            "created": self.created,
+            "dropped": self.dropped,
+            "invalidations": self.invalidations,
+            "updates": self.updates,
+        }
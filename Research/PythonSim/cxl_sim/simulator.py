@@ -1,54 +1,154 @@
 import time
 import threading
 import random
-from typing import Callable, List
+from typing import Callable, List, Optional
 from .tiers import default_tiers
-from .policies import HotWarmColdPolicy, ObjectStats
-from .datastructures import TieredHashMap
+from .policies import HotWarmColdPolicy, ObjectStats, PlacementPolicy
+from .datastructures import TieredBTree, TieredHashMap
 from .metrics import Metrics
+from .writeback import WriteBackBuffer, WriteBackConfig
+from .migration import MigrationConfig, MigrationPlanner
+from .replication import ReplicaManager, ReplicationConfig
+from .eventlog import OP_COMPACT, OP_MIGRATE, EventRecorder
+from .timeseries import TimeSeries
 
 class Simulator:
-    def __init__(self):
-        self.tiers = default_tiers()
-        self.policy = HotWarmColdPolicy()
+    def __init__(self, tiers=None, policy: Optional[PlacementPolicy] = None,
+                 write_buffer: Optional[WriteBackConfig] = None,
+                 migration: Optional[MigrationConfig] = None, structure: str = "hashmap",
+                 replication: Optional[ReplicationConfig] = None, event_log: Optional[str] = None,
+                 metrics_window_s: Optional[float] = None, metrics_max_windows: int = 1024):
+        self.tiers = tiers if tiers is not None else default_tiers()
+        self.policy = policy if policy is not None else HotWarmColdPolicy()
         self.metrics = Metrics()
-        self.ds = TieredHashMap(self.tiers, self.policy)
+        if metrics_window_s:
+            self.metrics.timeseries = TimeSeries(int(metrics_window_s * 1e9), metrics_max_windows, self.tiers)
+        self.write_buffer = WriteBackBuffer(self.tiers, write_buffer, self.metrics) if write_buffer else None
+        self.replicas = ReplicaManager(self.tiers, replication) if replication else None
+        self.events = EventRecorder(event_log, list(self.tiers)) if event_log else None
+        if structure == "btree":
+            self.ds = TieredBTree(self.tiers, self.policy, write_buffer=self.write_buffer, metrics=self.metrics,
+                                  replicas=self.replicas, events=self.events)
+        elif structure == "hashmap":
+            self.ds = TieredHashMap(self.tiers, self.policy, write_buffer=self.write_buffer, replicas=self.replicas,
+                                    events=self.events)
+        else:
+            raise ValueError(f"Unknown structure {structure!r}")
+        self.migration = MigrationPlanner(self.tiers, migration)
         self._stop = threading.Event()
         self._migrator = threading.Thread(target=self._background_migration, daemon=True)
         self.migration_scan_interval = 0.1  # seconds
+        self.compaction_min_dead_bytes = 0  # compact a tier once it has more dead space than this
+        self.migration_snapshot_rows = 65536  # untouched rows of a restored snapshot checked per pass
     
     def start(self):
         self._migrator.start()
+        if self.write_buffer is not None:
+            self.write_buffer.start()
     
     def stop(self):
         self._stop.set()
         self._migrator.join(timeout=2)
+        if self.write_buffer is not None:
+            self.write_buffer.stop()
+        if self.events is not None:
+            self.events.close()
+        if self.metrics.timeseries is not None:
+            self.metrics.timeseries.flush()
     
     def _background_migration(self):
-        """Periodically scan and migrate objects based on access patterns."""
+        """Periodically scan and migrate objects based on access patterns, refresh hot-key
+        replicas, then compact."""
         while not self._stop.is_set():
             time.sleep(self.migration_scan_interval)
-            # Scan metadata and trigger migrations
-            migration_start = time.time_ns()
-            migrated = 0
-            for key, stats in list(self.ds._meta.items()):
-                if key in self.ds._map:
-                    current_tier, value = self.ds._map[key]
-                    desired_tier = self.policy.choose_tier(stats)
-                    if current_tier != desired_tier:
-                        # Perform migration
-                        try:
-                            old_tier = self.tiers[current_tier]
-                            new_tier = self.tiers[desired_tier]
-                            old_tier.remove(len(value))
-                            new_tier.place(len(value))
-                            self.ds._map[key] = (desired_tier, value)
-                            migrated += 1
-                        except MemoryError:
-                            pass  # Skip if target tier is full
-            if migrated > 0:
-                migration_end = time.time_ns()
-                self.metrics.record_migration_overhead(migration_end - migration_start)
+            self._migration_pass()
+            if self.replicas is not None:
+                self.replicas.maintain(self.ds)
+            self._compaction_pass()
+    
+    def _compaction_pass(self) -> int:
+        """Reclaim dead space on every tier over the threshold; returns bytes freed."""
+        freed = 0
+        for name, tier in self.tiers.items():
+            if tier.dead_bytes > self.compaction_min_dead_bytes:
+                start = time.time_ns()
+                nbytes = tier.compact()
+                elapsed = time.time_ns() - start
+                self.metrics.record_compaction(name, nbytes, elapsed)
+                if self.events is not None and nbytes:
+                    self.events.record(OP_COMPACT, None, name, nbytes, elapsed)
+                freed += nbytes
+        return freed
+    
+    def _migration_pass(self) -> int:
+        """One scan over object metadata; returns the number of objects migrated.
+
+        After ``load_snapshot`` the untouched snapshot rows are scanned
+        incrementally, ``migration_snapshot_rows`` per pass.
+        """
+        migration_start = time.time_ns()
+        candidates = []
+        meta = self.ds._meta
+        items = meta.sweep(self.migration_snapshot_rows) if hasattr(meta, "sweep") else list(meta.items())
+        for key, stats in items:
+            entry = self.ds.locate(key)
+            if entry is not None:
+                current_tier, value = entry
+                desired_tier = self.policy.choose_tier(stats)
+                if current_tier != desired_tier:
+                    candidates.append((key, current_tier, desired_tier, len(value), stats.access_count))
+        migrated = 0
+        for batch in self.migration.plan(candidates):
+            throttle_s = self.migration.throttle(batch)
+            old_tier = self.tiers[batch.src]
+            new_tier = self.tiers[batch.dst]
+            items = batch.items
+            for _ in range(self.migration.cfg.max_retries + 1):
+                # Copy: reserve space on the target and charge the transfer;
+                # the mapping still points at the old copy meanwhile
+                copies = []
+                for key, _size in items:
+                    snap = self.ds.begin_migration(key, batch.src)
+                    if snap is None:
+                        continue  # Rewritten or moved since the scan
+                    value, version = snap
+                    try:
+                        new_tier.place(len(value))
+                    except MemoryError:
+                        continue  # Skip if target tier is full
+                    copies.append((key, value, version))
+                if not copies:
+                    break
+                nbytes = sum(len(value) for _, value, _ in copies)
+                self.migration.charge(batch, nbytes)
+                # Commit: switch each mapping only if the object is unchanged
+                retry = []
+                moved = 0
+                for key, value, version in copies:
+                    pause_start = time.perf_counter_ns()
+                    committed = self.ds.commit_migration(key, batch.src, batch.dst, version)
+                    pause_ns = time.perf_counter_ns() - pause_start
+                    self.metrics.record_migration_commit(pause_ns, committed)
+                    if committed:
+                        old_tier.release(len(value))
+                        if self.events is not None:
+                            self.events.record(OP_MIGRATE, key, batch.dst, len(value), pause_ns, src=batch.src)
+                        moved += 1
+                    else:
+                        new_tier.remove(len(value))
+                        retry.append((key, len(value)))
+                self.metrics.record_migration(batch.src, batch.dst, nbytes, moved, int(throttle_s * 1e9))
+                throttle_s = 0.0
+                migrated += moved
+                items = retry
+                if not items:
+                    break
+        migration_end = time.time_ns()
+        if migrated > 0:
+            self.metrics.record_migration_overhead(migration_end - migration_start)
+        if self.metrics.timeseries is not None:
+            self.metrics.timeseries.record_migration_pass(migration_start, migration_end)
+        return migrated
     
     def workload_sequential(self, n_ops: int = 1000, payload_size: int = 1024, read_ratio: float = 0.5):
         """Sequential key access pattern: 0, 1, 2, ..., n_ops-1"""
@@ -68,15 +168,22 @@ class Simulator:
                 e = time.time_ns()
                 self.metrics.record("put", s, e)
     
-    def workload_random(self, n_ops: int = 1000, payload_size: int = 1024, key_space: int = 100, read_ratio: float = 0.5):
+    def workload_random(self, n_ops: int = 1000, payload_size: int = 1024, key_space: int = 100, read_ratio: float = 0.5,
+                        delete_ratio: float = 0.0):
         """Random access pattern with fixed key space."""
         for i in range(n_ops):
             key = f"k{random.randint(0, key_space - 1)}"
-            if random.random() < read_ratio:
+            r = random.random()
+            if r < read_ratio:
                 s = time.time_ns()
                 _ = self.ds.get(key)
                 e = time.time_ns()
                 self.metrics.record("get", s, e)
+            elif r < read_ratio + delete_ratio:
+                s = time.time_ns()
+                self.ds.delete(key)
+                e = time.time_ns()
+                self.metrics.record("delete", s, e)
             else:
                 value = bytes(payload_size)
                 s = time.time_ns()
@@ -84,9 +191,10 @@ class Simulator:
                 e = time.time_ns()
                 self.metrics.record("put", s, e)
     
-    def workload_hotspot(self, n_ops: int = 1000, payload_size: int = 1024, hotspot_fraction: float = 0.2, read_ratio: float = 0.8):
+    def workload_hotspot(self, n_ops: int = 1000, payload_size: int = 1024, hotspot_fraction: float = 0.2, read_ratio: float = 0.8,
+                         key_space: Optional[int] = None):
         """Hotspot pattern: 20% of keys get 80% of accesses."""
-        total_keys = int(100 / hotspot_fraction)
+        total_keys = key_space if key_space is not None else int(100 / hotspot_fraction)
         hotspot_keys = int(total_keys * hotspot_fraction)
         
         for i in range(n_ops):
@@ -109,6 +217,35 @@ class Simulator:
                 e = time.time_ns()
                 self.metrics.record("put", s, e)
     
+    def workload_scan(self, n_ops: int = 1000, payload_size: int = 1024, key_space: int = 1000,
+                      scan_length: int = 100, scan_ratio: float = 0.5, reverse_ratio: float = 0.0):
+        """Range scans of ``scan_length`` keys from a random start, mixed with puts (B-tree only)."""
+        if not hasattr(self.ds, "scan"):
+            raise ValueError("workload_scan needs Simulator(structure=\"btree\")")
+        width = len(str(key_space - 1))
+        for i in range(n_ops):
+            start = random.randint(0, key_space - 1)
+            if random.random() < scan_ratio:
+                lo = f"k{start:0{width}d}"
+                hi = f"k{start + scan_length:0{width}d}"
+                s = time.time_ns()
+                _ = self.ds.scan(lo, hi, reverse=random.random() < reverse_ratio)
+                e = time.time_ns()
+                self.metrics.record("scan", s, e)
+            else:
+                value = bytes(payload_size)
+                s = time.time_ns()
+                self.ds.put(f"k{start:0{width}d}", value)
+                e = time.time_ns()
+                self.metrics.record("put", s, e)
+    
+    def workload_ycsb(self, workload: str = "a", **overrides):
+        """YCSB core workload ``workload`` (a–f): load phase, then run phase (see ycsb.py)."""
+        from .ycsb import YCSBRunner, workload as ycsb_workload
+        runner = YCSBRunner(self, ycsb_workload(workload, **overrides))
+        runner.load()
+        runner.run()
+    
     def workload_tiered_baseline(self, n_ops: int = 1000, payload_size: int = 1024):
         """Baseline: uniform round-robin, simulating single-tier DRAM-only system."""
         # Force all objects to DRAM
@@ -137,4 +274,10 @@ class Simulator:
     
     def get_summary(self):
         """Return current metrics summary."""
-        return self.metrics.summary()
+        summary = self.metrics.summary()
+        summary["tier_occupancy_bytes"] = {
+            name: {"used": tier.used_bytes, "dead": tier.dead_bytes} for name, tier in self.tiers.items()
+        }
+        if self.replicas is not None:
+            summary["replication"] = self.replicas.summary()
+        return summary
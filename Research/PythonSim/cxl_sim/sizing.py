@@ -0,0 +1,112 @@
+"""Budget-constrained tier sizing: cheapest capacity mix for a p99 target.
+
+Capacities of the priced tiers are searched over a grid. Each candidate is
+scored by either the analytical estimator (milliseconds per point) or full
+simulator runs (through the cached sweep engine). Both spill a full tier to
+the next slower one, so a config is infeasible only when the last tier
+overflows. The result is the Pareto frontier of capacity cost vs. p99
+latency, plus the cheapest candidate that meets the SLO. Tiers without a
+price keep their default capacity and are free.
+"""
+import itertools
+import math
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import estimator
+from .policies import PlacementPolicy
+from .tiers import default_tier_configs
+
+GB = 1024 ** 3
+DEFAULT_PRICES_PER_GB = {"DRAM": 3.0, "CXL": 1.5, "SSD": 0.08}
+SIMULATOR_WORKLOADS = ("random", "hotspot")  # take key_space, read_ratio and payload_size
+
+
+@dataclass
+class Candidate:
+    capacities: Dict[str, int]
+    cost: float
+    p99_ns: float
+    feasible: bool
+
+    def meets(self, slo_p99_ns: float) -> bool:
+        return self.feasible and self.p99_ns <= slo_p99_ns
+
+
+def capacity_grid(working_set_bytes: int, steps: int = 12) -> List[int]:
+    """0 plus powers of two from working_set / 2**(steps-2) up to 2x the working set."""
+    return [0] + [int(working_set_bytes * 2.0 ** k) for k in range(-(steps - 2), 2)]
+
+def cost_of(capacities: Dict[str, int], prices_per_gb: Dict[str, float]) -> float:
+    return sum(capacities[t] / GB * prices_per_gb[t] for t in prices_per_gb)
+
+def pareto_frontier(candidates: Sequence[Candidate]) -> List[Candidate]:
+    """Feasible candidates not dominated in (cost, p99), cheapest first."""
+    frontier = []
+    best_p99 = math.inf
+    for c in sorted((c for c in candidates if c.feasible), key=lambda c: (c.cost, c.p99_ns)):
+        if c.p99_ns < best_p99:
+            frontier.append(c)
+            best_p99 = c.p99_ns
+    return frontier
+
+def cheapest_meeting(candidates: Sequence[Candidate], slo_p99_ns: float) -> Optional[Candidate]:
+    ok = [c for c in candidates if c.meets(slo_p99_ns)]
+    return min(ok, key=lambda c: (c.cost, c.p99_ns)) if ok else None
+
+def _p99(ops: Dict[str, Dict[str, float]], op: str) -> float:
+    if op == "max":
+        return max(stats["p99_ns"] for stats in ops.values())
+    return ops[op]["p99_ns"]
+
+def _grid_points(grids: Dict[str, Sequence[int]]):
+    names = list(grids)
+    for combo in itertools.product(*(grids[n] for n in names)):
+        yield dict(zip(names, combo))
+
+
+def search_estimator(popularity: "estimator.Popularity", n_ops: int, read_ratio: float, payload_size: int,
+                     prices_per_gb: Dict[str, float], grids: Optional[Dict[str, Sequence[int]]] = None,
+                     op: str = "get", policy: Optional[PlacementPolicy] = None,
+                     calibration: Optional["estimator.Calibration"] = None) -> List[Candidate]:
+    base = default_tier_configs()
+    if grids is None:
+        ws = int(popularity.probs.size * payload_size)
+        grids = {t: capacity_grid(ws) for t in prices_per_gb}
+    candidates = []
+    for caps in _grid_points(grids):
+        tiers = {name: replace(cfg, capacity_bytes=caps.get(name, cfg.capacity_bytes)) for name, cfg in base.items()}
+        est = estimator.estimate(popularity, n_ops, read_ratio, payload_size, tiers=tiers, policy=policy,
+                                 calibration=calibration)
+        candidates.append(Candidate(caps, cost_of(caps, prices_per_gb), _p99(est.ops, op), est.feasible))
+    return candidates
+
+def simulator_workload(workload: str, n_ops: int, n_keys: int, read_ratio: float, payload_size: int) -> dict:
+    """Sweep parameters for a simulator-mode workload over ``n_keys`` keys."""
+    if workload not in SIMULATOR_WORKLOADS:
+        raise ValueError(f"Simulator sizing supports workloads {', '.join(SIMULATOR_WORKLOADS)}, not {workload!r}")
+    return {"workload": workload, "workload.n_ops": n_ops, "workload.key_space": n_keys,
+            "workload.read_ratio": read_ratio, "workload.payload_size": payload_size}
+
+def search_simulator(workload_params: dict, prices_per_gb: Dict[str, float],
+                     grids: Dict[str, Sequence[int]], op: str = "get",
+                     cache_dir: str = ".sweep_cache", workers: Optional[int] = None) -> List[Candidate]:
+    """Score each grid point with a full simulator run (``workload_params`` as in sweep.resolve)."""
+    from .sweep import run_sweep
+    caps_list = list(_grid_points(grids))
+    points = [{**workload_params, **{f"tier.{t}.capacity_bytes": c for t, c in caps.items()}} for caps in caps_list]
+    candidates = []
+    for caps, entry in zip(caps_list, run_sweep(points, cache_dir=cache_dir, workers=workers)):
+        result = entry["result"]
+        # Full tiers spill to slower ones, as in the estimator; MemoryError means
+        # the last tier overflowed too, so the config is infeasible
+        feasible = "error" not in result
+        ops = {k: v for k, v in result.items() if isinstance(v, dict) and "p99_ns" in v}
+        p99 = _p99(ops, op) if feasible and (op == "max" or op in ops) else math.inf
+        candidates.append(Candidate(caps, cost_of(caps, prices_per_gb), float(p99), feasible))
+    return candidates
+
+
+def summarize(candidates: Sequence[Candidate], slo_p99_ns: float) -> Tuple[List[Candidate], Optional[Candidate]]:
+    """Pareto frontier and cheapest SLO-meeting candidate."""
+    return pareto_frontier(candidates), cheapest_meeting(candidates, slo_p99_ns)
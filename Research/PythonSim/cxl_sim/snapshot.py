@@ -0,0 +1,492 @@
+"""Binary snapshot/restore of warmed-up simulator state.
+
+File layout (little-endian)::
+
+    b"CXLSNAP1" | u64 header_offset | u64 header_len | arrays... | JSON header
+
+Per-key columns (key bytes, tier, value id, version, ObjectStats fields) and
+deduplicated value bytes are stored as flat arrays, with B-tree rows in key
+order. Restoring memory-maps the file and wraps the columns in lazy mappings,
+so opening a 10M-key snapshot costs a few array views; rows are decoded only
+when a key is touched. Point lookups on either structure go through the key
+hash index; the B-tree's sorted key index keeps the mapped rows immutable and
+merges in a small overlay of inserted and deleted keys (see ``MappedKeys``).
+The migrator checks a bounded number of untouched rows per pass (see
+``MappedTable.sweep``). Replica sets, migration pause times and the scan and
+compaction counters are saved too.
+"""
+import bisect
+import itertools
+import json
+import mmap
+import struct
+import zlib
+from collections.abc import MutableMapping
+from typing import Any
+
+import numpy as np
+
+from .datastructures import TieredBTree
+from .policies import ObjectStats
+
+MAGIC = b"CXLSNAP1"
+VERSION = 1
+_PREFIX = struct.Struct("<8sQQ")
+_ALIGN = 8
+_REPLICA_COUNTERS = ("replica_reads", "created", "dropped", "invalidations", "updates")
+
+def _encode_key(key: Any) -> bytes:
+    if isinstance(key, str):
+        return b"s" + key.encode("utf-8")
+    if isinstance(key, int) and not isinstance(key, bool):
+        return b"i" + str(key).encode("ascii")
+    raise TypeError(f"Snapshot keys must be str or int, got {type(key).__name__}")
+
+def _decode_key(raw: bytes) -> Any:
+    if raw[:1] == b"s":
+        return raw[1:].decode("utf-8")
+    return int(raw[1:])
+
+def _key_hash(raw: bytes) -> int:
+    return zlib.crc32(raw)
+
+def _offsets(chunks) -> np.ndarray:
+    off = np.zeros(len(chunks) + 1, dtype=np.int64)
+    np.cumsum([len(c) for c in chunks], out=off[1:])
+    return off
+
+
+def save_snapshot(sim, path: str) -> None:
+    """Write the simulator's data structure, tier occupancy and metrics to ``path``."""
+    if sim.write_buffer is not None:
+        sim.write_buffer.flush()
+    ds = sim.ds
+    if isinstance(ds, TieredBTree):
+        rows = [(k, *ds._map[k]) for k in ds._keys]
+    else:
+        rows = [(k, t, v) for k, (t, v) in list(ds._map.items())]
+    replicas = getattr(sim, "replicas", None)
+    tier_names = list(sim.tiers)
+    tier_index = {name: i for i, name in enumerate(tier_names)}
+
+    key_chunks = [_encode_key(k) for k, _, _ in rows]
+    value_ids = {}
+    value_chunks = []
+    val_id = np.empty(len(rows), dtype=np.int32)
+    tier_idx = np.empty(len(rows), dtype=np.int8)
+    bytes_size = np.zeros(len(rows), dtype=np.int64)
+    access_count = np.zeros(len(rows), dtype=np.int64)
+    last_latency = np.zeros(len(rows), dtype=np.int64)
+    hint = np.ones(len(rows), dtype=np.float64)
+    version = np.zeros(len(rows), dtype=np.int64)
+    for i, (key, tier_name, value) in enumerate(rows):
+        vid = value_ids.get(value)
+        if vid is None:
+            vid = value_ids[value] = len(value_chunks)
+            value_chunks.append(value)
+        val_id[i] = vid
+        tier_idx[i] = tier_index[tier_name]
+        version[i] = ds._versions.get(key, 0)
+        stats = ds._meta.get(key)
+        if stats is not None:
+            bytes_size[i] = stats.bytes_size
+            access_count[i] = stats.access_count
+            last_latency[i] = stats.last_latency_ns
+            hint[i] = stats.compression_ratio_hint
+    hashes = np.fromiter((_key_hash(c) for c in key_chunks), dtype=np.uint32, count=len(rows))
+    hash_rows = np.argsort(hashes, kind="stable").astype(np.int64)
+
+    arrays = {
+        "key_blob": np.frombuffer(b"".join(key_chunks), dtype=np.uint8),
+        "key_off": _offsets(key_chunks),
+        "value_blob": np.frombuffer(b"".join(value_chunks), dtype=np.uint8),
+        "value_off": _offsets(value_chunks),
+        "val_id": val_id,
+        "tier_idx": tier_idx,
+        "bytes_size": bytes_size,
+        "access_count": access_count,
+        "last_latency_ns": last_latency,
+        "compression_ratio_hint": hint,
+        "version": version,
+        "hash_sorted": hashes[hash_rows],
+        "hash_rows": hash_rows,
+    }
+    m = sim.metrics
+    latency_ops = []
+    for op_name, lats in m.latencies_ns.items():
+        latency_ops.append(op_name)
+        arrays[f"lat:{op_name}"] = np.asarray(lats, dtype=np.int64)
+    arrays["migration_pause_ns"] = np.asarray(m.migration_pause_ns, dtype=np.int64)
+    replication = None
+    if replicas is not None:
+        with replicas._lock:
+            entries = list(replicas._replicas.items())
+        replication = {
+            "replicas": [[key, list(tiers), size] for key, (tiers, size) in entries],
+            "tier_bytes": replicas.tier_bytes(),
+            "counters": {name: getattr(replicas, name) for name in _REPLICA_COUNTERS},
+        }
+
+    header = {
+        "version": VERSION,
+        "structure": type(ds).__name__,
+        "order": getattr(ds, "order", None),
+        "n_rows": len(rows),
+        "tiers": tier_names,
+        "tier_used": {name: tier._used for name, tier in sim.tiers.items()},
+        "tier_dead": {name: tier._dead for name, tier in sim.tiers.items()},
+        "replication": replication,
+        "metrics": {
+            "counts": dict(m.counts),
+            "tier_utilization": dict(m.tier_utilization),
+            "compression_savings": dict(m.compression_savings),
+            "cost_per_operation": dict(m.cost_per_operation),
+            "migration_overhead_ns": m.migration_overhead_ns,
+            "migration_bytes": dict(m.migration_bytes),
+            "migration_objects": m.migration_objects,
+            "migration_batches": m.migration_batches,
+            "migration_throttle_ns": m.migration_throttle_ns,
+            "migration_commits": m.migration_commits,
+            "migration_aborts": m.migration_aborts,
+            "compaction_bytes": dict(m.compaction_bytes),
+            "compaction_ns": m.compaction_ns,
+            "scan_keys": m.scan_keys,
+            "scan_bytes": m.scan_bytes,
+            "scan_requests": m.scan_requests,
+            "latency_ops": latency_ops,
+        },
+        "arrays": {},
+    }
+    with open(path, "wb") as f:
+        f.write(b"\0" * _PREFIX.size)
+        for name, arr in arrays.items():
+            pad = -f.tell() % _ALIGN
+            f.write(b"\0" * pad)
+            header["arrays"][name] = [arr.dtype.str, int(arr.size), f.tell()]
+            f.write(np.ascontiguousarray(arr).tobytes())
+        blob = json.dumps(header).encode("utf-8")
+        header_offset = f.tell()
+        f.write(blob)
+        f.seek(0)
+        f.write(_PREFIX.pack(MAGIC, header_offset, len(blob)))
+
+
+class SnapshotFile:
+    """Read-only memory-mapped view of a snapshot file."""
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_offset, header_len = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a simulator snapshot")
+        self.header = json.loads(self._mm[header_offset:header_offset + header_len])
+        if self.header["version"] != VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.header['version']}")
+        self.n_rows = self.header["n_rows"]
+        self.tier_names = self.header["tiers"]
+        a = self.array
+        self.key_blob, self.key_off = a("key_blob"), a("key_off")
+        self.value_blob, self.value_off = a("value_blob"), a("value_off")
+        self.val_id, self.tier_idx = a("val_id"), a("tier_idx")
+        self.hash_sorted, self.hash_rows = a("hash_sorted"), a("hash_rows")
+        self._last_find = (None, -1)  # callers probe the same key several times in a row
+
+    def array(self, name: str) -> np.ndarray:
+        dtype, count, offset = self.header["arrays"][name]
+        return np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=offset)
+
+    def raw_key(self, row: int) -> bytes:
+        return self.key_blob[self.key_off[row]:self.key_off[row + 1]].tobytes()
+
+    def key(self, row: int) -> Any:
+        return _decode_key(self.raw_key(row))
+
+    def value(self, row: int) -> bytes:
+        vid = self.val_id[row]
+        return self.value_blob[self.value_off[vid]:self.value_off[vid + 1]].tobytes()
+
+    def tier(self, row: int) -> str:
+        return self.tier_names[self.tier_idx[row]]
+
+    def find(self, key: Any) -> int:
+        """Row index of ``key`` or -1."""
+        last_key, last_row = self._last_find
+        if type(last_key) is type(key) and last_key == key:
+            return last_row
+        row = self._find(key)
+        self._last_find = (key, row)
+        return row
+
+    def _find(self, key: Any) -> int:
+        try:
+            raw = _encode_key(key)
+        except TypeError:
+            return -1
+        h = _key_hash(raw)
+        i = int(self.hash_sorted.searchsorted(np.uint32(h)))
+        while i < self.n_rows and self.hash_sorted[i] == h:
+            row = int(self.hash_rows[i])
+            if self.raw_key(row) == raw:
+                return row
+            i += 1
+        return -1
+
+
+class MappedTable(MutableMapping):
+    """Dict-like overlay on snapshot rows; writes and deletes stay in memory.
+
+    ``materialize`` caches decoded rows in the overlay, which is required for
+    values that callers mutate in place (``ObjectStats``).
+    """
+    def __init__(self, snap: SnapshotFile, load_row, materialize: bool = False):
+        self._snap = snap
+        self._load_row = load_row
+        self._materialize = materialize
+        self._overlay = {}
+        self._hidden = set()  # snapshot keys that are overlaid or deleted
+        self._cursor = 0  # next snapshot row for sweep()
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            return self._overlay[key]
+        if key in self._hidden:
+            raise KeyError(key)
+        row = self._snap.find(key)
+        if row < 0:
+            raise KeyError(key)
+        value = self._load_row(row)
+        if self._materialize:
+            self._overlay[key] = value
+            self._hidden.add(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._overlay and key not in self._hidden and self._snap.find(key) >= 0:
+            self._hidden.add(key)
+        self._overlay[key] = value
+
+    def __delitem__(self, key):
+        if key in self._overlay:
+            del self._overlay[key]
+        elif key not in self._hidden and self._snap.find(key) >= 0:
+            self._hidden.add(key)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return True
+        return key not in self._hidden and self._snap.find(key) >= 0
+
+    def __iter__(self):
+        hidden = self._hidden
+        for row in range(self._snap.n_rows):
+            key = self._snap.key(row)
+            if key not in hidden:
+                yield key
+        yield from list(self._overlay)
+
+    def __len__(self):
+        return self._snap.n_rows - len(self._hidden) + len(self._overlay)
+
+    def items(self):
+        overlay = list(self._overlay.items())
+        hidden = self._hidden
+        for row in range(self._snap.n_rows):
+            key = self._snap.key(row)
+            if key not in hidden:
+                value = self._load_row(row)
+                if self._materialize:
+                    self._overlay[key] = value
+                    hidden.add(key)
+                yield key, value
+        yield from overlay
+
+    def sweep(self, limit: int):
+        """Overlay items plus up to ``limit`` untouched snapshot rows, resuming
+        after the rows the previous sweep returned (wrapping around).
+
+        Snapshot rows are decoded but not materialized, so a sweep costs
+        O(overlay + limit) however large the snapshot is.
+        """
+        items = list(self._overlay.items())
+        n = self._snap.n_rows
+        hidden = self._hidden
+        for _ in range(min(limit, n)):
+            row = self._cursor
+            self._cursor = (row + 1) % n
+            key = self._snap.key(row)
+            if key not in hidden:
+                items.append((key, self._load_row(row)))
+        return items
+
+
+class MappedKeys:
+    """Sorted key index over snapshot rows (saved in key order) with in-memory edits.
+
+    The mapped rows are never rewritten: inserted keys go to a small sorted
+    overlay and deleted rows to a set, and both are merged in on lookup. Ranks
+    bisect the rows (decoding O(log n) keys), so ``insort``/``discard`` cost
+    O(log n + edits) instead of shifting an n-entry array. Implements what
+    ``TieredBTree`` needs of ``_keys``: ``len``, ``bisect_left``, ``insort``,
+    ``discard``, slicing and iteration.
+    """
+    def __init__(self, snap: SnapshotFile):
+        self._snap = snap
+        self._added = []  # sorted keys not in the snapshot
+        self._deleted = []  # sorted snapshot rows that were removed
+        self._deleted_set = set()
+
+    def __len__(self):
+        return self._snap.n_rows - len(self._deleted) + len(self._added)
+
+    def _row_rank(self, key: Any) -> int:
+        """Number of snapshot rows (deleted or not) whose key is below ``key``."""
+        lo, hi = 0, self._snap.n_rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._snap.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _rank_of_row(self, row: int) -> int:
+        """Merged position of snapshot row ``row`` (``len`` for ``row == n_rows``)."""
+        if row == self._snap.n_rows:
+            return len(self)
+        key = self._snap.key(row)
+        return row - bisect.bisect_left(self._deleted, row) + bisect.bisect_left(self._added, key)
+
+    def bisect_left(self, key: Any) -> int:
+        row = self._row_rank(key)
+        return row - bisect.bisect_left(self._deleted, row) + bisect.bisect_left(self._added, key)
+
+    def insort(self, key: Any):
+        row = self._snap.find(key)
+        if row >= 0:
+            if row in self._deleted_set:
+                self._deleted_set.remove(row)
+                del self._deleted[bisect.bisect_left(self._deleted, row)]
+        else:
+            i = bisect.bisect_left(self._added, key)
+            if i == len(self._added) or self._added[i] != key:
+                self._added.insert(i, key)
+
+    def discard(self, key: Any):
+        i = bisect.bisect_left(self._added, key)
+        if i < len(self._added) and self._added[i] == key:
+            del self._added[i]
+            return
+        row = self._snap.find(key)
+        if row >= 0 and row not in self._deleted_set:
+            self._deleted_set.add(row)
+            bisect.insort(self._deleted, row)
+
+    def _iter_from(self, pos: int):
+        """Keys in order starting at merged position ``pos``."""
+        n = self._snap.n_rows
+        # First snapshot row whose merged position is >= pos; the positions
+        # between pos and that row's position hold overlay keys
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._rank_of_row(mid) < pos:
+                lo = mid + 1
+            else:
+                hi = mid
+        row = lo
+        added = (len(self._added) if row == n else bisect.bisect_left(self._added, self._snap.key(row)))
+        added -= self._rank_of_row(row) - pos
+        while True:
+            while row < n and row in self._deleted_set:
+                row += 1
+            base = self._snap.key(row) if row < n else None
+            if added < len(self._added) and (row == n or self._added[added] < base):
+                yield self._added[added]
+                added += 1
+            elif row < n:
+                yield base
+                row += 1
+            else:
+                return
+
+    def __getitem__(self, i):
+        if not isinstance(i, slice):
+            raise TypeError("MappedKeys only supports slicing")
+        start, stop, step = i.indices(len(self))
+        if step != 1:
+            raise ValueError("MappedKeys slices must be contiguous")
+        if stop <= start:
+            return []
+        return list(itertools.islice(self._iter_from(start), stop - start))
+
+    def __iter__(self):
+        return self._iter_from(0)
+
+
+def load_snapshot(path: str, sim=None):
+    """Restore a snapshot into ``sim`` (a fresh ``Simulator`` if None) and return it."""
+    if sim is None:
+        from .simulator import Simulator
+        sim = Simulator()
+    snap = SnapshotFile(path)
+    header = snap.header
+    bytes_size = snap.array("bytes_size")
+    access_count = snap.array("access_count")
+    last_latency = snap.array("last_latency_ns")
+    hint = snap.array("compression_ratio_hint")
+
+    def load_stats(row):
+        return ObjectStats(bytes_size=int(bytes_size[row]), access_count=int(access_count[row]),
+                           last_latency_ns=int(last_latency[row]), compression_ratio_hint=float(hint[row]))
+
+    if header["structure"] == "TieredBTree":
+        sim.ds = TieredBTree(sim.tiers, sim.policy, order=header["order"] or 8, write_buffer=sim.write_buffer,
+                             metrics=sim.metrics, replicas=getattr(sim, "replicas", None),
+                             events=getattr(sim, "events", None))
+        sim.ds._keys = MappedKeys(snap)
+    sim.ds._map = MappedTable(snap, lambda row: (snap.tier(row), snap.value(row)))
+    sim.ds._meta = MappedTable(snap, load_stats, materialize=True)
+    if "version" in header["arrays"]:
+        version = snap.array("version")
+        sim.ds._versions = MappedTable(snap, lambda row: int(version[row]))
+
+    replication = header.get("replication")
+    replicas = getattr(sim, "replicas", None)
+    # Without a ReplicaManager to own them, saved replicas come back as dead space
+    orphaned = replication["tier_bytes"] if replication and replicas is None else {}
+    for name, used in header["tier_used"].items():
+        if name in sim.tiers:
+            sim.tiers[name]._used = used
+            sim.tiers[name]._dead = header.get("tier_dead", {}).get(name, 0) + orphaned.get(name, 0)
+    if replication and replicas is not None:
+        with replicas._lock:
+            for key, tiers, size in replication["replicas"]:
+                replicas._replicas[key] = (tuple(tiers), size)
+                replicas.replica_bytes += size * len(tiers)
+        for name, value in replication["counters"].items():
+            setattr(replicas, name, value)
+    saved = header["metrics"]
+    m = sim.metrics
+    m.counts.update(saved["counts"])
+    m.tier_utilization.update(saved["tier_utilization"])
+    m.compression_savings.update(saved["compression_savings"])
+    m.cost_per_operation.update(saved["cost_per_operation"])
+    m.migration_overhead_ns = saved["migration_overhead_ns"]
+    m.migration_bytes.update(saved.get("migration_bytes", {}))
+    m.migration_objects = saved.get("migration_objects", 0)
+    m.migration_batches = saved.get("migration_batches", 0)
+    m.migration_throttle_ns = saved.get("migration_throttle_ns", 0)
+    m.migration_commits = saved.get("migration_commits", 0)
+    m.migration_aborts = saved.get("migration_aborts", 0)
+    m.compaction_bytes.update(saved.get("compaction_bytes", {}))
+    m.compaction_ns = saved.get("compaction_ns", 0)
+    m.scan_keys = saved.get("scan_keys", 0)
+    m.scan_bytes = saved.get("scan_bytes", 0)
+    m.scan_requests = saved.get("scan_requests", 0)
+    for op_name in saved["latency_ops"]:
+        m.latencies_ns[op_name] = snap.array(f"lat:{op_name}").tolist()
+    if "migration_pause_ns" in header["arrays"]:
+        m.migration_pause_ns = snap.array("migration_pause_ns").tolist()
+    return sim
@@ -0,0 +1,293 @@
+"""Parameter sweeps over tier configs, policy thresholds and workload knobs.
+
+Sweep parameters are dotted names:
+
+    tier.<TierName>.<TierConfig field>   e.g. tier.DRAM.capacity_bytes
+    policy.<HotWarmColdPolicy arg>       e.g. policy.hot_threshold
+    workload.<workload kwarg>            e.g. workload.read_ratio
+    migration.<MigrationConfig field>    e.g. migration.bandwidth_share
+    replication                          "on" or "off" (default) hot-key read replicas
+    replication.<ReplicationConfig field> e.g. replication.read_rate_threshold (implies "on")
+    write_buffer                         "on" or "off" (default) DRAM write-back buffer
+    write_buffer.<WriteBackConfig field> e.g. write_buffer.capacity_bytes (implies "on")
+    workload                             workload name (Simulator.workload_<name>)
+    structure                            "hashmap" or "btree" (default: btree for scans)
+    tier_profile                         "default" or "calibrated" (calibration.py) base tiers
+    seed                                 RNG seed for the point
+
+Every point is resolved to a full configuration (defaults included) and its
+result is cached under a hash of that configuration, of the cxl_sim sources
+and of the fio output its tiers' latency profiles load, so re-running or
+extending a sweep only simulates points that have not been seen before, and
+any change to the simulator or to the measured latencies invalidates the cache.
+"""
+import csv
+import functools
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional
+
+from .migration import MigrationConfig
+from .replication import ReplicationConfig
+from .policies import HotWarmColdPolicy
+from .tiers import Tier, TierConfig, default_tier_configs
+from .writeback import WriteBackConfig
+
+SWEEP_VERSION = 3  # cache format; simulator changes are caught by source_hash()
+
+DEFAULT_WORKLOAD = "random"
+DEFAULT_WORKLOAD_ARGS = {
+    "random": {"n_ops": 500, "payload_size": 2048, "key_space": 100, "read_ratio": 0.5},
+    "sequential": {"n_ops": 500, "payload_size": 2048, "read_ratio": 0.7},
+    "hotspot": {"n_ops": 500, "payload_size": 2048, "hotspot_fraction": 0.2, "read_ratio": 0.8},
+    "tiered_baseline": {"n_ops": 500, "payload_size": 2048},
+    "ycsb": {"workload": "a", "record_count": 500, "operation_count": 500},
+    "scan": {"n_ops": 500, "payload_size": 2048, "key_space": 100, "scan_length": 10, "scan_ratio": 0.5},
+}
+DEFAULT_POLICY_ARGS = {"hot_threshold": 100, "warm_threshold": 20}
+
+SUMMARY_FIELDS = ("count", "mean_ns", "median_ns", "p95_ns", "p99_ns", "max_ns", "min_ns")
+
+
+def grid(space: Dict[str, list]) -> List[dict]:
+    """Cartesian product of the listed values."""
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[n] for n in names))]
+
+def random_search(space: Dict[str, object], n_points: int, seed: int = 0) -> List[dict]:
+    """Sample ``n_points`` points: lists are sampled uniformly, (lo, hi) tuples as ranges."""
+    rng = random.Random(seed)
+    points = []
+    for _ in range(n_points):
+        point = {}
+        for name, dom in space.items():
+            if isinstance(dom, tuple):
+                lo, hi = dom
+                point[name] = rng.randint(lo, hi) if isinstance(lo, int) and isinstance(hi, int) else rng.uniform(lo, hi)
+            else:
+                point[name] = rng.choice(list(dom))
+        points.append(point)
+    return points
+
+
+def base_tier_configs(profile: str) -> Dict[str, TierConfig]:
+    if profile == "default":
+        return default_tier_configs()
+    if profile == "calibrated":
+        from .calibration import calibrated_tier_configs
+        return calibrated_tier_configs()
+    raise ValueError(f"Unknown tier profile {profile!r}")
+
+def resolve(params: dict) -> dict:
+    """Expand sweep parameters into a full, hashable point configuration."""
+    workload = params.get("workload", DEFAULT_WORKLOAD)
+    if workload not in DEFAULT_WORKLOAD_ARGS:
+        raise ValueError(f"Unknown workload {workload!r}")
+    profile = params.get("tier_profile", "default")
+    cfg = {
+        "version": SWEEP_VERSION,
+        "seed": params.get("seed", 0),
+        "workload": workload,
+        "workload_args": dict(DEFAULT_WORKLOAD_ARGS[workload]),
+        "policy": dict(DEFAULT_POLICY_ARGS),
+        "tiers": {name: asdict(tc) for name, tc in base_tier_configs(profile).items()},
+        "migration": asdict(MigrationConfig()),
+        "replication": None,
+        "write_buffer": None,
+        "structure": params.get("structure"),
+    }
+    for section, default in (("replication", ReplicationConfig), ("write_buffer", WriteBackConfig)):
+        switch = params.get(section)
+        if switch not in (None, "on", "off", True, False):
+            raise ValueError(f"{section} must be 'on' or 'off', got {switch!r}")
+        if switch in ("on", True) or (switch is None and any(n.startswith(section + ".") for n in params)):
+            cfg[section] = asdict(default())
+    for name, value in params.items():
+        parts = name.split(".")
+        if parts[0] == "tier" and len(parts) == 3:
+            if parts[1] not in cfg["tiers"] or parts[2] not in cfg["tiers"][parts[1]]:
+                raise ValueError(f"Unknown tier parameter {name!r}")
+            cfg["tiers"][parts[1]][parts[2]] = value
+        elif parts[0] == "policy" and len(parts) == 2:
+            cfg["policy"][parts[1]] = value
+        elif parts[0] == "workload" and len(parts) == 2:
+            cfg["workload_args"][parts[1]] = value
+        elif parts[0] == "migration" and len(parts) == 2:
+            if parts[1] not in cfg["migration"]:
+                raise ValueError(f"Unknown migration parameter {name!r}")
+            cfg["migration"][parts[1]] = value
+        elif parts[0] == "replication" and len(parts) == 2:
+            if parts[1] not in asdict(ReplicationConfig()):
+                raise ValueError(f"Unknown replication parameter {name!r}")
+            if cfg["replication"] is not None:
+                cfg["replication"][parts[1]] = value
+        elif parts[0] == "write_buffer" and len(parts) == 2:
+            if parts[1] not in asdict(WriteBackConfig()):
+                raise ValueError(f"Unknown write_buffer parameter {name!r}")
+            if cfg["write_buffer"] is not None:
+                cfg["write_buffer"][parts[1]] = value
+        elif name not in ("workload", "seed", "tier_profile", "replication", "write_buffer", "structure"):
+            raise ValueError(f"Unknown sweep parameter {name!r}")
+    if cfg["structure"] is None:
+        cfg["structure"] = "btree" if _scans(workload, cfg["workload_args"]) else "hashmap"
+    return cfg
+
+def _scans(workload: str, args: dict) -> bool:
+    if workload == "scan":
+        return True
+    if workload == "ycsb":
+        from .ycsb import WORKLOADS
+        spec = WORKLOADS.get(str(args.get("workload", "a")).lower())
+        return bool(spec and (args.get("scan", spec.scan)))
+    return False
+
+@functools.lru_cache(maxsize=None)
+def source_hash() -> str:
+    """Hash of every cxl_sim module, so cached results never outlive the code that produced them."""
+    h = hashlib.sha256()
+    pkg_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(pkg_dir)):
+        if name.endswith(".py"):
+            h.update(name.encode("utf-8"))
+            with open(os.path.join(pkg_dir, name), "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()[:16]
+
+@functools.lru_cache(maxsize=None)
+def profile_hash(profile: str) -> str:
+    """Hash of the fio output a ``latency_profile`` loads (parsed once per process, like the model)."""
+    from .fio_latency import result_files
+    h = hashlib.sha256()
+    for path in result_files(None if profile == "fio" else profile):
+        h.update(path.name.encode("utf-8"))
+        if path.is_file():
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()[:16]
+
+def config_hash(cfg: dict) -> str:
+    profiles = {fields.get("latency_profile") for fields in cfg.get("tiers", {}).values()}
+    inputs = {profile: profile_hash(profile) for profile in sorted(p for p in profiles if p)}
+    blob = json.dumps({"config": cfg, "source": source_hash(), "latency_inputs": inputs},
+                      sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:20]
+
+
+def run_point(cfg: dict) -> dict:
+    """Simulate one resolved configuration and return its summary."""
+    from .simulator import Simulator
+    random.seed(cfg["seed"])
+    try:
+        tiers = {name: Tier(TierConfig(**fields)) for name, fields in cfg["tiers"].items()}
+        sim = Simulator(tiers=tiers, policy=HotWarmColdPolicy(**cfg["policy"]),
+                        migration=MigrationConfig(**cfg["migration"]), structure=cfg["structure"],
+                        replication=ReplicationConfig(**cfg["replication"]) if cfg["replication"] else None,
+                        write_buffer=WriteBackConfig(**cfg["write_buffer"]) if cfg.get("write_buffer") else None)
+    except ValueError as e:
+        return {"error": str(e)}
+    sim.start()
+    start = time.perf_counter()
+    try:
+        getattr(sim, f"workload_{cfg['workload']}")(**cfg["workload_args"])
+    except (MemoryError, ValueError) as e:
+        # An invalid or infeasible point is a result row, not a reason to abort the sweep
+        return {"error": str(e)}
+    finally:
+        sim.stop()
+    wall_s = time.perf_counter() - start
+    summary = sim.get_summary()
+    n_ops = sum(v["count"] for v in summary.values() if isinstance(v, dict) and "count" in v)
+    summary["wall_s"] = wall_s
+    summary["throughput_ops_s"] = n_ops / wall_s if wall_s > 0 else 0.0
+    return summary
+
+
+class ResultCache:
+    """One JSON file per configuration hash."""
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, h: str) -> str:
+        return os.path.join(self.cache_dir, f"{h}.json")
+
+    def get(self, h: str) -> Optional[dict]:
+        try:
+            with open(self._path(h)) as f:
+                return json.load(f)["result"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, h: str, cfg: dict, result: dict) -> None:
+        tmp = self._path(h) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"config": cfg, "result": result}, f)
+        os.replace(tmp, self._path(h))
+
+
+def run_sweep(points: Iterable[dict], cache_dir: str = ".sweep_cache", workers: Optional[int] = None,
+              verbose: bool = True) -> List[dict]:
+    """Run every point not already cached; returns [{params, hash, result}] in input order."""
+    cache = ResultCache(cache_dir)
+    entries = []
+    todo = {}
+    for params in points:
+        cfg = resolve(params)
+        h = config_hash(cfg)
+        entries.append({"params": params, "hash": h, "result": cache.get(h)})
+        if entries[-1]["result"] is None:
+            todo[h] = cfg
+    if verbose:
+        print(f"Sweep: {len(entries)} points, {len(entries) - len(todo)} cached, {len(todo)} to run")
+    results = {}
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_point, cfg): h for h, cfg in todo.items()}
+            for done, fut in enumerate(as_completed(futures), 1):
+                h = futures[fut]
+                results[h] = fut.result()
+                # Cache as soon as each point finishes so interrupted sweeps resume
+                cache.put(h, todo[h], results[h])
+                if verbose:
+                    print(f"  [{done}/{len(todo)}] {h}")
+    for entry in entries:
+        if entry["result"] is None:
+            entry["result"] = results[entry["hash"]]
+    return entries
+
+
+def tidy(entries: List[dict]) -> List[dict]:
+    """One row per (point, operation) with swept parameters as columns."""
+    rows = []
+    for entry in entries:
+        result = entry["result"]
+        base = dict(entry["params"])
+        base["config_hash"] = entry["hash"]
+        if "error" in result:
+            rows.append({**base, "op": None, "error": result["error"]})
+            continue
+        base["throughput_ops_s"] = result.get("throughput_ops_s")
+        base["migration_overhead_ns"] = result.get("migration_overhead_ns")
+        base["migration_bytes"] = sum(result.get("migration", {}).get("bytes", {}).values())
+        base["replica_bytes"] = result.get("replication", {}).get("replica_bytes")
+        for op_name, stats in result.items():
+            if isinstance(stats, dict) and "count" in stats:
+                rows.append({**base, "op": op_name, **{k: stats.get(k) for k in SUMMARY_FIELDS}})
+    return rows
+
+def write_csv(rows: List[dict], path: str) -> None:
+    fields = []
+    for row in rows:
+        for k in row:
+            if k not in fields:
+                fields.append(k)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
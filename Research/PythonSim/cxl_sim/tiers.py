@@ -1,6 +1,15 @@
+import bisect
 import time
 import threading
 from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+OFFERED_BW_WINDOW_NS = 10_000_000  # offered bandwidth is measured over 10 ms windows
+SPILL_ORDER = ("L3Cache", "DRAM", "CXL", "SSD", "HDD")  # a full tier spills to the next one
+
+def spill_order(tier_names) -> List[str]:
+    """``tier_names`` fastest first: ``SPILL_ORDER``, then any other tiers in the given order."""
+    return [t for t in SPILL_ORDER if t in tier_names] + [t for t in tier_names if t not in SPILL_ORDER]
 
 @dataclass
 class TierConfig:
@@ -11,12 +20,40 @@ class TierConfig:
     compression_ratio: float = 1.0
     decompress_latency_ns: int = 0
     compress_latency_ns: int = 0
+    # (offered bandwidth bytes/s, base latency ns) points, bandwidth ascending;
+    # when set, base latency follows the curve instead of base_latency_ns
+    loaded_latency_curve: Optional[Sequence[Tuple[float, float]]] = None
+    # "fio" or a path to fio output: sample latency from measured clat percentiles
+    latency_profile: Optional[str] = None
+    # fio queue depth to sample at; None follows the tier's outstanding accesses
+    latency_iodepth: Optional[int] = None
+
+def interpolate_curve(curve: Sequence[Tuple[float, float]], x: float) -> float:
+    """Piecewise-linear lookup, clamped to the end points."""
+    xs = [p[0] for p in curve]
+    i = bisect.bisect_right(xs, x)
+    if i == 0:
+        return curve[0][1]
+    if i == len(curve):
+        return curve[-1][1]
+    (x0, y0), (x1, y1) = curve[i - 1], curve[i]
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
 
 class Tier:
     def __init__(self, cfg: TierConfig):
         self.cfg = cfg
         self._lock = threading.Lock()
-        self._used = 0
+        self._used = 0  # live + dead footprint
+        self._dead = 0  # footprint of overwritten/deleted values awaiting compaction
+        self._busy_until_ns = 0  # end of the last transfer queued on the tier's channel
+        self._window_start_ns = time.perf_counter_ns()
+        self._window_bytes = 0
+        self.offered_bw = 0.0  # bytes/s over the last complete window
+        self._inflight = 0  # accesses in progress; the queue depth of a measured latency model
+        self.latency_model = None
+        if cfg.latency_profile:
+            from .fio_latency import model_for
+            self.latency_model = model_for(cfg.latency_profile)
 
     def can_place(self, bytes_needed: int) -> bool:
         if self.cfg.compression_ratio < 1.0:
@@ -25,40 +62,159 @@ class Tier:
             footprint = bytes_needed
         return self._used + footprint <= self.cfg.capacity_bytes
 
+    def _footprint(self, nbytes: int) -> int:
+        return int(nbytes * (self.cfg.compression_ratio if self.cfg.compression_ratio < 1.0 else 1.0))
+
     def place(self, bytes_needed: int) -> None:
-        with self._lock:
-            if not self.can_place(bytes_needed):
-                raise MemoryError(f"Tier {self.cfg.name} out of capacity")
-            footprint = int(bytes_needed * (self.cfg.compression_ratio if self.cfg.compression_ratio < 1.0 else 1.0))
-            self._used += footprint
+        """Reserve space; compacts dead space first if that is what is in the way."""
+        footprint = self._footprint(bytes_needed)
+        for attempt in range(2):
+            with self._lock:
+                if self.can_place(bytes_needed):
+                    self._used += footprint
+                    return
+                if attempt or self._used - self._dead + footprint > self.cfg.capacity_bytes:
+                    break
+            self.compact()
+        raise MemoryError(f"Tier {self.cfg.name} out of capacity")
 
     def remove(self, bytes_used: int) -> None:
+        """Free space immediately (e.g. a reservation that was never used)."""
+        with self._lock:
+            self._used = max(0, self._used - self._footprint(bytes_used))
+
+    def release(self, bytes_used: int) -> None:
+        """Mark a value's space dead (overwrite, move, delete); compaction frees it."""
+        with self._lock:
+            self._dead = min(self._used, self._dead + self._footprint(bytes_used))
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    @property
+    def dead_bytes(self) -> int:
+        return self._dead
+
+    def compact(self, max_bytes: Optional[int] = None) -> int:
+        """Reclaim dead space, charging one write of the reclaimed bytes; returns bytes freed."""
+        with self._lock:
+            reclaim = self._dead if max_bytes is None else min(self._dead, max_bytes)
+            # Claim the bytes first so concurrent compactions do not double-free
+            self._dead -= reclaim
+        if reclaim <= 0:
+            return 0
+        self.access(reclaim, write=True)
+        with self._lock:
+            self._used = max(0, self._used - reclaim)
+        return reclaim
+
+    def base_latency_ns(self, offered_bw: Optional[float] = None) -> int:
+        """Base latency at ``offered_bw`` bytes/s (default: the tier's current offered bandwidth)."""
+        if not self.cfg.loaded_latency_curve:
+            return self.cfg.base_latency_ns
+        return int(interpolate_curve(self.cfg.loaded_latency_curve, self.offered_bw if offered_bw is None else offered_bw))
+
+    def _offer(self, bytes_count: int) -> None:
         with self._lock:
-            footprint = int(bytes_used * (self.cfg.compression_ratio if self.cfg.compression_ratio < 1.0 else 1.0))
-            self._used = max(0, self._used - footprint)
+            now = time.perf_counter_ns()
+            elapsed = now - self._window_start_ns
+            if elapsed >= OFFERED_BW_WINDOW_NS:
+                self.offered_bw = self._window_bytes * 1e9 / elapsed
+                self._window_start_ns = now
+                self._window_bytes = 0
+            self._window_bytes += bytes_count
 
-    def access(self, bytes_count: int, write: bool = False) -> None:
-        # Simulate latency + bandwidth; include (de)compression for compressed tiers
-        total_ns = self.cfg.base_latency_ns
+    def _extra_ns(self, transfer_bytes: int) -> int:
+        """(De)compression plus transfer time, added to every base latency."""
+        total_ns = 0
         if self.cfg.compression_ratio < 1.0:
             total_ns += self.cfg.decompress_latency_ns
         elif self.cfg.compression_ratio > 1.0:
             total_ns += self.cfg.compress_latency_ns
-        # bandwidth component
         if self.cfg.bandwidth_bytes_per_s > 0:
-            bw_ns = (bytes_count / self.cfg.bandwidth_bytes_per_s) * 1e9
-            total_ns += int(bw_ns)
-        # Sleep to emulate
-        time.sleep(total_ns / 1e9)
+            total_ns += int(transfer_bytes / self.cfg.bandwidth_bytes_per_s * 1e9)
+        return total_ns
 
+    def latency_ns(self, bytes_count: int, write: bool = False, sample: bool = False,
+                   iodepth: int = 1) -> int:
+        """Access latency without queueing: base + (de)compression + transfer time.
 
-def default_tiers():
+        With a measured latency model the base comes from the fio distribution
+        nearest in block size and queue depth (``cfg.latency_iodepth`` if set,
+        else ``iodepth``): its mean, or a random draw if ``sample``. It already
+        covers transfers up to that job's block size.
+        """
+        if self.latency_model is not None:
+            dist = self.latency_model.lookup(bytes_count, write, self.cfg.latency_iodepth or iodepth)
+            base_ns = dist.sample_ns() if sample else dist.mean_ns
+            return base_ns + self._extra_ns(max(0, bytes_count - dist.block_size))
+        return self.base_latency_ns() + self._extra_ns(bytes_count)
+
+    def latency_points_ns(self, bytes_count: int, write: bool = False,
+                          offered_bw: Optional[float] = None, iodepth: int = 1) -> List[int]:
+        """Equally likely values of ``latency_ns(..., sample=True)`` (one value without a latency model)."""
+        if self.latency_model is not None:
+            dist = self.latency_model.lookup(bytes_count, write, self.cfg.latency_iodepth or iodepth)
+            extra = self._extra_ns(max(0, bytes_count - dist.block_size))
+            return [t + extra for t in dist.table]
+        return [self.base_latency_ns(offered_bw) + self._extra_ns(bytes_count)]
+
+    def access(self, bytes_count: int, write: bool = False) -> int:
+        """Simulate one access and return the ns charged.
+
+        Transfers share one channel per tier: a transfer starts when the
+        previous one has finished, so large transfers (e.g. migration
+        batches) delay concurrent accesses to the same tier. A tier with a
+        measured latency model samples at its current queue depth: the
+        number of accesses in progress, this one included.
+        """
+        if self.latency_model is None:
+            return self._access(bytes_count, write)
+        with self._lock:
+            self._inflight += 1
+            depth = self._inflight
+        try:
+            return self._access(bytes_count, write, depth)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def _access(self, bytes_count: int, write: bool, iodepth: int = 1) -> int:
+        if self.cfg.loaded_latency_curve:
+            self._offer(bytes_count)
+        total_ns = self.latency_ns(bytes_count, write, sample=True, iodepth=iodepth)
+        if self.cfg.bandwidth_bytes_per_s > 0:
+            bw_ns = int(bytes_count / self.cfg.bandwidth_bytes_per_s * 1e9)
+            with self._lock:
+                now = time.perf_counter_ns()
+                start = max(now, self._busy_until_ns)
+                self._busy_until_ns = start + bw_ns
+            total_ns += start - now
+        # Sleep to emulate (zero-latency tiers skip the syscall entirely)
+        if total_ns > 0:
+            time.sleep(total_ns / 1e9)
+        return total_ns
+
+
+DEFAULT_SSD_LATENCY_PROFILE = "fio"
+
+def default_tier_configs(ssd_latency_profile: Optional[str] = DEFAULT_SSD_LATENCY_PROFILE):
+    """Default tiers. The SSD samples the Project 3 fio latencies when they are
+    present (``ssd_latency_profile=None`` opts out); otherwise it charges the
+    constant ``base_latency_ns``."""
+    from .fio_latency import profile_available
+    ssd_profile = ssd_latency_profile if profile_available(ssd_latency_profile) else None
     # Approximate latencies in nanoseconds; tune as needed
     return {
-        "L3Cache": Tier(TierConfig("L3Cache", capacity_bytes=256 * 1024 * 1024, base_latency_ns=30, bandwidth_bytes_per_s=200_000_000_000)),
-        "DRAM": Tier(TierConfig("DRAM", capacity_bytes=16 * 1024 ** 3, base_latency_ns=80, bandwidth_bytes_per_s=50_000_000_000)),
+        "L3Cache": TierConfig("L3Cache", capacity_bytes=256 * 1024 * 1024, base_latency_ns=30, bandwidth_bytes_per_s=200_000_000_000),
+        "DRAM": TierConfig("DRAM", capacity_bytes=16 * 1024 ** 3, base_latency_ns=80, bandwidth_bytes_per_s=50_000_000_000),
         # CXL compressed memory: smaller footprint, extra (de)compression latency
-        "CXL": Tier(TierConfig("CXL", capacity_bytes=64 * 1024 ** 3, base_latency_ns=200, bandwidth_bytes_per_s=25_000_000_000, compression_ratio=0.5, decompress_latency_ns=500, compress_latency_ns=800)),
-        "SSD": Tier(TierConfig("SSD", capacity_bytes=1 * 1024 ** 4, base_latency_ns=100_000, bandwidth_bytes_per_s=2_000_000_000)),
-        "HDD": Tier(TierConfig("HDD", capacity_bytes=8 * 1024 ** 4, base_latency_ns=3_000_000, bandwidth_bytes_per_s=200_000_000)),
+        "CXL": TierConfig("CXL", capacity_bytes=64 * 1024 ** 3, base_latency_ns=200, bandwidth_bytes_per_s=25_000_000_000, compression_ratio=0.5, decompress_latency_ns=500, compress_latency_ns=800),
+        "SSD": TierConfig("SSD", capacity_bytes=1 * 1024 ** 4, base_latency_ns=100_000, bandwidth_bytes_per_s=2_000_000_000, latency_profile=ssd_profile),
+        "HDD": TierConfig("HDD", capacity_bytes=8 * 1024 ** 4, base_latency_ns=3_000_000, bandwidth_bytes_per_s=200_000_000),
     }
+
+
+def default_tiers():
+    return {name: Tier(cfg) for name, cfg in default_tier_configs().items()}
@@ -0,0 +1,161 @@
+"""Per-window metrics for lining up tail latency with background work.
+
+Time is cut into fixed windows aligned to multiples of ``window_ns``
+(``time.time_ns`` clock, as in ``Metrics``). Each operation is counted in the
+window in which it completed. An op recorded after its window closed (its
+thread lost the race for the lock) is added to that window if it is among
+the last ``late_windows`` closed ones, and otherwise to the current window.
+A finished window holds:
+
+- per-op count, throughput and p50/p99/max latency;
+- migration bytes and objects committed, compaction bytes, and the time
+  the migration thread spent in scan passes that overlap the window;
+- each tier's used bytes, sampled when the window is closed.
+
+The last ``max_windows`` windows are kept in a ring buffer, and rows can be
+exported as CSV or JSON. ``correlation`` gives the Pearson correlation
+between an op statistic and a background-work column across windows.
+"""
+import bisect
+import csv
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import List, Optional
+
+import numpy as np
+
+BACKGROUND_FIELDS = ("migration_bytes", "migration_objects", "migration_pass_ns", "compaction_bytes")
+
+
+def _percentile(sorted_lats: List[int], p: float) -> int:
+    return sorted_lats[int((p / 100.0) * (len(sorted_lats) - 1))]
+
+
+def _op_stats(sorted_lats: List[int], window_s: float) -> dict:
+    return {
+        "count": len(sorted_lats),
+        "throughput_ops_s": len(sorted_lats) / window_s,
+        "p50_ns": _percentile(sorted_lats, 50),
+        "p99_ns": _percentile(sorted_lats, 99),
+        "max_ns": sorted_lats[-1],
+    }
+
+
+class TimeSeries:
+    def __init__(self, window_ns: int = 100_000_000, max_windows: int = 1024, tiers=None, late_windows: int = 4):
+        self.window_ns = window_ns
+        self.windows = deque(maxlen=max_windows)
+        self._recent = deque(maxlen=late_windows)  # (row, sorted latencies) of the last closed windows
+        self._tiers = tiers
+        self._lock = threading.Lock()
+        self._start_ns = None
+        self._new_window(time.time_ns())
+
+    def _new_window(self, t_ns: int) -> None:
+        self._start_ns = t_ns - t_ns % self.window_ns
+        self._lats = defaultdict(list)
+        self._background = dict.fromkeys(BACKGROUND_FIELDS, 0)
+
+    def _close(self, end_ns: Optional[int] = None) -> None:
+        end_ns = end_ns if end_ns is not None else self._start_ns + self.window_ns
+        row = {"start_ns": self._start_ns, "end_ns": end_ns, "ops": {}}
+        window_s = max(end_ns - self._start_ns, 1) / 1e9
+        for op, lats in self._lats.items():
+            lats.sort()
+            row["ops"][op] = _op_stats(lats, window_s)
+        row.update(self._background)
+        if self._tiers is not None:
+            row["tier_used_bytes"] = {name: tier.used_bytes for name, tier in self._tiers.items()}
+        self.windows.append(row)
+        self._recent.append((row, self._lats))
+
+    def _advance(self, t_ns: int) -> None:
+        """Close windows up to the one containing ``t_ns``. Caller holds the lock."""
+        while t_ns >= self._start_ns + self.window_ns:
+            self._close()
+            next_start = self._start_ns + self.window_ns
+            if t_ns >= next_start + self.window_ns * self.windows.maxlen:
+                next_start = t_ns - t_ns % self.window_ns  # idle longer than the ring; skip ahead
+            self._new_window(next_start)
+
+    def record(self, op: str, end_ns: int, latency_ns: int) -> None:
+        with self._lock:
+            self._advance(end_ns)
+            if end_ns < self._start_ns:
+                for row, lats in reversed(self._recent):
+                    if row["start_ns"] <= end_ns < row["end_ns"]:
+                        bisect.insort(lats[op], latency_ns)
+                        window_s = max(row["end_ns"] - row["start_ns"], 1) / 1e9
+                        row["ops"][op] = _op_stats(lats[op], window_s)
+                        return
+            self._lats[op].append(latency_ns)
+
+    def record_migration(self, nbytes: int, n_objects: int) -> None:
+        with self._lock:
+            self._advance(time.time_ns())
+            self._background["migration_bytes"] += nbytes
+            self._background["migration_objects"] += n_objects
+
+    def record_compaction(self, nbytes: int) -> None:
+        with self._lock:
+            self._advance(time.time_ns())
+            self._background["compaction_bytes"] += nbytes
+
+    def record_migration_pass(self, start_ns: int, end_ns: int) -> None:
+        """Charge a migration scan's duration to the window(s) it overlaps."""
+        with self._lock:
+            self._advance(end_ns)
+            self._background["migration_pass_ns"] += max(end_ns - max(start_ns, self._start_ns), 0)
+            # Earlier part of the pass, in windows that are already closed
+            for row in reversed(self.windows):
+                if row["end_ns"] <= start_ns:
+                    break
+                row["migration_pass_ns"] += min(row["end_ns"], end_ns) - max(start_ns, row["start_ns"])
+
+    def flush(self) -> None:
+        """Close the current (partial) window at the current time so it appears in ``windows``."""
+        with self._lock:
+            now = time.time_ns()
+            self._advance(now)
+            self._close(now)
+            self._new_window(self._start_ns + self.window_ns)
+
+    def rows(self) -> List[dict]:
+        """One flat dict per window: op stats as ``<op>_<stat>``, tiers as ``<tier>_used_bytes``."""
+        ops = sorted({op for w in self.windows for op in w["ops"]})
+        out = []
+        for w in list(self.windows):
+            row = {"start_ns": w["start_ns"], "end_ns": w["end_ns"]}
+            for op in ops:
+                stats = w["ops"].get(op, {})
+                for stat in ("count", "throughput_ops_s", "p50_ns", "p99_ns", "max_ns"):
+                    row[f"{op}_{stat}"] = stats.get(stat, 0)
+            for field in BACKGROUND_FIELDS:
+                row[field] = w[field]
+            for name, used in w.get("tier_used_bytes", {}).items():
+                row[f"{name}_used_bytes"] = used
+            out.append(row)
+        return out
+
+    def to_csv(self, path: str) -> None:
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["start_ns", "end_ns"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"window_ns": self.window_ns, "windows": list(self.windows)}, f, indent=2)
+
+    def correlation(self, op: str = "get", stat: str = "p99_ns", against: str = "migration_bytes") -> float:
+        """Pearson r between ``op``'s ``stat`` and a background column over windows with that op."""
+        pairs = [(w["ops"][op][stat], w[against]) for w in self.windows if op in w["ops"]]
+        if len(pairs) < 2:
+            return 0.0
+        x, y = np.array(pairs, dtype=float).T
+        if x.std() == 0 or y.std() == 0:
+            return 0.0
+        return float(np.corrcoef(x, y)[0, 1])
@@ -0,0 +1,142 @@
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+@dataclass
+class WriteBackConfig:
+    capacity_bytes: int = 64 * 1024 * 1024
+    flush_batch_bytes: int = 4 * 1024 * 1024  # group-commit size that wakes the flusher
+    flush_interval: float = 0.05  # seconds; flush whatever is buffered at least this often
+    staging_tier: str = "DRAM"
+    buffered_tiers: Tuple[str, ...] = ("SSD", "HDD")
+
+class WriteBackBuffer:
+    """DRAM-resident write log in front of the slow tiers.
+
+    Puts destined for a buffered tier are appended to the log and acknowledged
+    at staging-tier cost. The flusher drains the log in batches, charging each
+    destination tier one access for the whole batch (group commit). When the
+    log is full, the writer wakes the flusher and waits until a flush frees
+    enough space (or flushes on its own thread if no flusher is running);
+    that stall is recorded as ``wb_backpressure``.
+    """
+    def __init__(self, tiers, cfg: WriteBackConfig = WriteBackConfig(), metrics=None):
+        self.cfg = cfg
+        self._tiers = tiers
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)  # notified when a flush frees log space
+        self._flush_lock = threading.Lock()
+        self._log = []  # (seq, key, tier_name, size)
+        self._pending = {}  # key -> (seq, tier_name, value)
+        self._seq = 0
+        self._used = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def covers(self, tier_name: str) -> bool:
+        return tier_name in self.cfg.buffered_tiers
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    def start(self):
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=2)
+            self._flusher = None
+        self.flush()
+
+    def append(self, key: Any, tier_name: str, value: bytes) -> bool:
+        """Buffer a write; returns False if the caller must write through."""
+        size = len(value)
+        if not self.covers(tier_name) or size > self.cfg.capacity_bytes:
+            return False
+        stall_start = None
+        with self._space:
+            # Check and reserve under one lock so concurrent writers cannot overfill the log
+            while self._used + size > self.cfg.capacity_bytes:
+                if stall_start is None:
+                    stall_start = time.time_ns()
+                if self._flusher is None:
+                    self._space.release()
+                    try:
+                        freed = self.flush()
+                    finally:
+                        self._space.acquire()
+                    if not freed:  # another thread's flush holds the batch
+                        self._space.wait(self.cfg.flush_interval)
+                else:
+                    self._wake.set()
+                    self._space.wait(self.cfg.flush_interval)
+            self._seq += 1
+            self._log.append((self._seq, key, tier_name, size))
+            self._pending[key] = (self._seq, tier_name, value)
+            self._used += size
+            full = self._used >= self.cfg.flush_batch_bytes
+        if stall_start is not None and self._metrics is not None:
+            self._metrics.record("wb_backpressure", stall_start, time.time_ns())
+        self._tiers[self.cfg.staging_tier].access(size, write=True)
+        if full:
+            self._wake.set()
+        return True
+
+    def read(self, key: Any) -> Optional[bytes]:
+        """Serve a read from the log at staging-tier cost, or None if not buffered."""
+        entry = self._pending.get(key)
+        if entry is None:
+            return None
+        value = entry[2]
+        self._tiers[self.cfg.staging_tier].access(len(value), write=False)
+        return value
+
+    def discard(self, key: Any) -> bool:
+        """Drop a buffered value so reads no longer see it; returns whether it was buffered.
+
+        Its log record stays and is still written back (and charged) at the
+        next flush.
+        """
+        with self._lock:
+            return self._pending.pop(key, None) is not None
+
+    def flush(self) -> int:
+        """Drain the current log to the backing tiers; returns bytes flushed."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._log = self._log, []
+            if not batch:
+                return 0
+            start = time.time_ns()
+            per_tier = {}
+            for _, _, tier_name, size in batch:
+                per_tier[tier_name] = per_tier.get(tier_name, 0) + size
+            # One sequential write per tier for the whole batch
+            for tier_name, nbytes in per_tier.items():
+                self._tiers[tier_name].access(nbytes, write=True)
+            flushed = 0
+            with self._lock:
+                for seq, key, _, size in batch:
+                    entry = self._pending.get(key)
+                    if entry is not None and entry[0] == seq:
+                        del self._pending[key]
+                    flushed += size
+                self._used -= flushed
+                self._space.notify_all()
+            if self._metrics is not None:
+                self._metrics.record("wb_flush", start, time.time_ns())
+            return flushed
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.cfg.flush_interval)
+            self._wake.clear()
+            self.flush()
@@ -0,0 +1,236 @@
+"""YCSB core workloads A–F for the simulator.
+
+Each workload has a load phase that inserts ``record_count`` records and a
+run phase of ``operation_count`` operations drawn from its mix:
+
+    A  update heavy   50% read, 50% update          scrambled Zipfian
+    B  read mostly    95% read, 5% update           scrambled Zipfian
+    C  read only      100% read                     scrambled Zipfian
+    D  read latest    95% read, 5% insert           latest
+    E  short ranges   95% scan, 5% insert           scrambled Zipfian, scans of 1..100 records
+    F  read-modify-write  50% read, 50% RMW         scrambled Zipfian
+
+As in YCSB, keys are ``"user"`` plus the FNV-1a hash of the record number, so
+inserts land all over the key order. Inserts take the next record number,
+growing the key space that later requests draw from. Request distributions
+are ``uniform``, ``zipfian`` (record 0 hottest), ``scrambled_zipfian`` (the
+Zipfian rank hashed over the key space, which YCSB calls "zipfian") and
+``latest`` (Zipfian over recency). Value sizes are ``constant`` (the
+maximum), ``uniform`` or ``zipfian`` between ``min_value_size`` and
+``max_value_size``.
+
+Load-phase inserts are recorded as ``load_insert``; run-phase operations as
+``read``, ``update``, ``insert``, ``scan`` and ``read_modify_write``.
+"""
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, Optional
+
+RUN_OPS = ("read", "update", "insert", "scan", "read_modify_write")
+ZIPFIAN_CONSTANT = 0.99
+SCRAMBLED_ITEM_COUNT = 10_000_000_000
+SCRAMBLED_ZETAN = 26.46902820178302  # zeta(SCRAMBLED_ITEM_COUNT, 0.99), as in YCSB
+
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def fnv_hash64(n: int) -> int:
+    """FNV-1a over the 8 little-endian bytes of ``n`` (YCSB's ``fnvhash64``)."""
+    h = _FNV_OFFSET
+    for _ in range(8):
+        h ^= n & 0xFF
+        h = (h * _FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+        n >>= 8
+    return h & 0x7FFFFFFFFFFFFFFF
+
+def zeta(n: int, theta: float, start: int = 0, initial: float = 0.0) -> float:
+    """Sum of 1 / i**theta for i in (start, n], added to ``initial``."""
+    return initial + sum(1.0 / (i ** theta) for i in range(start + 1, n + 1))
+
+
+class ZipfianGenerator:
+    """Gray et al.'s Zipfian over [0, items); item 0 is the most popular."""
+    def __init__(self, items: int, theta: float = ZIPFIAN_CONSTANT, zetan: Optional[float] = None):
+        self.theta = theta
+        self.alpha = 1.0 / (1.0 - theta)
+        self.zeta2 = zeta(2, theta)
+        self.items = items
+        self.zetan = zetan if zetan is not None else zeta(items, theta)
+        self._eta()
+
+    def _eta(self) -> None:
+        self.eta = (1 - (2.0 / self.items) ** (1 - self.theta)) / (1 - self.zeta2 / self.zetan)
+
+    def next(self, items: Optional[int] = None) -> int:
+        """Next rank; ``items`` grows (or shrinks) the range, updating zeta incrementally."""
+        if items is not None and items != self.items:
+            if items > self.items:
+                self.zetan = zeta(items, self.theta, self.items, self.zetan)
+            else:
+                self.zetan = zeta(items, self.theta)
+            self.items = items
+            self._eta()
+        u = random.random()
+        uz = u * self.zetan
+        if uz < 1.0:
+            return 0
+        if uz < 1.0 + 0.5 ** self.theta:
+            return 1
+        return min(int(self.items * (self.eta * u - self.eta + 1) ** self.alpha), self.items - 1)
+
+
+def request_generator(name: str, record_count: int) -> Callable[[int], int]:
+    """``f(n_records) -> record number`` for a request distribution."""
+    if name == "uniform":
+        return lambda n: random.randrange(n)
+    if name == "zipfian":
+        zipf = ZipfianGenerator(record_count)
+        return lambda n: zipf.next(n)
+    if name == "scrambled_zipfian":
+        zipf = ZipfianGenerator(SCRAMBLED_ITEM_COUNT, zetan=SCRAMBLED_ZETAN)
+        return lambda n: fnv_hash64(zipf.next()) % n
+    if name == "latest":
+        zipf = ZipfianGenerator(record_count)
+        return lambda n: n - 1 - zipf.next(n)
+    raise ValueError(f"Unknown request distribution {name!r}")
+
+def size_generator(name: str, min_size: int, max_size: int) -> Callable[[], int]:
+    if name == "constant":
+        return lambda: max_size
+    if name == "uniform":
+        return lambda: random.randint(min_size, max_size)
+    if name == "zipfian":
+        zipf = ZipfianGenerator(max_size - min_size + 1)
+        return lambda: min_size + zipf.next()
+    raise ValueError(f"Unknown size distribution {name!r}")
+
+
+@dataclass
+class YCSBWorkload:
+    name: str
+    read: float = 0.0
+    update: float = 0.0
+    insert: float = 0.0
+    scan: float = 0.0
+    read_modify_write: float = 0.0
+    request_distribution: str = "scrambled_zipfian"
+    record_count: int = 1000
+    operation_count: int = 1000
+    value_size_distribution: str = "constant"
+    min_value_size: int = 100
+    max_value_size: int = 1000  # YCSB default record: 10 fields x 100 bytes
+    max_scan_length: int = 100
+    scan_length_distribution: str = "uniform"
+
+
+WORKLOADS = {
+    "a": YCSBWorkload("a", read=0.5, update=0.5),
+    "b": YCSBWorkload("b", read=0.95, update=0.05),
+    "c": YCSBWorkload("c", read=1.0),
+    "d": YCSBWorkload("d", read=0.95, insert=0.05, request_distribution="latest"),
+    "e": YCSBWorkload("e", scan=0.95, insert=0.05),
+    "f": YCSBWorkload("f", read=0.5, read_modify_write=0.5),
+}
+
+def workload(name: str, **overrides) -> YCSBWorkload:
+    """Standard workload ``name`` (a–f) with any fields overridden."""
+    if name.lower() not in WORKLOADS:
+        raise ValueError(f"Unknown YCSB workload {name!r}")
+    return replace(WORKLOADS[name.lower()], **overrides)
+
+
+class YCSBRunner:
+    def __init__(self, sim, spec: YCSBWorkload):
+        if spec.scan and not hasattr(sim.ds, "scan"):
+            raise ValueError(f"YCSB workload {spec.name} scans; needs Simulator(structure=\"btree\")")
+        self.sim = sim
+        self.spec = spec
+        self.records = 0  # record numbers [0, records) have been inserted
+        self._choose = request_generator(spec.request_distribution, spec.record_count)
+        self._value_size = size_generator(spec.value_size_distribution, spec.min_value_size, spec.max_value_size)
+        self._scan_length = size_generator(spec.scan_length_distribution, 1, spec.max_scan_length)
+        self._ops = [(op, getattr(spec, op)) for op in RUN_OPS if getattr(spec, op) > 0]
+
+    @staticmethod
+    def key(n: int) -> str:
+        return f"user{fnv_hash64(n)}"
+
+    def _timed(self, name: str, fn, *args):
+        s = time.time_ns()
+        out = fn(*args)
+        e = time.time_ns()
+        self.sim.metrics.record(name, s, e)
+        return out
+
+    def _insert(self, name: str) -> None:
+        self._timed(name, self.sim.ds.put, self.key(self.records), bytes(self._value_size()))
+        self.records += 1
+
+    def _read_modify_write(self, key: str) -> None:
+        self.sim.ds.get(key)
+        self.sim.ds.put(key, bytes(self._value_size()))
+
+    def load(self) -> float:
+        """Insert ``record_count`` records; returns the phase's wall time in seconds."""
+        start = time.perf_counter()
+        for _ in range(self.spec.record_count - self.records):
+            self._insert("load_insert")
+        return time.perf_counter() - start
+
+    def run(self) -> float:
+        """Execute ``operation_count`` operations; returns the phase's wall time in seconds."""
+        ds = self.sim.ds
+        start = time.perf_counter()
+        for _ in range(self.spec.operation_count):
+            r = random.random()
+            op = self._ops[-1][0]
+            for name, p in self._ops:
+                if r < p:
+                    op = name
+                    break
+                r -= p
+            if op == "insert":
+                self._insert("insert")
+                continue
+            key = self.key(self._choose(self.records))
+            if op == "read":
+                self._timed("read", ds.get, key)
+            elif op == "update":
+                self._timed("update", ds.put, key, bytes(self._value_size()))
+            elif op == "scan":
+                self._timed("scan", lambda: ds.scan(key, limit=self._scan_length()))
+            else:
+                self._timed("read_modify_write", self._read_modify_write, key)
+        return time.perf_counter() - start
+
+
+def run_workload(spec: YCSBWorkload, sim=None, **sim_kwargs) -> dict:
+    """Load and run ``spec`` on ``sim`` (default: a fresh ``Simulator``, a B-tree if it scans)."""
+    if sim is None:
+        from .simulator import Simulator
+        sim_kwargs.setdefault("structure", "btree" if spec.scan else "hashmap")
+        sim = Simulator(**sim_kwargs)
+    sim.start()
+    try:
+        runner = YCSBRunner(sim, spec)
+        load_s = runner.load()
+        run_s = runner.run()
+    finally:
+        sim.stop()
+    summary = sim.get_summary()
+    run_ops = sum(summary[op]["count"] for op in RUN_OPS if op in summary)
+    summary["ycsb"] = {
+        "workload": spec.name,
+        "records": runner.records,
+        "load_s": load_s,
+        "load_ops_s": spec.record_count / load_s if load_s else 0.0,
+        "run_s": run_s,
+        "run_ops_s": run_ops / run_s if run_s else 0.0,
+    }
+    return summary
+
+def run_suite(names: Iterable[str] = "abcdef", **overrides) -> Dict[str, dict]:
+    """Run each named workload on its own fresh simulator."""
+    return {name: run_workload(workload(name, **overrides)) for name in names}
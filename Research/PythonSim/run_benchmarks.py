@@ -2,10 +2,17 @@
 """
 Comprehensive benchmarks for tiered concurrent data structures.
 Evaluates throughput, latency (p95/p99), and migration overhead across workloads.
+
+  python3 run_benchmarks.py                     # built-in workloads -> benchmark_results.json
+  python3 run_benchmarks.py --ycsb              # YCSB A-F suite -> ycsb_results.json
+  python3 run_benchmarks.py --ycsb --ycsb-workloads a c e --records 10000 --operations 10000
 """
+import argparse
 import json
 import sys
+from cxl_sim import ycsb
 from cxl_sim.simulator import Simulator
+from cxl_sim.writeback import WriteBackConfig
 
 def run_benchmark_suite():
     """Run complete benchmark suite and export results."""
@@ -17,7 +24,7 @@ def run_benchmark_suite():
     all_results = {}
     
     # Benchmark 1: Baseline (DRAM-only single-tier)
-    print("\n[1/5] Baseline (DRAM-only, single-tier)...")
+    print("\n[1/6] Baseline (DRAM-only, single-tier)...")
     sim = Simulator()
     sim.start()
     sim.workload_tiered_baseline(n_ops=500, payload_size=2048)
@@ -28,7 +35,7 @@ def run_benchmark_suite():
     print("  Baseline PUT p99:", baseline_results.get("put_baseline", {}).get("p99_ns", 0) / 1e6, "ms")
     
     # Benchmark 2: Tiered - Sequential Workload
-    print("\n[2/5] Tiered: Sequential workload (0.7 read ratio)...")
+    print("\n[2/6] Tiered: Sequential workload (0.7 read ratio)...")
     sim = Simulator()
     sim.start()
     sim.workload_sequential(n_ops=500, payload_size=2048, read_ratio=0.7)
@@ -41,7 +48,7 @@ def run_benchmark_suite():
     print("  Migration overhead:", sequential_results.get("migration_overhead_ns", 0) / 1e6, "ms")
     
     # Benchmark 3: Tiered - Random Workload
-    print("\n[3/5] Tiered: Random workload (key_space=100)...")
+    print("\n[3/6] Tiered: Random workload (key_space=100)...")
     sim = Simulator()
     sim.start()
     sim.workload_random(n_ops=500, payload_size=2048, key_space=100, read_ratio=0.5)
@@ -53,7 +60,7 @@ def run_benchmark_suite():
     print("  Migration overhead:", random_results.get("migration_overhead_ns", 0) / 1e6, "ms")
     
     # Benchmark 4: Tiered - Hotspot Workload
-    print("\n[4/5] Tiered: Hotspot workload (80/20 rule)...")
+    print("\n[4/6] Tiered: Hotspot workload (80/20 rule)...")
     sim = Simulator()
     sim.start()
     sim.workload_hotspot(n_ops=500, payload_size=2048, hotspot_fraction=0.2, read_ratio=0.8)
@@ -66,7 +73,7 @@ def run_benchmark_suite():
     print("  Migration overhead:", hotspot_results.get("migration_overhead_ns", 0) / 1e6, "ms")
     
     # Benchmark 5: Tiered - Large payload (compression benefit)
-    print("\n[5/5] Tiered: Large payload (8KB, high compression benefit)...")
+    print("\n[5/6] Tiered: Large payload (8KB, high compression benefit)...")
     sim = Simulator()
     sim.start()
     sim.workload_random(n_ops=300, payload_size=8192, key_space=50, read_ratio=0.6)
@@ -78,6 +85,21 @@ def run_benchmark_suite():
     print("  Tier utilization:", large_payload_results.get("tier_utilization_bytes", {}))
     print("  Compression savings:", large_payload_results.get("compression_savings_bytes", {}))
     
+    # Benchmark 6: Tiered - Random workload behind a DRAM write-back buffer
+    print("\n[6/6] Tiered: Random workload with write-back buffer (256KB log)...")
+    sim = Simulator(write_buffer=WriteBackConfig(capacity_bytes=256 * 1024, flush_batch_bytes=64 * 1024))
+    sim.start()
+    sim.workload_random(n_ops=500, payload_size=2048, key_space=100, read_ratio=0.5)
+    sim.stop()
+    writeback_results = sim.get_summary()
+    all_results["tiered_random_writeback"] = writeback_results
+    print("  Write-back GET p99:", writeback_results.get("get", {}).get("p99_ns", 0) / 1e6, "ms")
+    print("  Write-back PUT p99:", writeback_results.get("put", {}).get("p99_ns", 0) / 1e6, "ms")
+    print("  Flushes:", writeback_results.get("wb_flush", {}).get("count", 0),
+          "p99:", writeback_results.get("wb_flush", {}).get("p99_ns", 0) / 1e6, "ms")
+    print("  Backpressure stalls:", writeback_results.get("wb_backpressure", {}).get("count", 0),
+          "p99:", writeback_results.get("wb_backpressure", {}).get("p99_ns", 0) / 1e6, "ms")
+    
     # Summary and export
     print("\n" + "=" * 80)
     print("BENCHMARK SUMMARY")
@@ -97,6 +119,7 @@ def run_benchmark_suite():
     print(f"  Sequential PUT p99:         {sequential_results.get('put', {}).get('p99_ns', baseline_put_p99) / 1e6:.2f} ms ({sequential_results.get('put', {}).get('p99_ns', baseline_put_p99) / baseline_put_p99:.2f}x)")
     print(f"  Random PUT p99:             {random_results.get('put', {}).get('p99_ns', baseline_put_p99) / 1e6:.2f} ms ({random_results.get('put', {}).get('p99_ns', baseline_put_p99) / baseline_put_p99:.2f}x)")
     print(f"  Hotspot PUT p99:            {hotspot_results.get('put', {}).get('p99_ns', baseline_put_p99) / 1e6:.2f} ms ({hotspot_results.get('put', {}).get('p99_ns', baseline_put_p99) / baseline_put_p99:.2f}x)")
+    print(f"  Random+write-back PUT p99:  {writeback_results.get('put', {}).get('p99_ns', baseline_put_p99) / 1e6:.2f} ms ({writeback_results.get('put', {}).get('p99_ns', baseline_put_p99) / baseline_put_p99:.2f}x)")
     
     # Save results to JSON
     with open("benchmark_results.json", "w") as f:
@@ -105,5 +128,41 @@ def run_benchmark_suite():
     
     print("\n" + "=" * 80)
 
+def run_ycsb_suite(names="abcdef", record_count: int = 1000, operation_count: int = 1000,
+                   out: str = "ycsb_results.json"):
+    """Load and run each YCSB core workload on a fresh simulator and export results."""
+    print("=" * 80)
+    print("YCSB CORE WORKLOADS")
+    print("=" * 80)
+    
+    all_results = {}
+    for i, name in enumerate(names, 1):
+        spec = ycsb.workload(name, record_count=record_count, operation_count=operation_count)
+        print(f"\n[{i}/{len(names)}] Workload {name.upper()} ({spec.request_distribution})...")
+        results = ycsb.run_workload(spec)
+        all_results[f"ycsb_{name}"] = results
+        info = results["ycsb"]
+        print(f"  Load: {info['load_ops_s']:,.0f} ops/s   Run: {info['run_ops_s']:,.0f} ops/s")
+        for op in ycsb.RUN_OPS:
+            if op in results:
+                print(f"  {op.upper():<18} p99: {results[op]['p99_ns'] / 1e6:.3f} ms  (n={results[op]['count']})")
+    
+    with open(out, "w") as f:
+        json.dump(all_results, f, indent=2)
+    print(f"\n✓ Results saved to {out}")
+    print("\n" + "=" * 80)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ycsb", action="store_true", help="run the YCSB A-F suite instead of the built-in workloads")
+    parser.add_argument("--ycsb-workloads", nargs="+", default=list("abcdef"), choices=list("abcdef"))
+    parser.add_argument("--records", type=int, default=1000, help="YCSB load-phase records")
+    parser.add_argument("--operations", type=int, default=1000, help="YCSB run-phase operations")
+    args = parser.parse_args()
+    if args.ycsb:
+        run_ycsb_suite(args.ycsb_workloads, args.records, args.operations)
+    else:
+        run_benchmark_suite()
+
 if __name__ == "__main__":
-    run_benchmark_suite()
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Build L3/DRAM tier configs from the Project 2 MLC and working-set measurements
+and print them next to the defaults.
+
+  python3 run_calibration.py
+  python3 run_calibration.py --manual-boundaries --json calibrated_tiers.json
+  python3 run_sweep.py --param tier_profile=default,calibrated   # use them in a sweep
+"""
+import argparse
+import json
+from dataclasses import asdict
+from cxl_sim import calibration
+from cxl_sim.tiers import default_tier_configs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results-dir", default=str(calibration.PROJECT2_RESULTS))
+    parser.add_argument("--manual-boundaries", action="store_true",
+                        help="use the plot script's manual cache boundaries instead of inferring them")
+    parser.add_argument("--json", help="write the calibrated tier configs to this JSON file")
+    args = parser.parse_args()
+
+    cal = calibration.calibrate(args.results_dir, manual_boundaries=args.manual_boundaries)
+    print("Sources:")
+    for what, src in cal.sources.items():
+        print(f"  {what:<22} {src}")
+    print(f"  cache boundaries (KB): {cal.cache_boundaries_kb}")
+
+    default = default_tier_configs()
+    calibrated = calibration.calibrated_tier_configs(cal)
+    print(f"\n{'tier':<8} {'field':<22} {'default':>16} {'calibrated':>16}")
+    for name in ("L3Cache", "DRAM"):
+        for field in ("capacity_bytes", "base_latency_ns", "bandwidth_bytes_per_s"):
+            print(f"{name:<8} {field:<22} {getattr(default[name], field):>16,} {getattr(calibrated[name], field):>16,}")
+    if cal.loaded_latency_curve:
+        print("\nDRAM loaded-latency curve (offered GB/s -> ns):")
+        for bw, lat in cal.loaded_latency_curve:
+            print(f"  {bw / 1e9:>8.2f} -> {lat:7.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({name: asdict(cfg) for name, cfg in calibrated.items()}, f, indent=2)
+        print(f"\n✓ Calibrated tier configs saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Analytical estimate of tier residency and get/put latency for a workload,
+without running the simulator.
+
+  python3 run_estimator.py --dist zipf --keys 1000000 --ops 10000000 --read-ratio 0.9
+  python3 run_estimator.py --validate        # error vs. Simulator on the standard workloads
+"""
+import argparse
+from cxl_sim import estimator
+from cxl_sim.policies import HotWarmColdPolicy
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dist", choices=["uniform", "hotspot", "zipf"], default="uniform")
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--zipf-s", type=float, default=0.99)
+    parser.add_argument("--hotspot-fraction", type=float, default=0.2)
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--read-ratio", type=float, default=0.5)
+    parser.add_argument("--payload-size", type=int, default=2048)
+    parser.add_argument("--hot-threshold", type=int, default=100)
+    parser.add_argument("--warm-threshold", type=int, default=20)
+    parser.add_argument("--calibrate", action="store_true", help="include measured sleep/Python overhead")
+    parser.add_argument("--validate", action="store_true")
+    args = parser.parse_args()
+
+    if args.validate:
+        print("Calibrating and running simulator scenarios...")
+        rows = estimator.validate()
+        print(f"\n{'scenario':<22} {'op':<4} {'metric':<8} {'simulated':>12} {'estimated':>12} {'error':>8}")
+        for r in rows:
+            print(f"{r['scenario']:<22} {r['op']:<4} {r['metric']:<8} {r['simulated']:>12.0f} "
+                  f"{r['estimated']:>12.0f} {r['rel_error'] * 100:>+7.1f}%")
+        return
+
+    if args.dist == "uniform":
+        pop = estimator.Popularity.uniform(args.keys)
+    elif args.dist == "hotspot":
+        pop = estimator.Popularity.hotspot(args.hotspot_fraction, args.keys)
+    else:
+        pop = estimator.Popularity.zipf(args.keys, args.zipf_s)
+    est = estimator.estimate(pop, args.ops, args.read_ratio, args.payload_size,
+                             policy=HotWarmColdPolicy(args.hot_threshold, args.warm_threshold),
+                             calibration=estimator.calibrate() if args.calibrate else None)
+    print(f"Feasible: {est.feasible}")
+    print("Residency (keys / MB):")
+    for tier, keys in est.residency_keys.items():
+        if keys > 0:
+            print(f"  {tier:<8} {keys:>14,.0f} {est.residency_bytes[tier] / 1e6:>12.2f}")
+    for op_name, stats in est.ops.items():
+        mix = ", ".join(f"{t} {f:.1%}" for t, f in est.tier_mix[op_name].items())
+        print(f"{op_name.upper()}: " + "  ".join(f"{k[:-3]}={v / 1e3:.1f}us" for k, v in stats.items()) + f"  [{mix}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Statistical benchmark harness: repeats each benchmark scenario until the
+confidence intervals converge and reports median + CI for throughput and
+each latency percentile.
+
+  python3 run_harness.py --save-baseline baseline.json     # record a baseline
+  python3 run_harness.py --baseline baseline.json          # compare; exit 1 on regression
+"""
+import argparse
+import sys
+from cxl_sim import harness
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(harness.SCENARIOS),
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--min-reps", type=int, default=5)
+    parser.add_argument("--max-reps", type=int, default=30)
+    parser.add_argument("--rel-ci", type=float, default=0.05, help="target CI half-width relative to the median")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--out", default="harness_results.json")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative regression threshold")
+    parser.add_argument("--save-baseline", help="also write results as a new baseline")
+    args = parser.parse_args()
+
+    scenarios = {name: harness.SCENARIOS[name] for name in args.scenario} if args.scenario else None
+    results = harness.run_suite(scenarios, min_reps=args.min_reps, max_reps=args.max_reps,
+                                rel_ci=args.rel_ci, confidence=args.confidence)
+    harness.save(results, args.out)
+    print(f"\n✓ Results saved to {args.out}")
+    if args.save_baseline:
+        harness.save(results, args.save_baseline)
+        print(f"✓ Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        rows = harness.compare(results, harness.load(args.baseline), threshold=args.threshold)
+        print("\n" + harness.format_diff(rows))
+        missing = [r for r in rows if r["missing"]]
+        if missing:
+            print(f"\n! {len(missing)} baseline metric(s) missing from this run:")
+            for r in missing:
+                print(f"  {r['scenario']}: {r['metric']}")
+        regressions = [r for r in rows if r["regressed"]]
+        if regressions:
+            print(f"\n✗ {len(regressions)} metric(s) regressed by more than {args.threshold:.0%} "
+                  "with non-overlapping CIs:")
+            print(harness.format_diff(regressions))
+            sys.exit(1)
+        print(f"\n✓ No metric regressed by more than {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
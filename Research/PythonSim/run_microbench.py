@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the simulator engine with all tier latencies set to zero.
+Reports ns/op and allocations/op for put, get, policy decision, metrics record
+and a migration scan at each key count.
+
+  python3 run_microbench.py                       # 1K, 10K, 100K, 1M keys
+  python3 run_microbench.py --sizes 1000 10000000 --json microbench.json
+"""
+import argparse
+import json
+from cxl_sim import microbench
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(microbench.DEFAULT_SIZES))
+    parser.add_argument("--max-ops", type=int, default=200_000, help="timed ops per component and size")
+    parser.add_argument("--alloc-ops", type=int, default=10_000, help="ops in the allocation-counting pass")
+    parser.add_argument("--payload-size", type=int, default=64)
+    parser.add_argument("--json", help="also write rows to this JSON file")
+    args = parser.parse_args()
+
+    rows = []
+    for n_keys in args.sizes:
+        print(f"Benchmarking {n_keys:,} keys...")
+        rows.extend(microbench.bench_size(n_keys, max_ops=args.max_ops, alloc_ops=args.alloc_ops,
+                                          payload_size=args.payload_size))
+    print()
+    print(microbench.format_table(rows))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n✓ Results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Throughput vs. client count: threads sharing one Simulator (GIL-bound) against
+worker processes sharing a shared-memory index and tier counters.
+
+  python3 run_multiproc.py --clients 1 2 4 8
+  python3 run_multiproc.py --zero-latency --workload hotspot --n-ops 20000 --json scaling.json
+"""
+import argparse
+import json
+from cxl_sim import microbench, multiproc
+from cxl_sim.sweep import DEFAULT_POLICY_ARGS, DEFAULT_WORKLOAD_ARGS
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--modes", nargs="+", default=["threads", "processes"], choices=["threads", "processes"])
+    parser.add_argument("--workload", default="random", choices=["random", "hotspot", "sequential"])
+    parser.add_argument("--n-ops", type=int, default=5000, help="ops per client")
+    parser.add_argument("--zero-latency", action="store_true",
+                        help="zero tier latencies, so only engine CPU time is measured")
+    parser.add_argument("--segments", type=int, default=64, help="lock segments of the shared index")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write rows to this JSON file")
+    args = parser.parse_args()
+
+    workload_args = dict(DEFAULT_WORKLOAD_ARGS[args.workload], n_ops=args.n_ops)
+    # Size the shared index for at most half occupancy of the keys the workload touches
+    n_keys = {"random": workload_args.get("key_space", 100), "sequential": args.n_ops,
+              "hotspot": int(100 / workload_args.get("hotspot_fraction", 0.2))}[args.workload]
+    per_segment = max(64, -(-2 * n_keys // args.segments))
+    layout = multiproc.SharedLayout(capacity=args.segments * per_segment, segments=args.segments,
+                                    value_bytes=workload_args["payload_size"])
+    rows = multiproc.scaling_curve(
+        args.clients, modes=args.modes, workload=args.workload, workload_args=workload_args,
+        tier_configs=microbench.zero_latency_tier_configs() if args.zero_latency else None,
+        policy_args=DEFAULT_POLICY_ARGS, layout=layout, seed=args.seed)
+    print(multiproc.format_table(rows))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n✓ Scaling rows saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Find the cheapest DRAM/CXL/SSD capacity mix that meets a p99 latency target.
+
+  python3 run_sizing.py --slo-us 50 --dist zipf --keys 1000000 --ops 10000000 --read-ratio 0.9
+  python3 run_sizing.py --slo-us 200 --trace keys.txt --read-ratio 0.8
+  python3 run_sizing.py --slo-us 200 --mode simulator --workload hotspot --keys 500
+
+Prices are $/GB (--price DRAM=3.0 --price CXL=1.5 --price SSD=0.08 by default).
+Prints the cost vs. p99 Pareto frontier and writes it to --out.
+
+Simulator mode runs --workload (random or hotspot) over --keys keys, once per
+grid point, so its defaults are much smaller: 1,000 keys, 2,000 ops and a
+4-point grid per tier (64 runs). --trace and --dist are estimator-only.
+"""
+import argparse
+import csv
+from cxl_sim import estimator, sizing
+
+DEFAULT_OPS = 1_000_000
+DEFAULT_KEYS = 100_000
+DEFAULT_STEPS = 12
+SIMULATOR_DEFAULTS = {"ops": 2_000, "keys": 1_000, "steps": 4}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slo-us", type=float, required=True, help="p99 latency target (microseconds)")
+    parser.add_argument("--op", choices=["get", "put", "max"], default="get", help="which p99 the SLO applies to")
+    parser.add_argument("--price", action="append", default=[], help="TIER=$/GB (repeatable)")
+    parser.add_argument("--mode", choices=["estimator", "simulator"], default="estimator")
+    parser.add_argument("--dist", choices=["uniform", "hotspot", "zipf"], default=None,
+                        help="estimator mode: key popularity (default zipf)")
+    parser.add_argument("--trace", help="estimator mode: file with one key per line; overrides --dist/--keys")
+    parser.add_argument("--keys", type=int, default=None, help="key space (default 100,000; simulator 1,000)")
+    parser.add_argument("--zipf-s", type=float, default=0.99)
+    parser.add_argument("--ops", type=int, default=None,
+                        help="operations (default: trace length, else 1,000,000; simulator 2,000)")
+    parser.add_argument("--read-ratio", type=float, default=0.9)
+    parser.add_argument("--payload-size", type=int, default=2048)
+    parser.add_argument("--workload", choices=sizing.SIMULATOR_WORKLOADS, default="random",
+                        help="simulator mode: Simulator.workload_<name>")
+    parser.add_argument("--steps", type=int, default=None, help="capacity grid points per tier (default 12; simulator 4)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sizing_frontier.csv")
+    args = parser.parse_args()
+
+    prices = dict(sizing.DEFAULT_PRICES_PER_GB)
+    for spec in args.price:
+        tier, _, price = spec.partition("=")
+        prices[tier] = float(price)
+    slo_ns = args.slo_us * 1e3
+
+    if args.mode == "simulator":
+        if args.trace or args.dist:
+            parser.error("--trace and --dist are estimator-only; use --workload and --keys in simulator mode")
+        for name, default in SIMULATOR_DEFAULTS.items():
+            if getattr(args, name) is None:
+                setattr(args, name, default)
+    if args.keys is None:
+        args.keys = DEFAULT_KEYS
+    if args.steps is None:
+        args.steps = DEFAULT_STEPS
+
+    if args.mode == "estimator":
+        if args.trace:
+            with open(args.trace) as f:
+                keys = [line.strip() for line in f if line.strip()]
+            pop = estimator.Popularity.from_trace(keys)
+            if args.ops is None:
+                args.ops = len(keys)
+        elif args.dist == "uniform":
+            pop = estimator.Popularity.uniform(args.keys)
+        elif args.dist == "hotspot":
+            pop = estimator.Popularity.hotspot(total_keys=args.keys)
+        else:  # zipf, the default
+            pop = estimator.Popularity.zipf(args.keys, args.zipf_s)
+        if args.ops is None:
+            args.ops = DEFAULT_OPS
+        grids = {t: sizing.capacity_grid(pop.probs.size * args.payload_size, args.steps) for t in prices}
+        print(f"Screening {args.steps ** len(prices):,} capacity mixes with the analytical estimator...")
+        candidates = sizing.search_estimator(pop, args.ops, args.read_ratio, args.payload_size, prices,
+                                             grids=grids, op=args.op, calibration=estimator.calibrate())
+    else:
+        workload_params = sizing.simulator_workload(args.workload, args.ops, args.keys, args.read_ratio,
+                                                    args.payload_size)
+        grids = {t: sizing.capacity_grid(args.keys * args.payload_size, args.steps) for t in prices}
+        print(f"Simulating {args.steps ** len(prices):,} capacity mixes ({args.ops:,} ops each)...")
+        candidates = sizing.search_simulator(workload_params, prices, grids, op=args.op, workers=args.workers)
+
+    frontier, best = sizing.summarize(candidates, slo_ns)
+    tiers = list(prices)
+    print(f"\nPareto frontier (cost vs. {args.op} p99):")
+    print(f"{'cost $':>12} {'p99 us':>10}  " + "  ".join(f"{t + ' MB':>12}" for t in tiers))
+    for c in frontier:
+        mark = "  <= SLO" if c.meets(slo_ns) else ""
+        print(f"{c.cost:>12.4f} {c.p99_ns / 1e3:>10.1f}  "
+              + "  ".join(f"{c.capacities[t] / 2 ** 20:>12.2f}" for t in tiers) + mark)
+    if best:
+        print(f"\nCheapest mix meeting p99 <= {args.slo_us} us: ${best.cost:.4f} "
+              + ", ".join(f"{t}={best.capacities[t] / 2 ** 20:.2f} MB" for t in tiers))
+    else:
+        print(f"\nNo candidate meets p99 <= {args.slo_us} us")
+
+    with open(args.out, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["cost", "p99_ns", *[f"{t}_capacity_bytes" for t in tiers]])
+        for c in frontier:
+            writer.writerow([c.cost, c.p99_ns, *[c.capacities[t] for t in tiers]])
+    print(f"✓ Frontier saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
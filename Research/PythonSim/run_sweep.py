@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Resumable parameter sweeps over tier capacities, policy thresholds and workloads.
+
+Examples:
+  python3 run_sweep.py --param policy.hot_threshold=10,50,100 --param workload.read_ratio=0.5,0.9
+  python3 run_sweep.py --random 40 --param tier.DRAM.capacity_bytes=1048576:67108864 --param workload=random,hotspot
+
+Values are comma-separated lists (grid) or lo:hi ranges (random search only).
+Results are cached per configuration in --cache-dir; re-running only simulates new points.
+"""
+import argparse
+import ast
+from cxl_sim.sweep import grid, random_search, run_sweep, tidy, write_csv
+
+def parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+def parse_params(specs, allow_ranges):
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if ":" in values and allow_ranges:
+            lo, hi = values.split(":", 1)
+            space[name] = (parse_value(lo), parse_value(hi))
+        else:
+            space[name] = [parse_value(v) for v in values.split(",")]
+    return space
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--param", action="append", default=[], help="name=v1,v2,... or name=lo:hi")
+    parser.add_argument("--random", type=int, default=0, help="sample N random points instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0, help="seed for random search")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=".sweep_cache")
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    space = parse_params(args.param, allow_ranges=args.random > 0)
+    points = random_search(space, args.random, seed=args.seed) if args.random else grid(space)
+    entries = run_sweep(points, cache_dir=args.cache_dir, workers=args.workers)
+    rows = tidy(entries)
+    write_csv(rows, args.out)
+    print(f"✓ {len(rows)} rows written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from cxl_sim.datastructures import TieredBTree
+from cxl_sim.tiers import Tier, TierConfig
+
+
+class RecordingTier(Tier):
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.reads = []
+
+    def access(self, bytes_count, write=False):
+        if not write:
+            self.reads.append(bytes_count)
+        return 0
+
+
+class OneTier:
+    def choose_tier(self, stats):
+        return "SSD"
+
+
+def test_scan_requests_fit_readahead():
+    # BDP = 1 GB/s x 10 us = 10,000 bytes; leaves are 4 x 1000 bytes
+    tier = RecordingTier(TierConfig("SSD", capacity_bytes=1 << 30, base_latency_ns=10_000,
+                                    bandwidth_bytes_per_s=1_000_000_000))
+    tree = TieredBTree({"SSD": tier}, OneTier(), order=4)
+    for i in range(100):
+        tree.put(f"k{i:03d}", bytes(1000))
+    limit = tree.readahead_bytes("SSD")
+    assert limit == 10_000
+
+    for reverse in (False, True):
+        tier.reads.clear()
+        rows = tree.scan("k000", "k100", reverse=reverse)
+        assert len(rows) == 100
+        assert sum(tier.reads) == 100 * 1000
+        assert all(n <= limit for n in tier.reads)
+        assert tier.reads[:-1] == [8000] * (len(tier.reads) - 1)  # two whole leaves per request
+
+
+def test_leaf_larger_than_readahead_is_one_request():
+    tier = RecordingTier(TierConfig("SSD", capacity_bytes=1 << 30, base_latency_ns=1_000,
+                                    bandwidth_bytes_per_s=1_000_000_000))
+    tree = TieredBTree({"SSD": tier}, OneTier(), order=4)
+    for i in range(8):
+        tree.put(f"k{i}", bytes(1000))
+    tree.scan()
+    assert tier.reads == [4000, 4000]
+
+
+def test_readahead_follows_modelled_latency():
+    # Loaded-latency curve: 2 us idle, 8 us at 1 GB/s offered
+    dram = RecordingTier(TierConfig("DRAM", capacity_bytes=1 << 30, base_latency_ns=100,
+                                    bandwidth_bytes_per_s=1_000_000_000,
+                                    loaded_latency_curve=[(0.0, 2_000.0), (1e9, 8_000.0)]))
+    ssd = Tier(TierConfig("SSD", capacity_bytes=1 << 30, base_latency_ns=100_000,
+                          bandwidth_bytes_per_s=2_000_000_000, latency_profile="fio"))
+    tree = TieredBTree({"DRAM": dram, "SSD": ssd}, OneTier())
+    assert tree.readahead_bytes("DRAM") == 2_000
+    dram.offered_bw = 5e8
+    assert tree.readahead_bytes("DRAM") == 5_000
+    median_ns = ssd.latency_model.lookup(4096, write=False).quantile_ns(0.5)
+    assert median_ns != 100_000
+    assert tree.readahead_bytes("SSD") == int(2_000_000_000 * median_ns / 1e9)
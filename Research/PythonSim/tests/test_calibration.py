@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from cxl_sim.calibration import distinct_levels, isotonic_fit, monotone_curve
+
+
+def test_isotonic_fit_pools_violators():
+    fit = isotonic_fit([1.0, 3.0, 2.0, 4.0, 0.0])
+    assert np.all(np.diff(fit) >= 0)
+    np.testing.assert_allclose(fit, [1.0, 2.25, 2.25, 2.25, 2.25])
+
+
+def test_outlier_does_not_lift_the_curve():
+    curve = monotone_curve([100, 200, 300, 400], [100.0, 300.0, 100.0, 100.0], idle_latency_ns=90.0)
+    assert curve[0] == (0.0, 90.0)
+    assert max(lat for _, lat in curve) == pytest.approx(500.0 / 3)  # a running max would hold 300 ns
+
+
+def test_distinct_levels():
+    assert distinct_levels([32, 256, 6144])
+    assert not distinct_levels([1792, 2048, 2304])
+    assert not distinct_levels([32, 256])
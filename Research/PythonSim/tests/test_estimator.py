@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from cxl_sim import estimator
+from cxl_sim.calibration import calibrated_tier_configs
+from cxl_sim.eventlog import EventLog
+from cxl_sim.policies import HotWarmColdPolicy
+from cxl_sim.simulator import Simulator
+from cxl_sim.tiers import Tier
+
+
+def test_estimator_latency_matches_simulated_charges_on_calibrated_tiers(tmp_path):
+    cfgs = calibrated_tier_configs()
+    assert cfgs["DRAM"].loaded_latency_curve
+    cfgs["SSD"] = replace(cfgs["SSD"], latency_profile="fio")
+    path = str(tmp_path / "run.events")
+    random.seed(0)
+    sim = Simulator(tiers={name: Tier(cfg) for name, cfg in cfgs.items()},
+                    policy=HotWarmColdPolicy(hot_threshold=10, warm_threshold=5), event_log=path)
+    sim.migration_scan_interval = 0.02
+    sim.start()
+    sim.workload_random(n_ops=1500, payload_size=2048, key_space=20, read_ratio=0.7)
+    sim.stop()
+
+    log = EventLog(path)
+    checked = set()
+    for op in ("get", "put"):
+        rows = log.records[log.op_mask(op)]
+        for idx in np.unique(rows["tier"]).tolist():
+            charged = rows[rows["tier"] == idx]["latency_ns"]
+            if charged.size < 50:
+                continue
+            name = log.tier_names[idx]
+            predicted = estimator.access_latency_ns(cfgs[name], 2048, write=op == "put")
+            assert charged.mean() == pytest.approx(predicted, rel=0.25), (op, name)
+            checked.add(name)
+    assert {"DRAM", "SSD"} <= checked
+
+
+def test_full_tier_spills_to_next_slower_tier_as_estimated():
+    cfgs = {name: replace(cfg, base_latency_ns=0, bandwidth_bytes_per_s=0, latency_profile=None)
+            for name, cfg in estimator.default_tier_configs().items()}
+    cfgs["DRAM"] = replace(cfgs["DRAM"], capacity_bytes=3 * 1024)
+    sim = Simulator(tiers={name: Tier(cfg) for name, cfg in cfgs.items()},
+                    policy=HotWarmColdPolicy(hot_threshold=1000, warm_threshold=0))
+    for i in range(4):
+        sim.ds.put(f"k{i}", b"v" * 1024)
+    placed = [sim.ds.locate(f"k{i}")[0] for i in range(4)]
+    assert placed == ["DRAM", "DRAM", "DRAM", "CXL"]
+
+    est = estimator.estimate(estimator.Popularity.uniform(4), 400, read_ratio=0.0, payload_size=1024,
+                             tiers=cfgs, policy=HotWarmColdPolicy(hot_threshold=1000, warm_threshold=0))
+    assert est.feasible
+    assert est.residency_keys["DRAM"] == pytest.approx(3, rel=0.01)
+    assert est.residency_keys["CXL"] == pytest.approx(1, rel=0.01)
+
+
+# |p99 error| bounds on the shipped scenarios: median over scenario/op pairs, and worst pair
+P99_MEDIAN_ERROR_BOUND = 0.3
+P99_MAX_ERROR_BOUND = 1.0
+P99_REPS = 5
+# Background-thread pauses make the op noise bursty; a burst caught by calibration
+# or by the simulator runs fails one attempt, a systematic bias fails all of them
+P99_ATTEMPTS = 3
+
+
+@pytest.fixture
+def exact_sleeps(monkeypatch):
+    """Short sleeps advance a per-thread clock instead of waiting on the OS timer, whose
+    overshoot on a shared machine swings by several x within seconds."""
+    real_sleep, real_time_ns, real_perf_counter_ns = time.sleep, time.time_ns, time.perf_counter_ns
+    clock = threading.local()
+
+    def sleep(seconds):
+        if seconds >= 0.01:  # background pass intervals
+            real_sleep(seconds)
+        else:
+            clock.offset_ns = getattr(clock, "offset_ns", 0) + int(seconds * 1e9)
+    monkeypatch.setattr(time, "sleep", sleep)
+    monkeypatch.setattr(time, "time_ns", lambda: real_time_ns() + getattr(clock, "offset_ns", 0))
+    monkeypatch.setattr(time, "perf_counter_ns", lambda: real_perf_counter_ns() + getattr(clock, "offset_ns", 0))
+
+
+def test_estimated_p99_tracks_simulator_on_shipped_scenarios(exact_sleeps):
+    attempts = []
+    for _ in range(P99_ATTEMPTS):
+        rows = estimator.validate(calibration=estimator.calibrate(), reps=P99_REPS)
+        errors = {(r["scenario"], r["op"]): abs(r["rel_error"]) for r in rows if r["metric"] == "p99_ns"}
+        assert len(errors) == 2 * len(estimator.VALIDATION_SCENARIOS)
+        attempts.append(errors)
+        if np.median(list(errors.values())) <= P99_MEDIAN_ERROR_BOUND and max(errors.values()) <= P99_MAX_ERROR_BOUND:
+            return
+    pytest.fail(f"p99 error above bounds in every attempt: {attempts}")
@@ -0,0 +1,36 @@
+import threading
+
+from cxl_sim.eventlog import OP_GET, EventLog, EventRecorder
+
+
+def test_key_ids_stay_dense_across_threads(tmp_path):
+    path = str(tmp_path / "run.events")
+    rec = EventRecorder(path, ["DRAM"])
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        for i in range(2000):
+            rec.record(OP_GET, f"k{i}", "DRAM", 64, 0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    rec.close()
+
+    log = EventLog(path)
+    assert sorted(rec._key_ids.values()) == list(range(2000))
+    assert None not in log.keys
+    assert {log.keys[kid] for kid in log.key_id.tolist()} == {f"k{i}" for i in range(2000)}
+
+
+def test_tuple_keys_round_trip(tmp_path):
+    path = str(tmp_path / "run.events")
+    rec = EventRecorder(path, ["DRAM"])
+    rec.record(OP_GET, ("user", 7), "DRAM", 64, 0)
+    rec.close()
+    log = EventLog(path)
+    assert log.keys[int(log.key_id[0])] == ("user", 7)
+    hash(log.keys[0])
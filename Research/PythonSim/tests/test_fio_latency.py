@@ -0,0 +1,45 @@
+import threading
+from dataclasses import replace
+
+from cxl_sim.tiers import Tier, default_tier_configs
+
+
+def test_default_ssd_uses_fio_profile_with_opt_out():
+    assert default_tier_configs()["SSD"].latency_profile == "fio"
+    assert default_tier_configs(ssd_latency_profile=None)["SSD"].latency_profile is None
+
+
+def test_queue_depth_follows_outstanding_accesses():
+    tier = Tier(replace(default_tier_configs()["SSD"], bandwidth_bytes_per_s=0))
+    depths = []
+    lookup = tier.latency_model.lookup
+
+    def recording_lookup(nbytes, write, iodepth=None):
+        depths.append(iodepth)
+        return lookup(nbytes, write, iodepth)
+
+    tier.latency_model.lookup = recording_lookup
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        for _ in range(20):
+            tier.access(4096)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(depths) > 1
+    assert tier._inflight == 0
+
+    depths.clear()
+    tier.access(4096)
+    assert depths == [1]
+
+
+def test_pinned_iodepth_overrides_concurrency():
+    tier = Tier(replace(default_tier_configs()["SSD"], latency_iodepth=32))
+    dist = tier.latency_model.lookup(4096, False, 32)
+    assert tier.latency_points_ns(4096)[0] == dist.table[0] + tier._extra_ns(0)
@@ -0,0 +1,25 @@
+from cxl_sim.harness import compare
+
+
+def stat(median, lo, hi):
+    return {"median": median, "ci_low": lo, "ci_high": hi, "n": 5}
+
+
+def test_regression_needs_separated_cis():
+    baseline = {"s": {"put.p99_ns": stat(100, 90, 110), "get.p99_ns": stat(100, 95, 105),
+                      "throughput_ops_s": stat(1000, 990, 1010)}}
+    current = {"s": {"put.p99_ns": stat(120, 105, 140),      # worse, but CIs overlap
+                     "get.p99_ns": stat(120, 115, 125),      # worse, CIs apart
+                     "throughput_ops_s": stat(850, 840, 860)}}
+    rows = {r["metric"]: r for r in compare(current, baseline, threshold=0.10)}
+    assert not rows["put.p99_ns"]["regressed"]
+    assert rows["get.p99_ns"]["regressed"]
+    assert rows["throughput_ops_s"]["regressed"]
+
+
+def test_missing_baseline_metrics_are_listed():
+    baseline = {"s": {"put.p99_ns": stat(100, 90, 110), "wb_flush.p99_ns": stat(50, 40, 60)},
+                "not_run": {"put.p99_ns": stat(100, 90, 110)}}
+    current = {"s": {"put.p99_ns": stat(100, 90, 110)}}
+    missing = [(r["scenario"], r["metric"]) for r in compare(current, baseline) if r["missing"]]
+    assert missing == [("s", "wb_flush.p99_ns")]
@@ -0,0 +1,39 @@
+from cxl_sim.replication import ReplicaManager, ReplicationConfig
+from cxl_sim.tiers import Tier, TierConfig
+
+
+def make_tiers(replica_capacity):
+    return {
+        "SSD": Tier(TierConfig("SSD", capacity_bytes=1 << 20, base_latency_ns=0, bandwidth_bytes_per_s=0)),
+        "DRAM": Tier(TierConfig("DRAM", capacity_bytes=replica_capacity, base_latency_ns=0, bandwidth_bytes_per_s=0)),
+    }
+
+
+def test_update_into_full_replica_tier_drops_replica():
+    tiers = make_tiers(replica_capacity=1024)
+    mgr = ReplicaManager(tiers, ReplicationConfig(replica_tiers=("DRAM",), write_mode="update"))
+    mgr._replicate("k", "SSD", 256)
+    assert mgr._replicas["k"] == (("DRAM",), 256)
+    tiers["DRAM"].place(700)  # leaves 68 bytes free, no dead space to compact
+
+    mgr.on_write("k", b"x" * 512)
+
+    assert "k" not in mgr._replicas
+    assert mgr.replica_bytes == 0
+    assert mgr.dropped == 1 and mgr.updates == 0
+    dram = tiers["DRAM"]
+    assert dram.used_bytes - dram.dead_bytes == 700  # only the filler is live
+
+
+def test_update_swaps_sizes_after_reserving():
+    tiers = make_tiers(replica_capacity=4096)
+    mgr = ReplicaManager(tiers, ReplicationConfig(replica_tiers=("DRAM",), write_mode="update"))
+    mgr._replicate("k", "SSD", 256)
+
+    mgr.on_write("k", b"x" * 512)
+
+    assert mgr._replicas["k"] == (("DRAM",), 512)
+    assert mgr.replica_bytes == 512
+    dram = tiers["DRAM"]
+    assert dram.used_bytes - dram.dead_bytes == 512
+    assert dram.dead_bytes == 256
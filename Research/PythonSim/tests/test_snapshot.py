@@ -0,0 +1,84 @@
+from cxl_sim.replication import ReplicationConfig
+from cxl_sim.simulator import Simulator
+from cxl_sim.snapshot import MappedKeys, load_snapshot, save_snapshot
+from cxl_sim.tiers import Tier, TierConfig
+
+
+def make_tiers():
+    return {name: Tier(TierConfig(name, capacity_bytes=1 << 24, base_latency_ns=0, bandwidth_bytes_per_s=0,
+                                  latency_profile=None))
+            for name in ("L3Cache", "DRAM", "CXL", "SSD", "HDD")}
+
+
+def test_btree_restore_is_lazy_and_editable(tmp_path):
+    sim = Simulator(tiers=make_tiers(), structure="btree")
+    for i in range(50):
+        sim.ds.put(f"k{i:02d}", bytes([i]) * 16)
+    sim.ds.put("k01", b"again")
+    sim.ds.scan("k00", "k10")
+    path = str(tmp_path / "bt.snap")
+    save_snapshot(sim, path)
+
+    restored = load_snapshot(path, Simulator(tiers=make_tiers(), structure="btree"))
+    ds = restored.ds
+    assert isinstance(ds._keys, MappedKeys)
+    assert ds.get("k07") == bytes([7]) * 16
+    assert ds._versions["k01"] == 2
+    assert restored.metrics.scan_keys == sim.metrics.scan_keys == 10
+
+    ds.put("k07x", b"new")
+    ds.put("k10", b"rewritten")
+    assert ds.delete("k03")
+    assert ds.delete("k07x")
+    ds.put("k07y", b"new")
+    ds.put("k03", b"back")
+    assert ds.delete("k04")
+    # Edits stay in the overlay; the mapped rows are untouched
+    assert ds._keys._added == ["k07y"] and ds._keys._deleted == [4]
+    assert ds.get("k07y") == b"new" and ds.get("k10") == b"rewritten" and ds.get("k03") == b"back"
+    assert ds.get("k04") is None
+    keys = [k for k, _ in ds.scan("k02", "k09")]
+    assert keys == ["k02", "k03", "k05", "k06", "k07", "k07y", "k08"]
+    assert [k for k, _ in ds.scan("k07", reverse=True, limit=3)] == ["k49", "k48", "k47"]
+    expected = sorted([f"k{i:02d}" for i in range(50) if i != 4] + ["k07y"])
+    assert list(ds._keys) == expected and len(ds._keys) == len(expected)
+    for start in range(len(expected)):
+        assert ds._keys[start:start + 3] == expected[start:start + 3]
+        assert ds._keys.bisect_left(expected[start]) == start
+
+
+def test_migration_sweep_is_bounded(tmp_path):
+    sim = Simulator(tiers=make_tiers())
+    for i in range(100):
+        sim.ds.put(f"k{i}", b"v" * 8)
+    path = str(tmp_path / "hm.snap")
+    save_snapshot(sim, path)
+
+    restored = load_snapshot(path, Simulator(tiers=make_tiers()))
+    meta = restored.ds._meta
+    first = meta.sweep(30)
+    second = meta.sweep(30)
+    assert len(first) == len(second) == 30
+    assert not {k for k, _ in first} & {k for k, _ in second}
+    assert not meta._overlay  # sweeping does not materialize rows
+
+
+def test_replicas_and_pauses_survive_restore(tmp_path):
+    cfg = ReplicationConfig(replica_tiers=("DRAM",))
+    sim = Simulator(tiers=make_tiers(), replication=cfg)
+    sim.ds.put("hot", b"h" * 64)
+    primary = sim.ds.locate("hot")[0]
+    sim.replicas._replicate("hot", primary, 64)
+    sim.metrics.record_migration_commit(1234, True)
+    path = str(tmp_path / "rep.snap")
+    save_snapshot(sim, path)
+
+    restored = load_snapshot(path, Simulator(tiers=make_tiers(), replication=cfg))
+    assert restored.replicas._replicas["hot"] == (("DRAM",), 64)
+    assert restored.replicas.replica_bytes == 64
+    assert restored.tiers["DRAM"].dead_bytes == 0
+    assert restored.metrics.migration_pause_ns == [1234]
+    assert restored.replicas.drop("hot") == 1
+
+    plain = load_snapshot(path, Simulator(tiers=make_tiers()))
+    assert plain.tiers["DRAM"].dead_bytes == sim.replicas.tier_bytes()["DRAM"]
@@ -0,0 +1,16 @@
+from cxl_sim import sweep
+
+
+def test_fio_results_invalidate_cached_points(tmp_path):
+    (tmp_path / "fio_a.txt").write_text("a")
+    cfg = sweep.resolve({})
+    cfg["tiers"]["SSD"]["latency_profile"] = str(tmp_path)
+    before = sweep.config_hash(cfg)
+
+    (tmp_path / "fio_b.txt").write_text("b")
+    sweep.profile_hash.cache_clear()
+    added = sweep.config_hash(cfg)
+    (tmp_path / "fio_a.txt").write_text("a, rerun")
+    sweep.profile_hash.cache_clear()
+    edited = sweep.config_hash(cfg)
+    assert len({before, added, edited}) == 3
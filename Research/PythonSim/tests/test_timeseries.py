@@ -0,0 +1,33 @@
+from cxl_sim.timeseries import TimeSeries
+
+W = 1_000_000_000_000  # 1000 s windows, so wall time never closes one during the test
+
+
+def make_series(**kwargs):
+    ts = TimeSeries(window_ns=W, **kwargs)
+    ts._new_window(0)
+    return ts
+
+
+def test_late_op_is_charged_to_its_closed_window():
+    ts = make_series()
+    ts.record("get", 10, 100)
+    ts.record("get", W + 10, 200)    # closes window 0
+    ts.record("get", 20, 900)        # late: belongs to window 0
+    ts.record("get", 2 * W + 5, 1)   # closes window 1
+    first, second = list(ts.windows)
+    assert first["ops"]["get"]["count"] == 2
+    assert first["ops"]["get"]["max_ns"] == 900
+    assert second["ops"]["get"]["count"] == 1
+
+
+def test_op_older_than_kept_windows_goes_to_current_window():
+    ts = make_series(late_windows=1)
+    ts.record("put", 10, 100)
+    ts.record("put", W + 10, 100)
+    ts.record("put", 2 * W + 10, 100)
+    ts.record("put", 20, 700)        # window 0 is no longer kept
+    ts.record("put", 3 * W + 10, 100)
+    counts = [w["ops"]["put"]["count"] for w in ts.windows]
+    assert counts == [1, 1, 2]
+    assert sum(counts) + 1 == 5      # the last put is in the open window
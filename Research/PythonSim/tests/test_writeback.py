@@ -0,0 +1,48 @@
+import threading
+
+from cxl_sim.metrics import Metrics
+from cxl_sim.tiers import Tier, TierConfig
+from cxl_sim.writeback import WriteBackBuffer, WriteBackConfig
+
+
+def make_tiers():
+    return {name: Tier(TierConfig(name, capacity_bytes=1 << 24, base_latency_ns=0, bandwidth_bytes_per_s=0,
+                                  latency_profile=None))
+            for name in ("DRAM", "SSD")}
+
+
+def test_concurrent_appends_never_overfill_the_log():
+    cfg = WriteBackConfig(capacity_bytes=4096, flush_batch_bytes=2048, flush_interval=0.01)
+    wb = WriteBackBuffer(make_tiers(), cfg, Metrics())
+    peak = [0]
+    flush = wb.flush
+
+    def checked_flush():
+        peak[0] = max(peak[0], wb.used_bytes)
+        return flush()
+
+    wb.flush = checked_flush
+    wb.start()
+
+    def writer(t):
+        for i in range(200):
+            assert wb.append((t, i), "SSD", b"x" * 512)
+            peak[0] = max(peak[0], wb.used_bytes)
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wb.stop()
+    assert peak[0] <= cfg.capacity_bytes
+    assert wb.used_bytes == 0
+
+
+def test_full_log_without_flusher_drains_inline():
+    metrics = Metrics()
+    wb = WriteBackBuffer(make_tiers(), WriteBackConfig(capacity_bytes=1024, flush_batch_bytes=1 << 20), metrics)
+    for i in range(5):
+        assert wb.append(i, "SSD", b"x" * 512)
+    assert wb.used_bytes == 512
+    assert len(metrics.latencies_ns["wb_backpressure"]) == 2
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel rebuild of the Project2/Project3 tables and figures.
+
+Every parser, table and figure produced by Project2/scripts/plot_project2.py
+and Project3/parse_results.py is a task with declared inputs, outputs and
+upstream tasks. A task's key hashes
+
+  * the contents of its input files (re-hashed only when size/mtime change),
+  * the source of the script functions/constants it runs and, transitively,
+    of every top-level name they reference (so editing one plot function
+    only invalidates that plot),
+  * the parsed data it receives from upstream tasks.
+
+A task whose key matches the last successful run and whose outputs exist
+is skipped. A task runs only when all its required inputs exist and, if
+it has only optional inputs, at least one of them does. Parsers hand their DataFrames to figure tasks through pickles
+in .pipeline/artifacts/, so re-rendering a plot never re-parses
+FIO_Benchmark.txt or re-pivots the perf CSV. Ready tasks run concurrently
+in a process pool with matplotlib's Agg backend.
+
+  python3 analysis_pipeline.py                 # rebuild whatever is stale
+  python3 analysis_pipeline.py --list          # show task status without running
+  python3 analysis_pipeline.py --only p3_ --force -j 4
+"""
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import pathlib
+import pickle
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+ROOT = pathlib.Path(__file__).resolve().parent
+STATE_DIR = ROOT / '.pipeline'
+ARTIFACT_DIR = STATE_DIR / 'artifacts'
+STATE_FILE = STATE_DIR / 'state.json'
+
+P2_SCRIPT = 'scripts/plot_project2.py'
+P3_SCRIPT = 'parse_results.py'
+
+@dataclass
+class Task:
+    name: str
+    project: str                  # directory the script runs in (its paths are relative to it)
+    script: str
+    runner: str                   # key into RUNNERS
+    call: Optional[str] = None    # script function the runner invokes
+    inputs: List[str] = field(default_factory=list)    # required
+    optional: List[str] = field(default_factory=list)  # used if present
+    outputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    artifact: bool = False        # hands a DataFrame to dependent tasks
+
+def _fig(name, project, script, runner, call, outputs, **kw) -> Task:
+    return Task(name, project, script, runner, call, outputs=outputs, **kw)
+
+TASKS = [
+    # Project3: one parse of FIO_Benchmark.txt, then each experiment from the parsed frame
+    Task('p3_parse', 'Project3', P3_SCRIPT, 'p3_parse', inputs=['results/FIO_Benchmark.txt'],
+         outputs=['tables/all_jobs.csv', 'tables/raw_jobs.json'], artifact=True),
+    _fig('p3_baselines', 'Project3', P3_SCRIPT, 'with_frame', 'zero_queue_baselines', ['baseline_table.md'],
+         deps=['p3_parse']),
+    _fig('p3_block_size', 'Project3', P3_SCRIPT, 'with_frame', 'block_size_sweep',
+         ['plots/bsweep_randread.png', 'plots/bsweep_read.png'], deps=['p3_parse']),
+    _fig('p3_mix', 'Project3', P3_SCRIPT, 'with_frame', 'mix_sweep', ['plots/mix_sweep.png'], deps=['p3_parse']),
+    _fig('p3_queue_depth', 'Project3', P3_SCRIPT, 'with_frame', 'queue_depth_sweep',
+         ['plots/qd_tradeoff.png', 'tail_latency.md'], deps=['p3_parse']),
+    # Project2: the perf CSV is pivoted once (and cached column-wise by plot_project2 itself)
+    Task('p2_perf', 'Project2', P2_SCRIPT, 'p2_perf', inputs=['results/perf_cachemiss_sweep.csv'], artifact=True),
+    _fig('p2_cache_miss', 'Project2', P2_SCRIPT, 'with_frame', 'plot_cache_miss_impact',
+         ['results/plots/cache_miss_impact.png'], deps=['p2_perf']),
+    _fig('p2_tlb_miss', 'Project2', P2_SCRIPT, 'with_frame', 'plot_tlb_miss_impact',
+         ['results/plots/tlb_miss_impact.png'], deps=['p2_perf']),
+    _fig('p2_stride_pattern', 'Project2', P2_SCRIPT, 'with_frame', 'plot_stride_pattern',
+         ['results/plots/stride_pattern_heatmap.png', 'results/plots/stride_pattern_lines.png'], deps=['p2_perf']),
+    _fig('p2_hugepage', 'Project2', P2_SCRIPT, 'with_frame', 'plot_hugepage_benefit',
+         ['results/plots/hugepage_benefit.png'], deps=['p2_perf']),
+    _fig('p2_working_set', 'Project2', P2_SCRIPT, 'p2_working_set', 'plot_working_set',
+         ['results/plots/working_set_latency.png'], inputs=['results/working_set_latency.csv']),
+    _fig('p2_baseline_table', 'Project2', P2_SCRIPT, 'p2_working_set', 'write_baseline_latency_table',
+         ['results/baseline_latency_table.md'], inputs=['results/working_set_latency.csv']),
+    _fig('p2_intensity', 'Project2', P2_SCRIPT, 'p2_intensity', 'plot_intensity',
+         ['results/plots/intensity_throughput_latency.png'], inputs=['results/loaded_latency.txt']),
+    _fig('p2_rw_mix', 'Project2', P2_SCRIPT, 'p2_rw_mix', 'plot_rw_mix', ['results/plots/rw_mix_bandwidth.png'],
+         optional=['results/bw_read.txt', 'results/bw_write.txt', 'results/bw_rw70_30.txt',
+                   'results/bw_rw50_50.txt']),
+    _fig('p2_mlc_summary', 'Project2', P2_SCRIPT, 'p2_mlc_summary', 'write_mlc_summary', ['results/mlc_baselines.md'],
+         inputs=['results/latencies.txt'], optional=['results/loaded_latency.txt']),
+]
+
+# ---------------------------------------------------------------------------
+# Runners (executed in pool workers, with cwd = the task's project directory)
+# ---------------------------------------------------------------------------
+_modules = {}
+
+def _script(task: Task):
+    path = ROOT / task.project / task.script
+    if path not in _modules:
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.path.insert(0, str(path.parent))
+        spec.loader.exec_module(module)
+        _modules[path] = module
+    return _modules[path]
+
+def _artifact_path(name: str) -> pathlib.Path:
+    return ARTIFACT_DIR / f'{name}.pkl'
+
+def _load_frame(name: str):
+    with open(_artifact_path(name), 'rb') as f:
+        return pickle.load(f)
+
+def _save_frame(name: str, df):
+    tmp = _artifact_path(name).with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, _artifact_path(name))
+
+def run_p3_parse(task, m):
+    jobs = m.load_executed_jobs(task.inputs[0])
+    df = m.df_from_jobs(jobs)
+    m.write_tables(jobs, df)
+    _save_frame(task.name, df)
+
+def run_p2_perf(task, m):
+    _save_frame(task.name, m.prepare_perf(m.load_perf_sweep(pathlib.Path(task.inputs[0]))))
+
+def run_with_frame(task, m):
+    getattr(m, task.call)(_load_frame(task.deps[0]))
+
+def run_p2_working_set(task, m):
+    getattr(m, task.call)(m.parse_working_set(pathlib.Path(task.inputs[0])))
+
+def run_p2_intensity(task, m):
+    m.plot_intensity(m.parse_loaded_latency(pathlib.Path(task.inputs[0])))
+
+def run_p2_rw_mix(task, m):
+    m.plot_rw_mix(m.parse_rw_bandwidth(m.RW_MIX_FILES))
+
+def run_p2_mlc_summary(task, m):
+    m.write_mlc_summary(pathlib.Path(task.inputs[0]), pathlib.Path(task.optional[0]))
+
+RUNNERS = {
+    'p3_parse': run_p3_parse, 'p2_perf': run_p2_perf, 'with_frame': run_with_frame,
+    'p2_working_set': run_p2_working_set, 'p2_intensity': run_p2_intensity,
+    'p2_rw_mix': run_p2_rw_mix, 'p2_mlc_summary': run_p2_mlc_summary,
+}
+
+def _init_worker():
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+def execute(task: Task) -> float:
+    start = time.time()
+    os.chdir(ROOT / task.project)
+    m = _script(task)
+    for out in task.outputs:
+        pathlib.Path(out).parent.mkdir(parents=True, exist_ok=True)
+    RUNNERS[task.runner](task, m)
+    m.plt.close('all')
+    return time.time() - start
+
+# ---------------------------------------------------------------------------
+# Keys and state
+# ---------------------------------------------------------------------------
+class Hasher:
+    """sha256 of files, reusing the stored digest while size and mtime are unchanged."""
+    def __init__(self, files: Dict[str, dict]):
+        self.files = files
+        self._sources = {}
+        self._trees = {}
+
+    def file(self, path: pathlib.Path) -> str:
+        if not path.exists():
+            return 'missing'
+        st = path.stat()
+        rec = self.files.get(str(path))
+        if rec and rec['size'] == st.st_size and rec['mtime_ns'] == st.st_mtime_ns:
+            return rec['sha256']
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        self.files[str(path)] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': h.hexdigest()}
+        return h.hexdigest()
+
+    def _definitions(self, path: pathlib.Path) -> Dict[str, tuple]:
+        """Top-level name -> (source text, names it references) for a script."""
+        if path not in self._sources:
+            text = path.read_text()
+            tree = ast.parse(text)
+            defs = {}
+            for node in tree.body:
+                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                    targets = [node.name]
+                elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                    nodes = node.targets if isinstance(node, ast.Assign) else [node.target]
+                    targets = [t.id for t in nodes if isinstance(t, ast.Name)]
+                else:
+                    continue
+                refs = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+                for name in targets:
+                    defs[name] = (ast.get_source_segment(text, node), refs)
+            self._sources[path] = defs
+            self._trees[path] = tree
+        return self._sources[path]
+
+    def source(self, path: pathlib.Path, names: List[str]) -> str:
+        """Source text of the named top-level definitions of a script and of every
+        top-level name they reference, transitively."""
+        defs = self._definitions(path)
+        seen, todo = set(), list(names)
+        while todo:
+            name = todo.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in defs:
+                todo.extend(r for r in defs[name][1] if r in defs)
+        return '\n'.join(defs[n][0] if n in defs else f'<missing {n}>' for n in sorted(seen))
+
+    def attributes(self, path: pathlib.Path, func: str, obj: str) -> List[str]:
+        """Attributes of ``obj`` that the top-level function ``func`` accesses (``m.parse_fio`` -> parse_fio)."""
+        self._definitions(path)
+        for node in self._trees[path].body:
+            if isinstance(node, ast.FunctionDef) and node.name == func:
+                return sorted({n.attr for n in ast.walk(node) if isinstance(n, ast.Attribute)
+                               and isinstance(n.value, ast.Name) and n.value.id == obj})
+        return []
+
+def script_names(task: Task, hasher: Hasher) -> List[str]:
+    """Script names a task runs: what its runner accesses on the module, plus ``call``."""
+    names = hasher.attributes(pathlib.Path(__file__), RUNNERS[task.runner].__name__, 'm')
+    return names + [task.call] if task.call else names
+
+def task_key(task: Task, hasher: Hasher) -> str:
+    h = hashlib.sha256(task.name.encode())
+    project = ROOT / task.project
+    for inp in task.inputs + task.optional:
+        h.update(f'{inp}:{hasher.file(project / inp)}'.encode())
+    for dep in task.deps:
+        h.update(f'{dep}:{hasher.file(_artifact_path(dep))}'.encode())
+    h.update(hasher.source(project / task.script, script_names(task, hasher)).encode())
+    h.update(hasher.source(pathlib.Path(__file__), [RUNNERS[task.runner].__name__]).encode())
+    return h.hexdigest()
+
+def up_to_date(task: Task, key: str, state: dict) -> bool:
+    if state['tasks'].get(task.name) != key:
+        return False
+    outputs = [ROOT / task.project / o for o in task.outputs]
+    if task.artifact:
+        outputs.append(_artifact_path(task.name))
+    return all(p.exists() for p in outputs)
+
+def load_state() -> dict:
+    if STATE_FILE.exists():
+        return json.loads(STATE_FILE.read_text())
+    return {'tasks': {}, 'files': {}}
+
+def save_state(state: dict):
+    STATE_DIR.mkdir(exist_ok=True)
+    tmp = STATE_FILE.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state, indent=1))
+    os.replace(tmp, STATE_FILE)
+
+def runnable(task: Task) -> bool:
+    # Every required input must exist; a task with only optional inputs needs one of them
+    # (with none it has nothing to render, and the scripts skip those plots too)
+    project = ROOT / task.project
+    if not all((project / i).exists() for i in task.inputs):
+        return False
+    return bool(task.inputs) or not task.optional or any((project / i).exists() for i in task.optional)
+
+def run_pipeline(tasks: List[Task], jobs: int = os.cpu_count() or 1, force: bool = False) -> Dict[str, str]:
+    """Run stale tasks in dependency order; returns task -> 'skipped' | 'ran' | 'failed: ...' | 'blocked' | 'no input'."""
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    state = load_state()
+    hasher = Hasher(state['files'])
+    by_name = {t.name: t for t in tasks}
+    status: Dict[str, str] = {}
+    keys: Dict[str, str] = {}
+    pending = list(tasks)
+    running = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        while pending or running:
+            for task in list(pending):
+                dep_status = [status.get(d) for d in task.deps if d in by_name]
+                if any(s is None for s in dep_status):
+                    continue
+                pending.remove(task)
+                if any(s not in ('ran', 'skipped') for s in dep_status):
+                    status[task.name] = 'blocked'
+                elif not runnable(task):
+                    status[task.name] = 'no input'
+                else:
+                    keys[task.name] = task_key(task, hasher)
+                    if not force and up_to_date(task, keys[task.name], state):
+                        status[task.name] = 'skipped'
+                    else:
+                        running[pool.submit(execute, task)] = task
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                task = running.pop(fut)
+                try:
+                    elapsed = fut.result()
+                except Exception as e:
+                    status[task.name] = f'failed: {type(e).__name__}: {e}'
+                    state['tasks'].pop(task.name, None)
+                    print(f"[warn] {task.name} failed: {e}")
+                else:
+                    status[task.name] = 'ran'
+                    state['tasks'][task.name] = keys[task.name]
+                    print(f"  {task.name:<20} {elapsed:6.2f}s")
+                save_state(state)
+    save_state(state)
+    return status
+
+def list_status(tasks: List[Task]):
+    state = load_state()
+    hasher = Hasher(state['files'])
+    for task in tasks:
+        if not runnable(task):
+            label = 'no input'
+        else:
+            label = 'up to date' if up_to_date(task, task_key(task, hasher), state) else 'stale'
+        print(f"  {task.name:<20} {label:<10} -> {', '.join(task.outputs) or '(parsed data)'}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--only', nargs='*', default=[], help='task name prefixes (their upstream tasks are included)')
+    parser.add_argument('--force', action='store_true', help='run selected tasks even if up to date')
+    parser.add_argument('--list', action='store_true', help='print each task as up to date / stale and exit')
+    args = parser.parse_args()
+
+    selected = [t for t in TASKS if not args.only or t.name.startswith(tuple(args.only))]
+    names = {t.name for t in selected}
+    for t in selected:
+        names.update(t.deps)
+    tasks = [t for t in TASKS if t.name in names]
+    if args.list:
+        list_status(tasks)
+        return
+    start = time.time()
+    status = run_pipeline(tasks, args.jobs, args.force)
+    counts = {}
+    for s in status.values():
+        counts[s.split(':')[0]] = counts.get(s.split(':')[0], 0) + 1
+    print(f"✓ {len(tasks)} tasks in {time.time() - start:.1f}s: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+    for name, s in status.items():
+        if s.startswith('failed') or s == 'blocked':
+            print(f"  {name}: {s}")
+
+if __name__ == '__main__':
+    main()